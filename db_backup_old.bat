@@ -7,4 +7,6 @@ copy data\database\CharaEffect.dat data\database\CharaEffect.dat.bak
 copy data\database\Effect.dat data\database\Effect.dat.bak
 copy data\database\Picture.dat data\database\Picture.dat.bak
 copy data\database\ScrEffect.dat data\database\ScrEffect.dat.bak
-copy data\database\SwordType.dat data\database\SwordType.dat.bak
\ No newline at end of file
+copy data\database\Sound.dat data\database\Sound.dat.bak
+copy data\database\SwordType.dat data\database\SwordType.dat.bak
+copy data\database\System.dat data\database\System.dat.bak
\ No newline at end of file
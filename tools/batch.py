@@ -0,0 +1,84 @@
+import hashlib
+import io
+import os
+import traceback
+from concurrent.futures import ProcessPoolExecutor
+from contextlib import redirect_stdout
+from pathlib import Path
+from typing import Any, Callable, Iterable, List, Sequence, Tuple
+
+
+def file_digest(path: Path) -> str:
+    """SHA-1 of the file contents, read in chunks so big exports are not loaded at once."""
+    digest = hashlib.sha1()
+    with path.open("rb") as f:
+        for chunk in iter(lambda: f.read(1 << 20), b""):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+def expand_paths(paths: Iterable[Path], pattern: str) -> List[Path]:
+    """
+    Expands every directory in paths to the files inside it matching pattern.
+    Files are kept as given, so a shell glob and a folder behave the same.
+    """
+    expanded = []
+    for path in paths:
+        if path.is_dir():
+            expanded.extend(sorted(path.glob(pattern)))
+        else:
+            expanded.append(path)
+    return expanded
+
+
+def _guarded_call(func: Callable[..., Any], args: Tuple) -> Any:
+    # An exception in one file must not take the rest of the batch down with it
+    try:
+        return func(*args)
+    except Exception as e:
+        traceback.print_exc()
+        print(f"    ERROR: {e}")
+        return False
+
+
+def _captured_call(func: Callable[..., Any], args: Tuple) -> Tuple[Any, str]:
+    # Workers hand their log back so it can be printed in input order, not interleaved
+    output = io.StringIO()
+    with redirect_stdout(output):
+        result = _guarded_call(func, args)
+    return result, output.getvalue()
+
+
+def run_jobs(func: Callable[..., Any], jobs_args: Sequence[Tuple], jobs: int = 1) -> List[Any]:
+    """
+    Calls func(*args) for each entry of jobs_args and returns the results in the same order.
+    With jobs > 1 the calls run in that many worker processes, 0 means one per CPU core.
+    func must be a module-level function so the workers can import it.
+    A call that raises counts as a False result instead of stopping the batch.
+    """
+    if jobs == 0:
+        jobs = os.cpu_count() or 1
+    if jobs <= 1 or len(jobs_args) <= 1:
+        return [_guarded_call(func, args) for args in jobs_args]
+
+    results = []
+    with ProcessPoolExecutor(max_workers=min(jobs, len(jobs_args))) as pool:
+        futures = [pool.submit(_captured_call, func, args) for args in jobs_args]
+        for future in futures:
+            try:
+                result, output = future.result()
+                print(output, end="")
+                results.append(result)
+            except Exception as e:
+                # The worker itself died (e.g. out of memory)
+                print(f"    ERROR: Worker failed: {e}")
+                results.append(False)
+    return results
+
+
+def print_summary(action: str, items: Sequence[Any], results: Sequence[Any]):
+    """Prints how many items succeeded, then the failed ones in their original order."""
+    failed = [item for item, ok in zip(items, results) if not ok]
+    print(f"{action} {len(items) - len(failed)}/{len(items)} file(s).")
+    for item in failed:
+        print(f"    FAILED: '{item}'")
@@ -1,30 +1,142 @@
-from dataclasses import dataclass
+import base64
+from dataclasses import dataclass, fields
 from pathlib import Path
-from typing import Union
+from typing import Any, Callable, Dict, List, TypeVar, Union
+import mmap
 import struct
 
+T = TypeVar("T")
+
+# --- Record Layouts ---
+
+# Field type codes accepted by RecordLayout, mapped to their struct format characters.
+FIELD_FORMATS = {
+    "u8": "B",
+    "s8": "b",
+    "u16": "H",
+    "s16": "h",
+    "u32": "I",
+    "s32": "i",
+    "f32": "f",
+    "f64": "d",
+}
+
+class RecordLayout:
+    """
+    A fixed-width run of fields, compiled once into a little-endian struct.Struct
+    so the whole run is decoded with a single unpack_from call.
+    Fields are (name, type) pairs; type is a FIELD_FORMATS code, or an int for a
+    raw byte blob of that length.
+    """
+    __slots__ = ("names", "blobs", "struct", "size")
+
+    def __init__(self, *fields):
+        self.names = tuple(name for name, _ in fields)
+        self.blobs = tuple(i for i, (_, kind) in enumerate(fields) if isinstance(kind, int))
+        fmt = "".join(f"{kind}s" if isinstance(kind, int) else FIELD_FORMATS[kind] for _, kind in fields)
+        self.struct = struct.Struct("<" + fmt)
+        self.size = self.struct.size
+
+
+# --- Slotted Dataclasses ---
+
+def slotted_dataclass(cls):
+    """
+    @dataclass, then recreates the class with __slots__ for its fields, as dataclass(slots=True) does on
+    Python 3.10+. A big stage holds tens of thousands of records; without a per-instance __dict__ each
+    takes a fraction of the memory, and attribute reads and writes in the codecs are faster.
+    """
+    cls = dataclass(cls)
+    names = tuple(f.name for f in fields(cls))
+    body = {key: value for key, value in cls.__dict__.items() if key not in names and key not in ("__dict__", "__weakref__")}
+    # Defaults live in the generated __init__, so the class attributes holding them can make way for the slots
+    body["__slots__"] = names
+    slotted = type(cls)(cls.__name__, cls.__bases__, body)
+    slotted.__qualname__ = cls.__qualname__
+    return slotted
+
+
+# --- Strings ---
+
+@slotted_dataclass
+class StringSpan:
+    """Where a std string sits in the file: offset of its u32 length prefix and its total size in bytes."""
+    offset: int
+    size: int
+    field: str
+    text: str
+
+def pack_std_string(value: str) -> bytes:
+    """Encodes a string the way the game stores it: u32 length including the null terminator, then the Shift-JIS bytes."""
+    encoded = value.encode('shift-jis', errors='ignore')
+    if not encoded:
+        return struct.pack("<I", 1)
+    return struct.pack("<I", len(encoded) + 1) + encoded + b"\x00"
+
+
+# --- Byte Blobs ---
+
+def encode_blob(data: bytes) -> dict:
+    """JSON form of an opaque byte range: base64 tagged with a type marker."""
+    return {"$type": "Uint8Array", "base64": base64.b64encode(data).decode("ascii")}
+
+def decode_blob(value: Any) -> bytes:
+    """Reverses encode_blob. The legacy list of integers is accepted too."""
+    if isinstance(value, dict):
+        if "base64" in value:
+            return base64.b64decode(value["base64"])
+        return bytes(value.get("data", []))
+    return bytes(value)
+
+
+# --- Augmented Helper Class ---
+
 class ActedBinaryFile:
     VERSIONS = [
         0xB6, # v248b
         0x03C6, # ??
         0x03FC # v1020
     ]
+    # Codec for the strings read_str finds aren't valid Shift-JIS; None drops the invalid bytes instead
+    FALLBACK_ENCODING = None
 
     def __init__(self, file_path: Union[str, Path]):
         self.file_path = Path(file_path)
         self._data = bytearray()
         self._position = 0
         self._append_mode = False
-        
+        # Opt-in: map the file instead of copying it into memory on load
+        self.use_mmap = False
+        self._mmap = None
+        # Set to a list before parse() to record a StringSpan for every std string read
+        self.string_spans = None
+
     def load(self) -> bool:
         try:
-            self._data = bytearray(self.file_path.read_bytes())
+            self.close()
+            if self.use_mmap:
+                # Reads go through a memoryview of the mapping, so only the fields
+                # that are kept get copied out of the file
+                with open(self.file_path, 'rb') as f:
+                    self._mmap = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+                self._data = memoryview(self._mmap)
+            else:
+                self._data = bytearray(self.file_path.read_bytes())
             self._position = 0
             return True
         except Exception as e:
             print(f"Error loading {self.file_path}: {e}")
             return False
-            
+
+    def close(self):
+        # Release the file mapping held after an mmap load
+        if self._mmap is not None:
+            if isinstance(self._data, memoryview):
+                self._data.release()
+                self._data = bytearray()
+            self._mmap.close()
+            self._mmap = None
+
     def save_file(self) -> bool:
         try:
             self.file_path.write_bytes(bytes(self._data))
@@ -32,7 +144,7 @@ class ActedBinaryFile:
         except Exception as e:
             print(f"Error saving {self.file_path}: {e}")
             return False
-    
+
     def save_to(self, file_path: Union[str, Path]) -> bool:
         try:
             Path(file_path).write_bytes(bytes(self._data))
@@ -41,101 +153,201 @@ class ActedBinaryFile:
             print(f"Error saving {file_path}: {e}")
             return False
 
-    def start_writing(self):
-        """Reset the buffer and position, entering append mode"""
-        self._data = bytearray()
+    def start_writing(self, size_hint: int = 0):
+        # size_hint preallocates the buffer when the output size is roughly known
+        self.close()
+        self._data = bytearray(size_hint)
         self._position = 0
         self._append_mode = True
 
     def finish_writing(self):
-        """Finish writing mode"""
         self._append_mode = False
+        # Trim the buffer to the current position
+        del self._data[self._position:]
 
     def _ensure_space(self, size: int):
-        """Ensure there's enough space in the buffer for writing"""
-        if self._append_mode or self._position + size > len(self._data):
-            # If in append mode or not enough space, extend the buffer
-            needed = self._position + size - len(self._data)
-            if needed > 0:
-                self._data.extend(bytearray(needed))
+        end = self._position + size
+        if end > len(self._data):
+            if self._append_mode:
+                # Grow geometrically so a long run of small writes only reallocates O(log n) times
+                self._data.extend(bytes(max(end, 2 * len(self._data), 4096) - len(self._data)))
+            else:
+                self._data.extend(bytes(end - len(self._data)))
 
     def read_u8(self) -> int:
         value = self._data[self._position]
         self._position += 1
         return value
-        
+
+    def read_s8(self) -> int:
+        value = struct.unpack_from("<b", self._data, self._position)[0]
+        self._position += 1
+        return value
+
     def read_u16(self) -> int:
         value = struct.unpack_from("<H", self._data, self._position)[0]
         self._position += 2
         return value
-        
+
+    def read_s16(self) -> int:
+        value = struct.unpack_from("<h", self._data, self._position)[0]
+        self._position += 2
+        return value
+
     def read_u32(self) -> int:
         value = struct.unpack_from("<I", self._data, self._position)[0]
         self._position += 4
         return value
     
-    def read_f64(self) -> float:
-        value = struct.unpack_from("<d", self._data, self._position)[0]
-        self._position += 8
-        return value
-        
     def read_s32(self) -> int:
         value = struct.unpack_from("<i", self._data, self._position)[0]
         self._position += 4
         return value
-        
+
+    def read_f32(self) -> float:
+        value = struct.unpack_from("<f", self._data, self._position)[0]
+        self._position += 4
+        return value
+
+    def read_f64(self) -> float:
+        value = struct.unpack_from("<d", self._data, self._position)[0]
+        self._position += 8
+        return value
+
+    def read_bytes(self, length: int) -> bytes:
+        data = self._data[self._position:self._position + length]
+        self._position += length
+        return bytes(data)
+
     def read_str(self, length: int) -> str:
+        # Decode straight from the buffer slice rather than through read_bytes
         data = self._data[self._position:self._position + length]
         self._position += length
-        return data.decode('shift-jis', errors='ignore').rstrip('\x00')
-        
+        try:
+            return str(data, 'shift-jis').rstrip('\x00')
+        except UnicodeDecodeError:
+            if self.FALLBACK_ENCODING is None:
+                return str(data, 'shift-jis', errors='ignore').rstrip('\x00')
+            return str(data, self.FALLBACK_ENCODING).rstrip('\x00')
+
+    def read_std_string(self, field: str = "") -> str:
+        start = self._position
+        length = self.read_u32()
+        value = ""
+        if length > 1:
+            # The length from file seems to include the null terminator
+            value = self.read_str(length)
+        if self.string_spans is not None:
+            self.string_spans.append(StringSpan(start, self._position - start, field, value))
+        return value
+
+    def peek_std_string(self, offset: int) -> StringSpan:
+        """Decodes the std string whose length prefix is at offset, without moving the read position."""
+        saved = self._position
+        self._position = offset
+        length = self.read_u32()
+        value = self.read_str(length) if length > 1 else ""
+        span = StringSpan(offset, self._position - offset, "", value)
+        self._position = saved
+        return span
+
+    def patch_strings(self, replacements: Dict[int, str]):
+        """
+        Replaces the std strings whose length prefixes are at the given offsets, in one pass over the buffer.
+        Every byte outside the replaced strings is copied unchanged.
+        """
+        patched = bytearray()
+        last = 0
+        for offset in sorted(replacements):
+            if offset < last:
+                raise ValueError(f"Overlapping string patch at offset {offset}")
+            span = self.peek_std_string(offset)
+            patched += self._data[last:offset]
+            patched += pack_std_string(replacements[offset])
+            last = offset + span.size
+        patched += self._data[last:]
+        self.close()
+        self._data = patched
+        self._position = 0
+
     def write_u8(self, value: int):
         self._ensure_space(1)
         self._data[self._position] = value
         self._position += 1
-        
+
+    def write_s8(self, value: int):
+        self._ensure_space(1)
+        struct.pack_into("<b", self._data, self._position, value)
+        self._position += 1
+
     def write_u16(self, value: int):
         self._ensure_space(2)
         struct.pack_into("<H", self._data, self._position, value)
         self._position += 2
-        
+
+    def write_s16(self, value: int):
+        self._ensure_space(2)
+        struct.pack_into("<h", self._data, self._position, value)
+        self._position += 2
+
     def write_u32(self, value: int):
         self._ensure_space(4)
         struct.pack_into("<I", self._data, self._position, value)
         self._position += 4
-        
+    
     def write_s32(self, value: int):
         self._ensure_space(4)
         struct.pack_into("<i", self._data, self._position, value)
         self._position += 4
 
+    def write_f32(self, value: float):
+        self._ensure_space(4)
+        struct.pack_into("<f", self._data, self._position, value)
+        self._position += 4
+
     def write_f64(self, value: float):
         self._ensure_space(8)
-        struct.pack_into("<d", self._data, self._position, float(value))
+        struct.pack_into("<d", self._data, self._position, value)
         self._position += 8
-        
-    def write_str(self, value: str, length: int):
+
+    def write_bytes(self, data: Union[bytes, bytearray]):
+        length = len(data)
         self._ensure_space(length)
-        encoded = value.encode('shift-jis')[:length]
-        encoded = encoded.ljust(length, b'\x00')
-        self._data[self._position:self._position + length] = encoded
+        self._data[self._position:self._position + length] = data
         self._position += length
+        
+    def write_str(self, value: str, fixed_length: int = -1):
+        encoded = value.encode('shift-jis', errors='ignore')
+        if fixed_length != -1:
+            encoded = encoded[:fixed_length].ljust(fixed_length, b'\x00')
+        self.write_bytes(encoded)
 
-    def read_std_string(self) -> str:
-        length = self.read_u32()
-        if length <= 1:
-            return ""
-        if length > 1:
-            return self.read_str(length)
-        return ""
-    
-    def write_std_string(self, value: str) -> None:
-        encoded = value.encode("shift-jis", errors="ignore")
-        length = len(encoded)
-        self._ensure_space(4 + length)
-        self.write_u32(length + 1) # Off-by one ? 
-        if length > 0:
-            self.write_str(value, length)
-            
-            # null-terminator
-            self.write_u8(0)
\ No newline at end of file
+    def write_std_string(self, value: str):
+        self.write_bytes(pack_std_string(value))
+
+    def read_record(self, layout: RecordLayout, target: T) -> T:
+        """Decode a whole fixed-width run of fields into the attributes of target."""
+        values = layout.struct.unpack_from(self._data, self._position)
+        self._position += layout.size
+        for name, value in zip(layout.names, values):
+            setattr(target, name, value)
+        return target
+
+    def write_record(self, layout: RecordLayout, source: Any):
+        """Encode a whole fixed-width run of fields from the attributes of source."""
+        values = [getattr(source, name) for name in layout.names]
+        for i in layout.blobs:
+            # Blobs come back from JSON as lists of ints
+            values[i] = bytes(values[i])
+        self._ensure_space(layout.size)
+        layout.struct.pack_into(self._data, self._position, *values)
+        self._position += layout.size
+
+    def _read_array(self, parser_func: Callable[[], T]) -> List[T]:
+        count = self.read_u32()
+        return [parser_func() for _ in range(count)]
+
+    def _write_array(self, arr: List[Any], writer_func: Callable[[Any], None]):
+        self.write_u32(len(arr))
+        for item in arr:
+            writer_func(item)
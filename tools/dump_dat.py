@@ -3,8 +3,10 @@ import argparse
 import json
 from dataclasses import asdict
 from pathlib import Path
-from typing import Union
+from typing import List, Union
 
+from batch import print_summary, run_jobs
+from binary_file import encode_blob
 from files import (
     Anime,
     AnimeSet,
@@ -49,6 +51,17 @@ def detect_type(path: Path) -> str:
     return None
 
 
+def json_default(value):
+    # asdict leaves opaque byte ranges as bytes, which json cannot write on its own
+    if isinstance(value, bytes):
+        return encode_blob(value)
+    raise TypeError(f"Object of type {type(value).__name__} is not JSON serializable")
+
+
+def to_json(payload: dict) -> str:
+    return json.dumps(payload, indent=2, ensure_ascii=False, default=json_default)
+
+
 def load_version(path: Path) -> int:
     with path.open("rb") as handle:
         data = handle.read(4)
@@ -77,7 +90,7 @@ def dump_database(path: Path, db_type: Union[str, None]) -> dict:
     if db_type == "stage4":
         return {
             "version": getattr(parser, "version", version),
-            "payload": data_dict.get("payload", []),
+            "payload": data_dict,
         }
 
     if db_type == "system":
@@ -92,19 +105,49 @@ def dump_database(path: Path, db_type: Union[str, None]) -> dict:
     }
 
 
+def find_databases(directory: Path) -> List[Path]:
+    """Every .dat file in directory whose name is a known database type."""
+    return [path for path in sorted(directory.glob("*.dat")) if normalise_key(path.name) in PARSERS]
+
+
+def dump_file(path: Path, output: Path) -> bool:
+    payload = dump_database(path, None)
+    output.write_text(to_json(payload), encoding="utf-8")
+    print(f"Dumped '{path}' to '{output}'")
+    return True
+
+
+def dump_directory(directory: Path, output_dir: Path, jobs: int) -> None:
+    databases = find_databases(directory)
+    if not databases:
+        print(f"No known database files found in '{directory}'")
+        return
+
+    output_dir.mkdir(parents=True, exist_ok=True)
+    results = run_jobs(dump_file, [(path, output_dir / f"{path.stem}.json") for path in databases], jobs)
+    print_summary("Dumped", databases, results)
+
+
 def main() -> None:
     argument_parser = argparse.ArgumentParser(description="Dump ActionEditor4 database files to JSON")
-    argument_parser.add_argument("input", type=Path, help="Path to the .dat file")
+    argument_parser.add_argument("input", type=Path, help="Path to the .dat file, or a database folder to dump every known file in it")
     argument_parser.add_argument("--type", dest="db_type", help="Database type override (e.g. anime, bgm)")
-    argument_parser.add_argument("--out", dest="output", type=Path, help="Output JSON path")
+    argument_parser.add_argument("--out", dest="output", type=Path, help="Output JSON path (output folder for a database folder)")
+    argument_parser.add_argument("-j", "--jobs", type=int, default=1, help="Worker processes for a database folder, 0 for one per CPU core")
 
     args = argument_parser.parse_args()
+    if args.input.is_dir():
+        if args.db_type:
+            argument_parser.error("--type cannot be used with a database folder")
+        dump_directory(args.input, args.output or args.input, args.jobs)
+        return
+
     try:
         payload = dump_database(args.input, normalise_key(args.db_type) if args.db_type else None)
     except Exception as error:  # pragma: no cover - cli tool
         argument_parser.error(str(error))
 
-    json_payload = json.dumps(payload, indent=2, ensure_ascii=False)
+    json_payload = to_json(payload)
 
     if args.output:
         args.output.write_text(json_payload, encoding="utf-8")
@@ -1,10 +1,22 @@
-from dataclasses import dataclass, field
+from dataclasses import field
 from pathlib import Path
 from typing import List, Union
 from math import floor, ceil
-from binary_file import ActedBinaryFile
-
-@dataclass
+from binary_file import ActedBinaryFile, RecordLayout, slotted_dataclass
+from stage_records import (
+    StageDeathFade,
+    StagePlayerCollision,
+    StageEnemyCollision,
+    StageActorHitbox,
+    ITEM_COLLISION_LAYOUT,
+    RANKING_LAYOUT,
+    DEATH_FADE_LAYOUT,
+    PLAYER_COLLISION_LAYOUT,
+    ENEMY_COLLISION_LAYOUT,
+    ACTOR_HITBOX_LAYOUT,
+)
+
+@slotted_dataclass
 class AnimationFrame:
     header: int = 0
     frame_index: int = 0
@@ -12,7 +24,7 @@ class AnimationFrame:
     exec_commands: int = 0
     unknown2: int = 0
 
-@dataclass
+@slotted_dataclass
 class Animation:
     header: int = 0
     sample_list_index: int = 0
@@ -22,7 +34,7 @@ class Animation:
     name: str = ""
     frames: List[AnimationFrame] = field(default_factory=list)
 
-@dataclass
+@slotted_dataclass
 class AnimeSetElement:
     header: int = 0
     flying_offset: int = 0
@@ -32,7 +44,7 @@ class AnimeSetElement:
     name: str = ""
     animations: List[Animation] = field(default_factory=list)
 
-@dataclass
+@slotted_dataclass
 class BmpCharaExcElement:
     header: int = 0
     is_name_same_path: int = 0
@@ -42,20 +54,20 @@ class BmpCharaExcElement:
     name: str = ""
     path: str = ""
 
-@dataclass
+@slotted_dataclass
 class AnimeSetData:
     elements: List[AnimeSetElement] = field(default_factory=list)
 
-@dataclass
+@slotted_dataclass
 class AnimeData:
     elements: List[Animation] = field(default_factory=list)
 
 
-@dataclass
+@slotted_dataclass
 class BmpCharaExcData:
     elements: List[BmpCharaExcElement] = field(default_factory=list)
 
-@dataclass
+@slotted_dataclass
 class PictureElement:
     header: int = 1 # always 1 ??
     is_name_same_path: int = 0
@@ -63,11 +75,11 @@ class PictureElement:
     name: str = ""
     path: str = ""
 
-@dataclass
+@slotted_dataclass
 class PictureData:
     elements: List[PictureElement] = field(default_factory=list)
 
-@dataclass
+@slotted_dataclass
 class SoundElement:
     header: int = 1  # always 1 ??
     is_name_same_path: int = 0
@@ -75,11 +87,11 @@ class SoundElement:
     name: str = ""
     path: str = ""
 
-@dataclass
+@slotted_dataclass
 class SoundData:
     elements: List[SoundElement] = field(default_factory=list)
 
-@dataclass
+@slotted_dataclass
 class CharaEffectElement:
     header: int = 0
     effect: int = 0
@@ -91,18 +103,18 @@ class CharaEffectElement:
     unknown: int = 1  # always 1?
     name: str = ""
 
-@dataclass
+@slotted_dataclass
 class CharaEffectData:
     elements: List[CharaEffectElement] = field(default_factory=list)
 
-@dataclass
+@slotted_dataclass
 class EffectAnimation:
     header: int = 2
     start: int = 0
     end: int = 0
     unknown: int = 0
 
-@dataclass
+@slotted_dataclass
 class EffectElement:
     header: int = 0
     is_name_same_path: int = 0
@@ -114,11 +126,11 @@ class EffectElement:
     path: str = ""
     animations: List[EffectAnimation] = field(default_factory=list)
 
-@dataclass
+@slotted_dataclass
 class EffectData:
     elements: List[EffectElement] = field(default_factory=list)
 
-@dataclass
+@slotted_dataclass
 class BgmElement:
     header: int = 2  # always 2?
     is_name_same_path: int = 0
@@ -127,11 +139,11 @@ class BgmElement:
     name: str = ""
     path: str = ""
 
-@dataclass
+@slotted_dataclass
 class BgmData:
     elements: List[BgmElement] = field(default_factory=list)
 
-@dataclass
+@slotted_dataclass
 class SwordPosition:
     header: int = 2
     x: int = 0
@@ -146,7 +158,7 @@ class SwordPosition:
     index: int = 0
     unknown6: int = 0
 
-@dataclass
+@slotted_dataclass
 class SwordTypeElement:
     header: int = 0
     is_name_same_path: int = 0
@@ -156,11 +168,11 @@ class SwordTypeElement:
     path_right: str = ""
     positions: List[SwordPosition] = field(default_factory=list)
 
-@dataclass
+@slotted_dataclass
 class SwordTypeData:
     elements: List[SwordTypeElement] = field(default_factory=list)
 
-@dataclass
+@slotted_dataclass
 class ScreenEffectElement:
     header: int = 2
     effect: int = 0
@@ -172,11 +184,11 @@ class ScreenEffectElement:
     unknown: int = 1  # always 1?
     name: str = ""
 
-@dataclass
+@slotted_dataclass
 class ScreenEffectData:
     elements: List[ScreenEffectElement] = field(default_factory=list)
 
-@dataclass
+@slotted_dataclass
 class WorldChip:
     header: int = 0
     tile_index: int = 0
@@ -186,7 +198,7 @@ class WorldChip:
     name: str = ""
     unused_string: str = ""
 
-@dataclass
+@slotted_dataclass
 class WorldEventPage:
     header: int = 0
     event_type: int = 0
@@ -207,7 +219,7 @@ class WorldEventPage:
     world_name: str = ""  # std::string
     start_stage: str = ""  # std::string
 
-@dataclass
+@slotted_dataclass
 class WorldEventBase:
     header: int = 0
     placement_x: int = 0
@@ -217,7 +229,7 @@ class WorldEventBase:
     pages_count: int = 0
     pages: List[WorldEventPage] = field(default_factory=list)
 
-@dataclass
+@slotted_dataclass
 class WorldMapData:
     width: int = 32
     height: int = 32
@@ -327,6 +339,7 @@ class AnimeSet(ActedBinaryFile):
                     self.write_u32(frame.exec_commands)
                     self.write_u32(frame.unknown2)
         
+        self.finish_writing()
         return self._data
 
 
@@ -386,7 +399,7 @@ SYSTEM_TARGET_RESET_KEYS = [
     "target_bgm_reseted",
 ]
 
-@dataclass
+@slotted_dataclass
 class StatusWindowData:
     header: int = 0
     is_visible: int = 0
@@ -399,7 +412,7 @@ class StatusWindowData:
     text: str = ""
 
 
-@dataclass
+@slotted_dataclass
 class RankingData:
     first_unk: int = 0
     ranking_on: int = 0
@@ -408,7 +421,7 @@ class RankingData:
     ranking_criterias: List[int] = field(default_factory=list)
 
 
-@dataclass
+@slotted_dataclass
 class MenuTextData:
     unk1: int = 0
     enabled: int = 0
@@ -416,7 +429,7 @@ class MenuTextData:
     text: str = ""
 
 
-@dataclass
+@slotted_dataclass
 class IniConfData:
     unk1: int = 0
     unk2: int = 0
@@ -426,7 +439,7 @@ class IniConfData:
     default_str: str = ""
 
 
-@dataclass
+@slotted_dataclass
 class SystemTargets:
     count: int = 0
     target_graphic: int = 0
@@ -456,7 +469,7 @@ class SystemTargets:
     target_bgm: int = 0
 
 
-@dataclass
+@slotted_dataclass
 class SystemTargetsReset:
     count: int = 0
     target_graphic_reseted: int = 0
@@ -485,7 +498,7 @@ class SystemTargetsReset:
     target_player_count_reseted: int = 0
     target_bgm_reseted: int = 0
 
-@dataclass
+@slotted_dataclass
 class SystemData:
     unk0: int = 0
     up_process_on_stage_clear: int = 0
@@ -630,6 +643,160 @@ class SystemData:
     settings_ini_count: int = 0
     setting_init: List[IniConfData] = field(default_factory=list)
 
+# Fixed-width field runs of System.dat, decoded with one struct call each.
+SYSTEM_LAYOUT = RecordLayout(
+    ("unk0", "u32"),
+    ("up_process_on_stage_clear", "u32"),
+    ("score_per_1up", "u32"),
+    ("space_pause", "u32"),
+    ("hide_obj_pause", "u32"),
+    ("show_symbol_image", "u32"),
+    ("font_index", "u32"),
+    ("decoration", "u32"),
+    ("monospace", "u32"),
+    ("min_damage_reduct_base", "u32"),
+    ("min_damage_reduct_percent", "u32"),
+    ("min_shock_reduct_base", "u32"),
+    ("min_shock_reduct_percent", "u32"),
+    ("enable_test_play_everywhere", "u32"),
+    ("character_draw", "u32"),
+    ("allow_replay_save", "u32"),
+    ("alow_manual_replay_save", "u32"),
+    ("replay_file_format", "u32"),
+    ("use_explorer_file_dialog_for_file_select", "u32"),
+    ("show_image_on_title_screen", "u32"),
+    ("auto_save_default", "u32"),
+    ("show_description", "u32"),
+    ("share_lives_across_story", "u32"),
+    ("return_worldmap_on_death", "u32"),
+    ("show_lives_on_worldmap", "u32"),
+    ("multistage_autosave_after_each_stage", "u32"),
+    ("challenge_mode_world", "u32"),
+    ("all_worlds_selectable_on_start", "u32"),
+    ("show_highscore", "u32"),
+    ("show_totalscore", "u32"),
+    ("always_reset_commonvar_on_worldmap", "u32"),
+    ("retry_pause_menu_option_in_cleared_worlds", "u32"),
+    ("challenge_show_highscore", "u32"),
+    ("challenge_show_totalscore", "u32"),
+    ("challenge_death_reset_commonvar", "u32"),
+    ("challenge_retry_pause_menu_option_in_cleared_worlds", "u32"),
+    ("freemode_death_reset_commonvar", "u32"),
+    ("testplay_death_reset_commonvar", "u32"),
+    ("bitmap_color_mode", "u32"),
+    ("transparent_color_r", "u8"),
+    ("transparent_color_g", "u8"),
+    ("transparent_color_b", "u8"),
+    ("compat_v2_12", "u32"),
+    ("compat_v2_60", "u32"),
+    ("play_death_for_stauts_and_code_exec", "u32"),
+    ("play_invincibility_effect", "u32"),
+    ("invincibility_effect_speed", "u32"),
+    ("enable_color_invincible_anim", "u32"),
+    ("return_to_map_pause_menu_option", "u32"),
+    ("compat_v5_23", "u32"),
+    ("compat_v5_54", "u32"),
+    ("compat_v6_16", "u32"),
+    ("compat_v6_68", "u32"),
+    ("compat_v6_76", "u32"),
+    ("compat_v6_94", "u32"),
+    ("unk_compat_alwayson", "u32"),
+    ("compat_v6_96", "u32"),
+    ("compat_v7_20", "u32"),
+    ("compat_v7_22", "u32"),
+    ("compat_v7_32", "u32"),
+    ("compat_v7_34", "u32"),
+    ("compat_v7_47", "u32"),
+    ("compat_v7_51", "u32"),
+    ("compat_v7_59", "u32"),
+    ("compat_v7_47_nofx", "u32"),
+    ("compat_v7_47_linfx", "u32"),
+    ("compat_v7_72", "u32"),
+    ("compat_v7_80", "u32"),
+    ("compat_v7_81", "u32"),
+    ("compat_v7_82", "u32"),
+    ("compat_v7_92", "u32"),
+    ("compat_v8_04", "u32"),
+    ("compat_v8_07", "u32"),
+    ("compat_v8_16", "u32"),
+    ("compat_v8_17", "u32"),
+    ("compat_v8_18", "u32"),
+    ("compat_v8_21", "u32"),
+    ("compat_v8_25", "u32"),
+    ("compat_v8_29", "u32"),
+    ("compat_v8_32", "u32"),
+    ("compat_v8_36", "u32"),
+    ("compat_v8_37", "u32"),
+    ("compat_v8_40", "u32"),
+    ("compat_v8_44_higherjump", "u32"),
+    ("compat_v8_44_delayedjump", "u32"),
+    ("compat_v8_44_lowerjump", "u32"),
+    ("compat_v8_44_detach_riders", "u32"),
+    ("compat_v8_60", "u32"),
+    ("compat_v8_73", "u32"),
+    ("compat_v8_90_wrap", "u32"),
+    ("compat_v8_90_statuscode", "u32"),
+    ("compat_v8_90_walkerY", "u32"),
+    ("compat_v8_96", "u32"),
+    ("compat_v9_03", "u32"),
+    ("compat_v9_11", "u32"),
+    ("compat_v9_12", "u32"),
+    ("compat_v9_80", "u32"),
+    ("compat_v9_85", "u32"),
+    ("direct3_color_depth", "u32"),
+    ("directdraw_color_depth", "u32"),
+    ("go_title_after_stage_clear", "u32"),
+    ("strings_count", "u32"),
+)
+
+SYSTEM_TARGETS_LAYOUT = RecordLayout(*[(key, "u8") for key in SYSTEM_TARGET_KEYS])
+SYSTEM_TARGETS_RESET_LAYOUT = RecordLayout(*[(key, "u8") for key in SYSTEM_TARGET_RESET_KEYS])
+
+STATUS_WINDOW_LAYOUT = RecordLayout(
+    ("header", "u32"),
+    ("is_visible", "u32"),
+    ("show_symbol", "u32"),
+    ("max", "u32"),
+    ("unk1", "u32"),
+    ("color_change_condition", "u32"),
+    ("change_operator", "u32"),
+    ("strings_count", "u32"),
+)
+
+SYSTEM_LIVES_LAYOUT = RecordLayout(
+    ("header_initial", "u32"),
+    ("story_mode_initial", "u32"),
+    ("challenge_mode_initial", "u32"),
+    ("free_mode_initial", "u32"),
+    ("free_mode_max", "u32"),
+    ("header_infinite", "u32"),
+    ("story_mode_infinite", "u32"),
+    ("challenge_mode_infinite", "u32"),
+    ("free_mode_infinite", "u32"),
+    ("free_mode_infini_max", "u32"),
+    ("rankings_count", "u32"),
+)
+
+SYSTEM_RANKING_LAYOUT = RecordLayout(
+    ("first_unk", "u32"),
+    ("ranking_on", "u32"),
+    ("second_unk", "u32"),
+    ("ranking_count", "u32"),
+)
+
+MENU_TEXT_LAYOUT = RecordLayout(
+    ("unk1", "u32"),
+    ("enabled", "u32"),
+    ("unk2", "u32"),
+)
+
+INI_CONF_LAYOUT = RecordLayout(
+    ("unk1", "u32"),
+    ("unk2", "u32"),
+    ("default_value", "u32"),
+    ("string_count", "u32"),
+)
+
 class System(ActedBinaryFile):
     def __init__(self, file_path: Union[str, Path]):
         super().__init__(file_path)
@@ -643,154 +810,27 @@ class System(ActedBinaryFile):
             self.magic = self.read_u32()
 
             data = self.data
-            data.unk0 = self.read_u32()
-            data.up_process_on_stage_clear = self.read_u32()
-            data.score_per_1up = self.read_u32()
-            data.space_pause = self.read_u32()
-            data.hide_obj_pause = self.read_u32()
-            data.show_symbol_image = self.read_u32()
-            data.font_index = self.read_u32()
-            data.decoration = self.read_u32()
-            data.monospace = self.read_u32()
-            data.min_damage_reduct_base = self.read_u32()
-            data.min_damage_reduct_percent = self.read_u32()
-            data.min_shock_reduct_base = self.read_u32()
-            data.min_shock_reduct_percent = self.read_u32()
-            data.enable_test_play_everywhere = self.read_u32()
-            data.character_draw = self.read_u32()
-            data.allow_replay_save = self.read_u32()
-            data.alow_manual_replay_save = self.read_u32()
-            data.replay_file_format = self.read_u32()
-            data.use_explorer_file_dialog_for_file_select = self.read_u32()
-            data.show_image_on_title_screen = self.read_u32()
-            data.auto_save_default = self.read_u32()
-            data.show_description = self.read_u32()
-            data.share_lives_across_story = self.read_u32()
-            data.return_worldmap_on_death = self.read_u32()
-            data.show_lives_on_worldmap = self.read_u32()
-            data.multistage_autosave_after_each_stage = self.read_u32()
-            data.challenge_mode_world = self.read_u32()
-            data.all_worlds_selectable_on_start = self.read_u32()
-            data.show_highscore = self.read_u32()
-            data.show_totalscore = self.read_u32()
-            data.always_reset_commonvar_on_worldmap = self.read_u32()
-            data.retry_pause_menu_option_in_cleared_worlds = self.read_u32()
-            data.challenge_show_highscore = self.read_u32()
-            data.challenge_show_totalscore = self.read_u32()
-            data.challenge_death_reset_commonvar = self.read_u32()
-            data.challenge_retry_pause_menu_option_in_cleared_worlds = self.read_u32()
-            data.freemode_death_reset_commonvar = self.read_u32()
-            data.testplay_death_reset_commonvar = self.read_u32()
-            data.bitmap_color_mode = self.read_u32()
-            data.transparent_color_r = self.read_u8()
-            data.transparent_color_g = self.read_u8()
-            data.transparent_color_b = self.read_u8()
-            data.compat_v2_12 = self.read_u32()
-            data.compat_v2_60 = self.read_u32()
-            data.play_death_for_stauts_and_code_exec = self.read_u32()
-            data.play_invincibility_effect = self.read_u32()
-            data.invincibility_effect_speed = self.read_u32()
-            data.enable_color_invincible_anim = self.read_u32()
-            data.return_to_map_pause_menu_option = self.read_u32()
-            data.compat_v5_23 = self.read_u32()
-            data.compat_v5_54 = self.read_u32()
-            data.compat_v6_16 = self.read_u32()
-            data.compat_v6_68 = self.read_u32()
-            data.compat_v6_76 = self.read_u32()
-            data.compat_v6_94 = self.read_u32()
-            data.unk_compat_alwayson = self.read_u32()
-            data.compat_v6_96 = self.read_u32()
-            data.compat_v7_20 = self.read_u32()
-            data.compat_v7_22 = self.read_u32()
-            data.compat_v7_32 = self.read_u32()
-            data.compat_v7_34 = self.read_u32()
-            data.compat_v7_47 = self.read_u32()
-            data.compat_v7_51 = self.read_u32()
-            data.compat_v7_59 = self.read_u32()
-            data.compat_v7_47_nofx = self.read_u32()
-            data.compat_v7_47_linfx = self.read_u32()
-            data.compat_v7_72 = self.read_u32()
-            data.compat_v7_80 = self.read_u32()
-            data.compat_v7_81 = self.read_u32()
-            data.compat_v7_82 = self.read_u32()
-            data.compat_v7_92 = self.read_u32()
-            data.compat_v8_04 = self.read_u32()
-            data.compat_v8_07 = self.read_u32()
-            data.compat_v8_16 = self.read_u32()
-            data.compat_v8_17 = self.read_u32()
-            data.compat_v8_18 = self.read_u32()
-            data.compat_v8_21 = self.read_u32()
-            data.compat_v8_25 = self.read_u32()
-            data.compat_v8_29 = self.read_u32()
-            data.compat_v8_32 = self.read_u32()
-            data.compat_v8_36 = self.read_u32()
-            data.compat_v8_37 = self.read_u32()
-            data.compat_v8_40 = self.read_u32()
-            data.compat_v8_44_higherjump = self.read_u32()
-            data.compat_v8_44_delayedjump = self.read_u32()
-            data.compat_v8_44_lowerjump = self.read_u32()
-            data.compat_v8_44_detach_riders = self.read_u32()
-            data.compat_v8_60 = self.read_u32()
-            data.compat_v8_73 = self.read_u32()
-            data.compat_v8_90_wrap = self.read_u32()
-            data.compat_v8_90_statuscode = self.read_u32()
-            data.compat_v8_90_walkerY = self.read_u32()
-            data.compat_v8_96 = self.read_u32()
-            data.compat_v9_03 = self.read_u32()
-            data.compat_v9_11 = self.read_u32()
-            data.compat_v9_12 = self.read_u32()
-            data.compat_v9_80 = self.read_u32()
-            data.compat_v9_85 = self.read_u32()
-            data.direct3_color_depth = self.read_u32()
-            data.directdraw_color_depth = self.read_u32()
-            data.go_title_after_stage_clear = self.read_u32()
-            data.strings_count = self.read_u32()
+            self.read_record(SYSTEM_LAYOUT, data)
             data.game_title = self.read_std_string()
             data.description = self.read_std_string()
 
             data.targets.count = self.read_u32()
-            for key in SYSTEM_TARGET_KEYS:
-                setattr(data.targets, key, self.read_u8())
+            self.read_record(SYSTEM_TARGETS_LAYOUT, data.targets)
 
             data.targets_reseted.count = self.read_u32()
-            for key in SYSTEM_TARGET_RESET_KEYS:
-                setattr(data.targets_reseted, key, self.read_u8())
+            self.read_record(SYSTEM_TARGETS_RESET_LAYOUT, data.targets_reseted)
 
             data.status_window_count = self.read_u32()
             data.status_windows = []
             for _ in range(data.status_window_count):
-                window = StatusWindowData()
-                window.header = self.read_u32()
-                window.is_visible = self.read_u32()
-                window.show_symbol = self.read_u32()
-                window.max = self.read_u32()
-                window.unk1 = self.read_u32()
-                window.color_change_condition = self.read_u32()
-                window.change_operator = self.read_u32()
-                window.strings_count = self.read_u32()
+                window = self.read_record(STATUS_WINDOW_LAYOUT, StatusWindowData())
                 window.text = self.read_std_string()
                 data.status_windows.append(window)
 
-            data.header_initial = self.read_u32()
-            data.story_mode_initial = self.read_u32()
-            data.challenge_mode_initial = self.read_u32()
-            data.free_mode_initial = self.read_u32()
-            data.free_mode_max = self.read_u32()
-
-            data.header_infinite = self.read_u32()
-            data.story_mode_infinite = self.read_u32()
-            data.challenge_mode_infinite = self.read_u32()
-            data.free_mode_infinite = self.read_u32()
-            data.free_mode_infini_max = self.read_u32()
-
-            data.rankings_count = self.read_u32()
+            self.read_record(SYSTEM_LIVES_LAYOUT, data)
             data.rankings = []
             for _ in range(data.rankings_count):
-                ranking = RankingData()
-                ranking.first_unk = self.read_u32()
-                ranking.ranking_on = self.read_u32()
-                ranking.second_unk = self.read_u32()
-                ranking.ranking_count = self.read_u32()
+                ranking = self.read_record(SYSTEM_RANKING_LAYOUT, RankingData())
                 ranking.ranking_criterias = [self.read_u8() for _ in range(ranking.ranking_count)]
                 data.rankings.append(ranking)
 
@@ -809,30 +849,21 @@ class System(ActedBinaryFile):
             data.title_menu_texts_count = self.read_u32()
             data.title_menu_texts = []
             for _ in range(data.title_menu_texts_count):
-                menu_text = MenuTextData()
-                menu_text.unk1 = self.read_u32()
-                menu_text.enabled = self.read_u32()
-                menu_text.unk2 = self.read_u32()
+                menu_text = self.read_record(MENU_TEXT_LAYOUT, MenuTextData())
                 menu_text.text = self.read_std_string()
                 data.title_menu_texts.append(menu_text)
 
             data.worldmap_menu_count = self.read_u32()
             data.worldmap_menu_texts = []
             for _ in range(data.worldmap_menu_count):
-                menu_text = MenuTextData()
-                menu_text.unk1 = self.read_u32()
-                menu_text.enabled = self.read_u32()
-                menu_text.unk2 = self.read_u32()
+                menu_text = self.read_record(MENU_TEXT_LAYOUT, MenuTextData())
                 menu_text.text = self.read_std_string()
                 data.worldmap_menu_texts.append(menu_text)
 
             data.option_menu_count = self.read_u32()
             data.option_menu_texts = []
             for _ in range(data.option_menu_count):
-                menu_text = MenuTextData()
-                menu_text.unk1 = self.read_u32()
-                menu_text.enabled = self.read_u32()
-                menu_text.unk2 = self.read_u32()
+                menu_text = self.read_record(MENU_TEXT_LAYOUT, MenuTextData())
                 menu_text.text = self.read_std_string()
                 data.option_menu_texts.append(menu_text)
 
@@ -848,11 +879,7 @@ class System(ActedBinaryFile):
             data.settings_ini_count = self.read_u32()
             data.setting_init = []
             for _ in range(data.settings_ini_count):
-                conf = IniConfData()
-                conf.unk1 = self.read_u32()
-                conf.unk2 = self.read_u32()
-                conf.default_value = self.read_u32()
-                conf.string_count = self.read_u32()
+                conf = self.read_record(INI_CONF_LAYOUT, IniConfData())
                 conf.id_string = self.read_std_string()
                 conf.default_str = self.read_std_string()
                 data.setting_init.append(conf)
@@ -867,148 +894,26 @@ class System(ActedBinaryFile):
         self.start_writing()
         data = self.data
         self.write_u32(self.magic)
-        self.write_u32(data.unk0)
-        self.write_u32(data.up_process_on_stage_clear)
-        self.write_u32(data.score_per_1up)
-        self.write_u32(data.space_pause)
-        self.write_u32(data.hide_obj_pause)
-        self.write_u32(data.show_symbol_image)
-        self.write_u32(data.font_index)
-        self.write_u32(data.decoration)
-        self.write_u32(data.monospace)
-        self.write_u32(data.min_damage_reduct_base)
-        self.write_u32(data.min_damage_reduct_percent)
-        self.write_u32(data.min_shock_reduct_base)
-        self.write_u32(data.min_shock_reduct_percent)
-        self.write_u32(data.enable_test_play_everywhere)
-        self.write_u32(data.character_draw)
-        self.write_u32(data.allow_replay_save)
-        self.write_u32(data.alow_manual_replay_save)
-        self.write_u32(data.replay_file_format)
-        self.write_u32(data.use_explorer_file_dialog_for_file_select)
-        self.write_u32(data.show_image_on_title_screen)
-        self.write_u32(data.auto_save_default)
-        self.write_u32(data.show_description)
-        self.write_u32(data.share_lives_across_story)
-        self.write_u32(data.return_worldmap_on_death)
-        self.write_u32(data.show_lives_on_worldmap)
-        self.write_u32(data.multistage_autosave_after_each_stage)
-        self.write_u32(data.challenge_mode_world)
-        self.write_u32(data.all_worlds_selectable_on_start)
-        self.write_u32(data.show_highscore)
-        self.write_u32(data.show_totalscore)
-        self.write_u32(data.always_reset_commonvar_on_worldmap)
-        self.write_u32(data.retry_pause_menu_option_in_cleared_worlds)
-        self.write_u32(data.challenge_show_highscore)
-        self.write_u32(data.challenge_show_totalscore)
-        self.write_u32(data.challenge_death_reset_commonvar)
-        self.write_u32(data.challenge_retry_pause_menu_option_in_cleared_worlds)
-        self.write_u32(data.freemode_death_reset_commonvar)
-        self.write_u32(data.testplay_death_reset_commonvar)
-        self.write_u32(data.bitmap_color_mode)
-        self.write_u8(data.transparent_color_r)
-        self.write_u8(data.transparent_color_g)
-        self.write_u8(data.transparent_color_b)
-        self.write_u32(data.compat_v2_12)
-        self.write_u32(data.compat_v2_60)
-        self.write_u32(data.play_death_for_stauts_and_code_exec)
-        self.write_u32(data.play_invincibility_effect)
-        self.write_u32(data.invincibility_effect_speed)
-        self.write_u32(data.enable_color_invincible_anim)
-        self.write_u32(data.return_to_map_pause_menu_option)
-        self.write_u32(data.compat_v5_23)
-        self.write_u32(data.compat_v5_54)
-        self.write_u32(data.compat_v6_16)
-        self.write_u32(data.compat_v6_68)
-        self.write_u32(data.compat_v6_76)
-        self.write_u32(data.compat_v6_94)
-        self.write_u32(data.unk_compat_alwayson)
-        self.write_u32(data.compat_v6_96)
-        self.write_u32(data.compat_v7_20)
-        self.write_u32(data.compat_v7_22)
-        self.write_u32(data.compat_v7_32)
-        self.write_u32(data.compat_v7_34)
-        self.write_u32(data.compat_v7_47)
-        self.write_u32(data.compat_v7_51)
-        self.write_u32(data.compat_v7_59)
-        self.write_u32(data.compat_v7_47_nofx)
-        self.write_u32(data.compat_v7_47_linfx)
-        self.write_u32(data.compat_v7_72)
-        self.write_u32(data.compat_v7_80)
-        self.write_u32(data.compat_v7_81)
-        self.write_u32(data.compat_v7_82)
-        self.write_u32(data.compat_v7_92)
-        self.write_u32(data.compat_v8_04)
-        self.write_u32(data.compat_v8_07)
-        self.write_u32(data.compat_v8_16)
-        self.write_u32(data.compat_v8_17)
-        self.write_u32(data.compat_v8_18)
-        self.write_u32(data.compat_v8_21)
-        self.write_u32(data.compat_v8_25)
-        self.write_u32(data.compat_v8_29)
-        self.write_u32(data.compat_v8_32)
-        self.write_u32(data.compat_v8_36)
-        self.write_u32(data.compat_v8_37)
-        self.write_u32(data.compat_v8_40)
-        self.write_u32(data.compat_v8_44_higherjump)
-        self.write_u32(data.compat_v8_44_delayedjump)
-        self.write_u32(data.compat_v8_44_lowerjump)
-        self.write_u32(data.compat_v8_44_detach_riders)
-        self.write_u32(data.compat_v8_60)
-        self.write_u32(data.compat_v8_73)
-        self.write_u32(data.compat_v8_90_wrap)
-        self.write_u32(data.compat_v8_90_statuscode)
-        self.write_u32(data.compat_v8_90_walkerY)
-        self.write_u32(data.compat_v8_96)
-        self.write_u32(data.compat_v9_03)
-        self.write_u32(data.compat_v9_11)
-        self.write_u32(data.compat_v9_12)
-        self.write_u32(data.compat_v9_80)
-        self.write_u32(data.compat_v9_85)
-        self.write_u32(data.direct3_color_depth)
-        self.write_u32(data.directdraw_color_depth)
-        self.write_u32(data.go_title_after_stage_clear)
-        self.write_u32(data.strings_count)
+        self.write_record(SYSTEM_LAYOUT, data)
         self.write_std_string(data.game_title)
         self.write_std_string(data.description)
 
         self.write_u32(data.targets.count)
-        for key in SYSTEM_TARGET_KEYS:
-            self.write_u8(getattr(data.targets, key))
+        self.write_record(SYSTEM_TARGETS_LAYOUT, data.targets)
 
         self.write_u32(data.targets_reseted.count)
-        for key in SYSTEM_TARGET_RESET_KEYS:
-            self.write_u8(getattr(data.targets_reseted, key))
+        self.write_record(SYSTEM_TARGETS_RESET_LAYOUT, data.targets_reseted)
 
         self.write_u32(len(data.status_windows))
         for window in data.status_windows:
-            self.write_u32(window.header)
-            self.write_u32(window.is_visible)
-            self.write_u32(window.show_symbol)
-            self.write_u32(window.max)
-            self.write_u32(window.unk1)
-            self.write_u32(window.color_change_condition)
-            self.write_u32(window.change_operator)
-            self.write_u32(window.strings_count)
+            self.write_record(STATUS_WINDOW_LAYOUT, window)
             self.write_std_string(window.text)
 
-        self.write_u32(data.header_initial)
-        self.write_u32(data.story_mode_initial)
-        self.write_u32(data.challenge_mode_initial)
-        self.write_u32(data.free_mode_initial)
-        self.write_u32(data.free_mode_max)
-        self.write_u32(data.header_infinite)
-        self.write_u32(data.story_mode_infinite)
-        self.write_u32(data.challenge_mode_infinite)
-        self.write_u32(data.free_mode_infinite)
-        self.write_u32(data.free_mode_infini_max)
-
-        self.write_u32(len(data.rankings))
+        data.rankings_count = len(data.rankings)
+        self.write_record(SYSTEM_LIVES_LAYOUT, data)
         for ranking in data.rankings:
-            self.write_u32(ranking.first_unk)
-            self.write_u32(ranking.ranking_on)
-            self.write_u32(ranking.second_unk)
-            self.write_u32(len(ranking.ranking_criterias))
+            ranking.ranking_count = len(ranking.ranking_criterias)
+            self.write_record(SYSTEM_RANKING_LAYOUT, ranking)
             for criteria in ranking.ranking_criterias:
                 self.write_u8(criteria)
 
@@ -1030,23 +935,17 @@ class System(ActedBinaryFile):
 
         self.write_u32(len(data.title_menu_texts))
         for menu_text in data.title_menu_texts:
-            self.write_u32(menu_text.unk1)
-            self.write_u32(menu_text.enabled)
-            self.write_u32(menu_text.unk2)
+            self.write_record(MENU_TEXT_LAYOUT, menu_text)
             self.write_std_string(menu_text.text)
 
         self.write_u32(len(data.worldmap_menu_texts))
         for menu_text in data.worldmap_menu_texts:
-            self.write_u32(menu_text.unk1)
-            self.write_u32(menu_text.enabled)
-            self.write_u32(menu_text.unk2)
+            self.write_record(MENU_TEXT_LAYOUT, menu_text)
             self.write_std_string(menu_text.text)
 
         self.write_u32(len(data.option_menu_texts))
         for menu_text in data.option_menu_texts:
-            self.write_u32(menu_text.unk1)
-            self.write_u32(menu_text.enabled)
-            self.write_u32(menu_text.unk2)
+            self.write_record(MENU_TEXT_LAYOUT, menu_text)
             self.write_std_string(menu_text.text)
 
         self.write_u32(len(data.ranking_entry_texts))
@@ -1063,16 +962,14 @@ class System(ActedBinaryFile):
 
         self.write_u32(len(data.setting_init))
         for conf in data.setting_init:
-            self.write_u32(conf.unk1)
-            self.write_u32(conf.unk2)
-            self.write_u32(conf.default_value)
-            self.write_u32(conf.string_count)
+            self.write_record(INI_CONF_LAYOUT, conf)
             self.write_std_string(conf.id_string)
             self.write_std_string(conf.default_str)
 
+        self.finish_writing()
         return self._data
 
-@dataclass
+@slotted_dataclass
 class GValInfoData:
     pass  # TODO: Add fields
 
@@ -1156,6 +1053,7 @@ class Anime(ActedBinaryFile):
                 self.write_u32(frame.exec_commands)
                 self.write_u32(frame.unknown2)
         
+        self.finish_writing()
         return self._data
 
 class BmpCharaExc(ActedBinaryFile):
@@ -1213,6 +1111,7 @@ class BmpCharaExc(ActedBinaryFile):
             self.write_std_string(element.name)
             self.write_std_string(element.path)
 
+        self.finish_writing()
         return self._data
 
 class SwordType(ActedBinaryFile):
@@ -1303,6 +1202,7 @@ class SwordType(ActedBinaryFile):
                 self.write_u32(pos.index)
                 self.write_u32(pos.unknown6)
         
+        self.finish_writing()
         return self._data
 
 class Effect(ActedBinaryFile):
@@ -1375,6 +1275,7 @@ class Effect(ActedBinaryFile):
                 self.write_u32(anim.start)
                 self.write_u32(anim.end)
                 self.write_u32(anim.unknown)
+        self.finish_writing()
         return self._data
 
 class CharaEffect(ActedBinaryFile):
@@ -1431,6 +1332,7 @@ class CharaEffect(ActedBinaryFile):
             self.write_u32(element.param5)
             self.write_u32(1) # element.unknown)
             self.write_std_string(element.name)
+        self.finish_writing()
         return self._data
 
 class ScrEffect(ActedBinaryFile):
@@ -1487,6 +1389,7 @@ class ScrEffect(ActedBinaryFile):
             self.write_u32(element.param5)
             self.write_u32(1) # element.unknown)
             self.write_std_string(element.name)
+        self.finish_writing()
         return self._data
 
 class Picture(ActedBinaryFile):
@@ -1538,6 +1441,7 @@ class Picture(ActedBinaryFile):
             self.write_u32(2) # element.unknown2)
             self.write_std_string(element.name)
             self.write_std_string(element.path)
+        self.finish_writing()
         return self._data
 
 class Sound(ActedBinaryFile):
@@ -1589,6 +1493,7 @@ class Sound(ActedBinaryFile):
             self.write_u32(2) # element.unknown2)
             self.write_std_string(element.name)
             self.write_std_string(element.path)
+        self.finish_writing()
         return self._data
 
 class Bgm(ActedBinaryFile):
@@ -1642,6 +1547,7 @@ class Bgm(ActedBinaryFile):
             self.write_u32(2) # element.unknown)
             self.write_std_string(element.name)
             self.write_std_string(element.path)
+        self.finish_writing()
         return self._data
 
 class CommonPalette(ActedBinaryFile): pass
@@ -1952,75 +1858,7 @@ class WorldMap(ActedBinaryFile):
         self.write_std_string(page.world_name)
         self.write_std_string(page.start_stage)
 
-@dataclass
-class StageDeathFade:
-    list_size: int = 0
-    auto_disappear_left: int = 0
-    auto_disappear_right: int = 0
-    auto_disappear_top: int = 0
-    auto_disappear_bottom: int = 0
-    disappear_left_range: int = 0
-    disappear_right_range: int = 0
-    disappear_top_range: int = 0
-    disappear_bottom_range: int = 0
-    block_end: int = 0
-
-
-@dataclass
-class StagePlayerCollision:
-    walking_block_width: int = 0
-    walking_block_height: int = 0
-    flying_block_width: int = 0
-    flying_block_height: int = 0
-    walking_character_width: int = 0
-    walking_character_height: int = 0
-    flying_character_width: int = 0
-    flying_character_height: int = 0
-    shot_width: int = 0
-    shot_height: int = 0
-    item_width: int = 0
-    item_height: int = 0
-    walking_block_position: int = 0
-    flying_block_position: int = 0
-    walking_character_position: int = 0
-    flying_character_position: int = 0
-    block_display: int = 0
-    character_display: int = 0
-    shot_display: int = 0
-    item_display: int = 0
-    block_display_color: int = 0
-    character_display_color: int = 0
-    shot_display_color: int = 0
-    item_display_color: int = 0
-
-
-@dataclass
-class StageEnemyCollision:
-    walking_block_width: int = 0
-    walking_block_height: int = 0
-    flying_block_width: int = 0
-    flying_block_height: int = 0
-    walking_character_width: int = 0
-    walking_character_height: int = 0
-    flying_character_width: int = 0
-    flying_character_height: int = 0
-    shot_width: int = 0
-    shot_height: int = 0
-    walking_block_position: int = 0
-    flying_block_position: int = 0
-    walking_character_position: int = 0
-    flying_character_position: int = 0
-
-
-@dataclass
-class StageActorHitbox:
-    shot_width: int = 0
-    shot_height: int = 0
-    character_width: int = 0
-    character_height: int = 0
-
-
-@dataclass
+@slotted_dataclass
 class StageHeader:
     magic: int = 0
     entry_count: int = 0
@@ -2101,11 +1939,77 @@ class StageHeader:
     enemy_death: StageDeathFade = field(default_factory=StageDeathFade)
 
 
-@dataclass
+@slotted_dataclass
 class StageData:
     header: StageHeader = field(default_factory=StageHeader)
-    palette_payload: List[int] = field(default_factory=list)
-
+    palette_payload: bytes = b""
+
+
+# Fixed-width field runs of the stage header, decoded with one struct call each.
+STAGE_HEADER_LAYOUT = RecordLayout(
+    ("magic", "u32"),
+    ("entry_count", "u32"),
+    ("width", "u32"),
+    ("chunk_width", "u32"),
+    ("chunk_pow", "u32"),
+    ("height", "u32"),
+    ("enable_horizontal_scroll_minimum", "u32"),
+    ("enable_horizontal_scroll_maximum", "u32"),
+    ("enable_vertical_scroll_minimum", "u32"),
+    ("enable_vertical_scroll_maximum", "u32"),
+    ("horizontal_scroll_minimum_value", "u32"),
+    ("horizontal_scroll_maximum_value", "u32"),
+    ("vertical_scroll_minimum_value", "u32"),
+    ("vertical_scroll_maximum_value", "u32"),
+    ("frame_rate", "u32"),
+    ("enable_time_limit", "u32"),
+    ("time_limit_duration", "u32"),
+    ("warning_sound_start_time", "u32"),
+    ("enable_side_scroll", "u32"),
+    ("enable_vertical_scroll", "u32"),
+    ("autoscroll_speed", "u32"),
+    ("vertical_scroll_speed", "u32"),
+    ("gravity", "f64"),
+    ("hit_detection_level", "u32"),
+    ("character_shot_collision_detection_accuracy", "u32"),
+    ("bgm_number", "u32"),
+    ("bgm_loop_playback", "u32"),
+    ("dont_restart_bgm_if_no_change", "u32"),
+    ("enable_z_coordinate", "u32"),
+    ("inherit_status_from_stock", "u32"),
+    ("store_status_to_stock", "u32"),
+    ("show_status_window", "u32"),
+    ("switch_scene_immediately_on_clear", "u32"),
+    ("allow_replay_save", "u32"),
+    ("show_stage", "u32"),
+    ("show_ready", "u32"),
+    ("show_clear", "u32"),
+    ("show_gameover", "u32"),
+)
+
+STAGE_LIMITS_LAYOUT = RecordLayout(
+    ("undo_max_times", "u32"),
+    ("x_coordinate_upper_limit", "u32"),
+    ("y_coordinate_upper_limit", "u32"),
+    ("unk75", "u32"),
+    ("unk76", "u32"),
+    ("unk77", "u32"),
+    ("unk78", "u32"),
+    ("unk79", "u32"),
+    ("unk80", "u32"),
+    ("unk81", "u32"),
+    ("unk82", "u32"),
+    ("unk83", "u32"),
+    ("unk84", "u32"),
+    ("unk85", "u32"),
+    ("unk86", "u32"),
+    ("disable_damage_outside_screen", "u32"),
+    ("player_invincibility_from_same_enemy_duration", "u32"),
+    ("player_invincibility_duration", "u32"),
+    ("enemy_invincibility_from_same_player_duration", "u32"),
+    ("enemy_invincibility_duration", "u32"),
+    ("stage_name_count", "u32"),
+)
 
 class Stage(ActedBinaryFile):
     def __init__(self, file_path: Union[str, Path]):
@@ -2125,99 +2029,20 @@ class Stage(ActedBinaryFile):
             self.version = self.read_u32()
             header = self.data.header
 
-            header.magic = self.read_u32()
-            header.entry_count = self.read_u32()
-            header.width = self.read_u32()
-            header.chunk_width = self.read_u32()
-            header.chunk_pow = self.read_u32()
-            header.height = self.read_u32()
-
-            header.enable_horizontal_scroll_minimum = self.read_u32()
-            header.enable_horizontal_scroll_maximum = self.read_u32()
-            header.enable_vertical_scroll_minimum = self.read_u32()
-            header.enable_vertical_scroll_maximum = self.read_u32()
-
-            header.horizontal_scroll_minimum_value = self.read_u32()
-            header.horizontal_scroll_maximum_value = self.read_u32()
-            header.vertical_scroll_minimum_value = self.read_u32()
-            header.vertical_scroll_maximum_value = self.read_u32()
-
-            header.frame_rate = self.read_u32()
-            header.enable_time_limit = self.read_u32()
-            header.time_limit_duration = self.read_u32()
-            header.warning_sound_start_time = self.read_u32()
-
-            header.enable_side_scroll = self.read_u32()
-            header.enable_vertical_scroll = self.read_u32()
-            header.autoscroll_speed = self.read_u32()
-            header.vertical_scroll_speed = self.read_u32()
-
-            header.gravity = self.read_f64()
-
-            header.hit_detection_level = self.read_u32()
-            header.character_shot_collision_detection_accuracy = self.read_u32()
-
-            header.bgm_number = self.read_u32()
-            header.bgm_loop_playback = self.read_u32()
-            header.dont_restart_bgm_if_no_change = self.read_u32()
-
-            header.enable_z_coordinate = self.read_u32()
-
-            header.inherit_status_from_stock = self.read_u32()
-            header.store_status_to_stock = self.read_u32()
-            header.show_status_window = self.read_u32()
-
-            header.switch_scene_immediately_on_clear = self.read_u32()
-            header.allow_replay_save = self.read_u32()
-
-            header.show_stage = self.read_u32()
-            header.show_ready = self.read_u32()
-            header.show_clear = self.read_u32()
-            header.show_gameover = self.read_u32()
+            self.read_record(STAGE_HEADER_LAYOUT, header)
 
             header.player_collision = self._read_player_collision()
             header.enemy_collision = self._read_enemy_collision()
 
-            header.item_collision_width = self.read_u32()
-            header.item_collision_height = self.read_u32()
+            self.read_record(ITEM_COLLISION_LAYOUT, header)
 
             header.player_hitbox = self._read_actor_hitbox()
             header.enemy_hitbox = self._read_actor_hitbox()
 
-            header.undo_max_times = self.read_u32()
-            header.x_coordinate_upper_limit = self.read_u32()
-            header.y_coordinate_upper_limit = self.read_u32()
-
-            header.unk75 = self.read_u32()
-            header.unk76 = self.read_u32()
-            header.unk77 = self.read_u32()
-            header.unk78 = self.read_u32()
-            header.unk79 = self.read_u32()
-            header.unk80 = self.read_u32()
-            header.unk81 = self.read_u32()
-            header.unk82 = self.read_u32()
-            header.unk83 = self.read_u32()
-            header.unk84 = self.read_u32()
-            header.unk85 = self.read_u32()
-            header.unk86 = self.read_u32()
-
-            header.disable_damage_outside_screen = self.read_u32()
-
-            header.player_invincibility_from_same_enemy_duration = self.read_u32()
-            header.player_invincibility_duration = self.read_u32()
-
-            header.enemy_invincibility_from_same_player_duration = self.read_u32()
-            header.enemy_invincibility_duration = self.read_u32()
-
-            header.stage_name_count = self.read_u32()
+            self.read_record(STAGE_LIMITS_LAYOUT, header)
             header.stage_name = self.read_std_string()
 
-            header.ranking_size = self.read_u32()
-            header.ranking_score = self.read_u32()
-            header.ranking_remaining_time = self.read_u32()
-            header.ranking_clear_time = self.read_u32()
-            header.ranking_remaining_hp = self.read_u32()
-            header.ranking_remaining_sp = self.read_u32()
+            self.read_record(RANKING_LAYOUT, header)
 
             header.nonblock_enemy_death = self._read_death_fade()
             header.block_enemy_death = self._read_death_fade()
@@ -2226,228 +2051,50 @@ class Stage(ActedBinaryFile):
             header.enemy_death = self._read_death_fade()
 
             remaining = self._data[self._position:]
-            self.data.palette_payload = list(remaining)
+            self.data.palette_payload = bytes(remaining)
             return True
         except Exception as error:
             print(f"Failed to parse stage header for {self.file_path}: {error}")
             self.data.header = StageHeader()
-            self.data.palette_payload = list(self._data[4:])
+            self.data.palette_payload = bytes(self._data[4:])
             return True
 
     def _read_death_fade(self) -> StageDeathFade:
-        fade = StageDeathFade()
-        fade.list_size = self.read_u32()
-        fade.auto_disappear_left = self.read_u32()
-        fade.auto_disappear_right = self.read_u32()
-        fade.auto_disappear_top = self.read_u32()
-        fade.auto_disappear_bottom = self.read_u32()
-        fade.disappear_left_range = self.read_u32()
-        fade.disappear_right_range = self.read_u32()
-        fade.disappear_top_range = self.read_u32()
-        fade.disappear_bottom_range = self.read_u32()
-        fade.block_end = self.read_u32()
-        return fade
+        return self.read_record(DEATH_FADE_LAYOUT, StageDeathFade())
 
     def _read_player_collision(self) -> StagePlayerCollision:
-        collision = StagePlayerCollision()
-        collision.walking_block_width = self.read_u32()
-        collision.walking_block_height = self.read_u32()
-        collision.flying_block_width = self.read_u32()
-        collision.flying_block_height = self.read_u32()
-        collision.walking_character_width = self.read_u32()
-        collision.walking_character_height = self.read_u32()
-        collision.flying_character_width = self.read_u32()
-        collision.flying_character_height = self.read_u32()
-        collision.shot_width = self.read_u32()
-        collision.shot_height = self.read_u32()
-        collision.item_width = self.read_u32()
-        collision.item_height = self.read_u32()
-        collision.walking_block_position = self.read_u32()
-        collision.flying_block_position = self.read_u32()
-        collision.walking_character_position = self.read_u32()
-        collision.flying_character_position = self.read_u32()
-        collision.block_display = self.read_u32()
-        collision.character_display = self.read_u32()
-        collision.shot_display = self.read_u32()
-        collision.item_display = self.read_u32()
-        collision.block_display_color = self.read_u32()
-        collision.character_display_color = self.read_u32()
-        collision.shot_display_color = self.read_u32()
-        collision.item_display_color = self.read_u32()
-        return collision
+        return self.read_record(PLAYER_COLLISION_LAYOUT, StagePlayerCollision())
 
     def _read_enemy_collision(self) -> StageEnemyCollision:
-        collision = StageEnemyCollision()
-        collision.walking_block_width = self.read_u32()
-        collision.walking_block_height = self.read_u32()
-        collision.flying_block_width = self.read_u32()
-        collision.flying_block_height = self.read_u32()
-        collision.walking_character_width = self.read_u32()
-        collision.walking_character_height = self.read_u32()
-        collision.flying_character_width = self.read_u32()
-        collision.flying_character_height = self.read_u32()
-        collision.shot_width = self.read_u32()
-        collision.shot_height = self.read_u32()
-        collision.walking_block_position = self.read_u32()
-        collision.flying_block_position = self.read_u32()
-        collision.walking_character_position = self.read_u32()
-        collision.flying_character_position = self.read_u32()
-        return collision
+        return self.read_record(ENEMY_COLLISION_LAYOUT, StageEnemyCollision())
 
     def _read_actor_hitbox(self) -> StageActorHitbox:
-        hitbox = StageActorHitbox()
-        hitbox.shot_width = self.read_u32()
-        hitbox.shot_height = self.read_u32()
-        hitbox.character_width = self.read_u32()
-        hitbox.character_height = self.read_u32()
-        return hitbox
+        return self.read_record(ACTOR_HITBOX_LAYOUT, StageActorHitbox())
 
     def _write_death_fade(self, fade: StageDeathFade) -> None:
-        self.write_u32(fade.list_size)
-        self.write_u32(fade.auto_disappear_left)
-        self.write_u32(fade.auto_disappear_right)
-        self.write_u32(fade.auto_disappear_top)
-        self.write_u32(fade.auto_disappear_bottom)
-        self.write_u32(fade.disappear_left_range)
-        self.write_u32(fade.disappear_right_range)
-        self.write_u32(fade.disappear_top_range)
-        self.write_u32(fade.disappear_bottom_range)
-        self.write_u32(fade.block_end)
+        self.write_record(DEATH_FADE_LAYOUT, fade)
 
     def _write_player_collision(self, collision: StagePlayerCollision) -> None:
-        self.write_u32(collision.walking_block_width)
-        self.write_u32(collision.walking_block_height)
-        self.write_u32(collision.flying_block_width)
-        self.write_u32(collision.flying_block_height)
-        self.write_u32(collision.walking_character_width)
-        self.write_u32(collision.walking_character_height)
-        self.write_u32(collision.flying_character_width)
-        self.write_u32(collision.flying_character_height)
-        self.write_u32(collision.shot_width)
-        self.write_u32(collision.shot_height)
-        self.write_u32(collision.item_width)
-        self.write_u32(collision.item_height)
-        self.write_u32(collision.walking_block_position)
-        self.write_u32(collision.flying_block_position)
-        self.write_u32(collision.walking_character_position)
-        self.write_u32(collision.flying_character_position)
-        self.write_u32(collision.block_display)
-        self.write_u32(collision.character_display)
-        self.write_u32(collision.shot_display)
-        self.write_u32(collision.item_display)
-        self.write_u32(collision.block_display_color)
-        self.write_u32(collision.character_display_color)
-        self.write_u32(collision.shot_display_color)
-        self.write_u32(collision.item_display_color)
+        self.write_record(PLAYER_COLLISION_LAYOUT, collision)
 
     def _write_enemy_collision(self, collision: StageEnemyCollision) -> None:
-        self.write_u32(collision.walking_block_width)
-        self.write_u32(collision.walking_block_height)
-        self.write_u32(collision.flying_block_width)
-        self.write_u32(collision.flying_block_height)
-        self.write_u32(collision.walking_character_width)
-        self.write_u32(collision.walking_character_height)
-        self.write_u32(collision.flying_character_width)
-        self.write_u32(collision.flying_character_height)
-        self.write_u32(collision.shot_width)
-        self.write_u32(collision.shot_height)
-        self.write_u32(collision.walking_block_position)
-        self.write_u32(collision.flying_block_position)
-        self.write_u32(collision.walking_character_position)
-        self.write_u32(collision.flying_character_position)
+        self.write_record(ENEMY_COLLISION_LAYOUT, collision)
 
     def _write_actor_hitbox(self, hitbox: StageActorHitbox) -> None:
-        self.write_u32(hitbox.shot_width)
-        self.write_u32(hitbox.shot_height)
-        self.write_u32(hitbox.character_width)
-        self.write_u32(hitbox.character_height)
+        self.write_record(ACTOR_HITBOX_LAYOUT, hitbox)
 
     def _write_stage_header(self, header: StageHeader) -> None:
-        self.write_u32(header.magic)
-        self.write_u32(header.entry_count)
-        self.write_u32(header.width)
-        self.write_u32(header.chunk_width)
-        self.write_u32(header.chunk_pow)
-        self.write_u32(header.height)
-
-        self.write_u32(header.enable_horizontal_scroll_minimum)
-        self.write_u32(header.enable_horizontal_scroll_maximum)
-        self.write_u32(header.enable_vertical_scroll_minimum)
-        self.write_u32(header.enable_vertical_scroll_maximum)
-
-        self.write_u32(header.horizontal_scroll_minimum_value)
-        self.write_u32(header.horizontal_scroll_maximum_value)
-        self.write_u32(header.vertical_scroll_minimum_value)
-        self.write_u32(header.vertical_scroll_maximum_value)
-
-        self.write_u32(header.frame_rate)
-        self.write_u32(header.enable_time_limit)
-        self.write_u32(header.time_limit_duration)
-        self.write_u32(header.warning_sound_start_time)
-
-        self.write_u32(header.enable_side_scroll)
-        self.write_u32(header.enable_vertical_scroll)
-        self.write_u32(header.autoscroll_speed)
-        self.write_u32(header.vertical_scroll_speed)
-
-        self.write_f64(header.gravity)
-
-        self.write_u32(header.hit_detection_level)
-        self.write_u32(header.character_shot_collision_detection_accuracy)
-
-        self.write_u32(header.bgm_number)
-        self.write_u32(header.bgm_loop_playback)
-        self.write_u32(header.dont_restart_bgm_if_no_change)
-
-        self.write_u32(header.enable_z_coordinate)
-
-        self.write_u32(header.inherit_status_from_stock)
-        self.write_u32(header.store_status_to_stock)
-        self.write_u32(header.show_status_window)
-
-        self.write_u32(header.switch_scene_immediately_on_clear)
-        self.write_u32(header.allow_replay_save)
-
-        self.write_u32(header.show_stage)
-        self.write_u32(header.show_ready)
-        self.write_u32(header.show_clear)
-        self.write_u32(header.show_gameover)
+        self.write_record(STAGE_HEADER_LAYOUT, header)
 
         self._write_player_collision(header.player_collision)
         self._write_enemy_collision(header.enemy_collision)
 
-        self.write_u32(header.item_collision_width)
-        self.write_u32(header.item_collision_height)
+        self.write_record(ITEM_COLLISION_LAYOUT, header)
 
         self._write_actor_hitbox(header.player_hitbox)
         self._write_actor_hitbox(header.enemy_hitbox)
 
-        self.write_u32(header.undo_max_times)
-        self.write_u32(header.x_coordinate_upper_limit)
-        self.write_u32(header.y_coordinate_upper_limit)
-
-        self.write_u32(header.unk75)
-        self.write_u32(header.unk76)
-        self.write_u32(header.unk77)
-        self.write_u32(header.unk78)
-        self.write_u32(header.unk79)
-        self.write_u32(header.unk80)
-        self.write_u32(header.unk81)
-        self.write_u32(header.unk82)
-        self.write_u32(header.unk83)
-        self.write_u32(header.unk84)
-        self.write_u32(header.unk85)
-        self.write_u32(header.unk86)
-
-        self.write_u32(header.disable_damage_outside_screen)
-
-        self.write_u32(header.player_invincibility_from_same_enemy_duration)
-        self.write_u32(header.player_invincibility_duration)
-
-        self.write_u32(header.enemy_invincibility_from_same_player_duration)
-        self.write_u32(header.enemy_invincibility_duration)
-
-        self.write_u32(header.stage_name_count)
+        self.write_record(STAGE_LIMITS_LAYOUT, header)
         stage_name = header.stage_name or ""
         if not stage_name:
             self.write_u32(0)
@@ -2457,12 +2104,7 @@ class Stage(ActedBinaryFile):
             self.write_str(stage_name, len(encoded))
             self.write_u8(0)
 
-        self.write_u32(header.ranking_size)
-        self.write_u32(header.ranking_score)
-        self.write_u32(header.ranking_remaining_time)
-        self.write_u32(header.ranking_clear_time)
-        self.write_u32(header.ranking_remaining_hp)
-        self.write_u32(header.ranking_remaining_sp)
+        self.write_record(RANKING_LAYOUT, header)
 
         self._write_death_fade(header.nonblock_enemy_death)
         self._write_death_fade(header.block_enemy_death)
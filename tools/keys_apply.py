@@ -2,36 +2,63 @@ import json
 import argparse
 from pathlib import Path
 
+from batch import run_jobs
+from keys_format import file_maps
+
 TRANSLATION_FILENAME = "_translate_keys.json"
+# Kept as found: the strings sidecars of stg4_tool check their source stage against "original"
+PRESERVED_KEYS = {"original"}
 
-def apply_translations_to_json(data, translation_map, count):
+def apply_translations_in_place(data, translation_map) -> int:
     """
-    Recursively traverse a JSON structure and replace strings
-    based on the translation map. Returns the modified data.
+    Recursively traverse a JSON structure and replace strings based on the
+    translation map, modifying dicts in place. Returns how many strings were replaced.
     """
+    count = 0
     if isinstance(data, dict):
-        new_dict = {}
         for key, value in data.items():
             # Check if this value is a string that needs translation
-            if isinstance(value, str) and value in translation_map:
-                translated_value = translation_map[value]
+            if isinstance(value, str) and key not in PRESERVED_KEYS:
+                translated_value = translation_map.get(value)
                 # Only apply if it's not the placeholder
-                if translated_value != "TODO":
-                    new_dict[key] = translated_value
-                    count['replaced'] += 1
-                else:
-                    new_dict[key] = value
-            else:
-                new_dict[key] = apply_translations_to_json(value, translation_map, count)
-        return new_dict
+                if translated_value is not None and translated_value != "TODO":
+                    data[key] = translated_value
+                    count += 1
+            elif isinstance(value, (dict, list)):
+                count += apply_translations_in_place(value, translation_map)
     elif isinstance(data, list):
-        return [apply_translations_to_json(item, translation_map, count) for item in data]
-    else:
-        return data
+        for item in data:
+            if isinstance(item, (dict, list)):
+                count += apply_translations_in_place(item, translation_map)
+    return count
+
+def apply_translations_to_file(json_file_path: Path, rel_path: str, translation_map: dict, compact: bool = False) -> int:
+    """Patches one JSON file in place and returns how many strings were replaced."""
+    if not json_file_path.is_file():
+        print(f"Warning: Skipping '{rel_path}', file not found.")
+        return 0
+
+    try:
+        content = json.loads(json_file_path.read_text(encoding="utf-8"))
+        count = apply_translations_in_place(content, translation_map)
+        if count > 0:
+            print(f"Patching {rel_path}: {count} strings replaced.")
+            with json_file_path.open("w", encoding="utf-8") as f:
+                if compact:
+                    json.dump(content, f, separators=(",", ":"), ensure_ascii=False)
+                else:
+                    json.dump(content, f, indent=4, ensure_ascii=False)
+        return count
+
+    except (json.JSONDecodeError, IOError) as e:
+        print(f"Error processing {rel_path}: {e}")
+        return 0
 
 def main():
     parser = argparse.ArgumentParser(description="Applies translated strings from a keys file to JSON files.")
     parser.add_argument("target_directory", type=Path, help="Directory containing the JSON files and the keys file.")
+    parser.add_argument("--compact", action="store_true", help="Write patched files without indentation, which is smaller and faster.")
+    parser.add_argument("-j", "--jobs", type=int, default=1, help="Number of worker processes, 0 for one per CPU core (default: 1).")
     args = parser.parse_args()
 
     translation_file_path = args.target_directory / TRANSLATION_FILENAME
@@ -51,27 +78,11 @@ def main():
 
     print(f"Applying translations to '{args.target_directory}'...")
 
-    for rel_path, translation_map in all_translations.items():
-        json_file_path = args.target_directory / rel_path
-        
-        if not json_file_path.is_file():
-            print(f"Warning: Skipping '{rel_path}', file not found.")
-            continue
-            
-        try:
-            original_content = json.loads(json_file_path.read_text(encoding="utf-8"))
-            replacement_counter = {'replaced': 0}
-            
-            modified_content = apply_translations_to_json(original_content, translation_map, replacement_counter)
-            
-            count = replacement_counter['replaced']
-            if count > 0:
-                print(f"Patching {rel_path}: {count} strings replaced.")
-                with json_file_path.open("w", encoding="utf-8") as f:
-                    json.dump(modified_content, f, indent=4, ensure_ascii=False)
-            
-        except (json.JSONDecodeError, IOError) as e:
-            print(f"Error processing {rel_path}: {e}")
+    jobs_args = [
+        (args.target_directory / rel_path, rel_path, translation_map, args.compact)
+        for rel_path, translation_map in file_maps(all_translations).items()
+    ]
+    run_jobs(apply_translations_to_file, jobs_args, args.jobs)
 
     print("Done.")
 
@@ -1,29 +1,178 @@
 import json
 import re
 import argparse
+from functools import lru_cache
 from pathlib import Path
+from typing import Any, Callable, Optional, Tuple
+
+from batch import file_digest, run_jobs
+from keys_format import intern_keys, dump_keys
 
 TRANSLATABLE_KEYS = {"name", "text", "game_title", "description", "world_name", "memo", "character_name", "message"}
 OUTPUT_FILENAME = "_translate_keys.json"
+CACHE_FILENAME = "_translate_cache.json"
+
+# Code point ranges counted as Japanese by default: Hiragana, Katakana, and common CJK Ideographs
+JAPANESE_RANGES = ("3040-30FF", "4E00-9FAF")
+# Extra ranges that can be added by name with --add-range
+NAMED_RANGES = {
+    "halfwidth-katakana": "FF66-FF9F",
+    "cjk-ext-a": "3400-4DBF",
+}
+
+CHUNK_SIZE = 1 << 16
+# Tokens that matter inside an object; inside an array commas can be skipped along with the numbers
+OBJECT_TOKEN = re.compile(r'["{}\[\],:]')
+ARRAY_TOKEN = re.compile(r'["{}\[\]]')
+# The body of a JSON string up to (not including) its closing quote
+STRING_BODY = re.compile(r'[^"\\]*(?:\\.[^"\\]*)*', re.S)
+
+def parse_range(text: str) -> str:
+    """Normalizes a range name or 'XXXX-YYYY' hex code point range to 'XXXX-YYYY'."""
+    text = NAMED_RANGES.get(text, text)
+    try:
+        start, end = (int(part, 16) for part in text.split("-"))
+    except ValueError:
+        raise argparse.ArgumentTypeError(f"'{text}' is not a range name or a XXXX-YYYY hex range")
+    if not 0 <= start <= end <= 0x10FFFF:
+        raise argparse.ArgumentTypeError(f"'{text}' is not a valid code point range")
+    return f"{start:04X}-{end:04X}"
+
+@lru_cache(maxsize=None)
+def japanese_search(ranges: Tuple[str, ...] = JAPANESE_RANGES) -> Callable[[str], Any]:
+    """Compiles a search for any character in the given 'XXXX-YYYY' ranges, once per set of ranges."""
+    char_class = "".join(
+        f"{re.escape(chr(start))}-{re.escape(chr(end))}"
+        for start, end in (tuple(int(part, 16) for part in r.split("-")) for r in ranges)
+    )
+    return re.compile(f"[{char_class}]").search
 
-def contains_japanese(text):
-    """Check if a string contains Hiragana, Katakana, or CJK characters."""
-    if not isinstance(text, str):
+@lru_cache(maxsize=None)
+def translatable_matcher(ranges: Tuple[str, ...] = JAPANESE_RANGES) -> Callable[[Any, Any], bool]:
+    """
+    Combines the key filter and the Japanese detection into one check.
+    ASCII strings are rejected before the regex ever runs.
+    """
+    search = japanese_search(ranges)
+
+    def is_translatable(key, value) -> bool:
+        return key in TRANSLATABLE_KEYS and isinstance(value, str) and not value.isascii() and search(value) is not None
+    return is_translatable
+
+def contains_japanese(text, ranges: Tuple[str, ...] = JAPANESE_RANGES) -> bool:
+    """Check if a string contains Hiragana, Katakana, or CJK characters (or any of the given ranges)."""
+    if not isinstance(text, str) or text.isascii():
         return False
-    # This regex covers Hiragana, Katakana, and common CJK Ideographs
-    return re.search(r'[\u3040-\u30ff\u4e00-\u9faf]', text)
+    return japanese_search(ranges)(text) is not None
 
-def find_strings_in_json(data, collected_strings):
+def find_strings_in_json(data, collected_strings, ranges: Tuple[str, ...] = JAPANESE_RANGES):
     """Recursively traverse a JSON structure to find translatable strings."""
-    if isinstance(data, dict):
-        for key, value in data.items():
-            if key in TRANSLATABLE_KEYS and contains_japanese(value):
-                collected_strings.add(value)
-            else:
-                find_strings_in_json(value, collected_strings)
-    elif isinstance(data, list):
-        for item in data:
-            find_strings_in_json(item, collected_strings)
+    is_translatable = translatable_matcher(ranges)
+
+    def walk(data):
+        if isinstance(data, dict):
+            for key, value in data.items():
+                if is_translatable(key, value):
+                    collected_strings.add(value)
+                elif isinstance(value, (dict, list)):
+                    walk(value)
+        elif isinstance(data, list):
+            for item in data:
+                if isinstance(item, (dict, list)):
+                    walk(item)
+    walk(data)
+
+class JsonStringScanner:
+    """
+    Walks a JSON file chunk by chunk and yields the same strings find_strings_in_json would collect,
+    without building the document. Only object keys and the values of TRANSLATABLE_KEYS are decoded;
+    numbers and every other string are skipped, so memory stays around CHUNK_SIZE however big the file is.
+    """
+
+    def __init__(self, stream, ranges: Tuple[str, ...] = JAPANESE_RANGES):
+        self._stream = stream
+        self._is_translatable = translatable_matcher(ranges)
+        self._buffer = ""
+        self._position = 0
+
+    def _read_more(self) -> bool:
+        chunk = self._stream.read(CHUNK_SIZE)
+        if not chunk:
+            return False
+        self._buffer = self._buffer[self._position:] + chunk
+        self._position = 0
+        return True
+
+    def _read_string(self) -> str:
+        # Decodes the string whose opening quote is at the current position
+        while True:
+            try:
+                value, end = json.decoder.scanstring(self._buffer, self._position + 1)
+                self._position = end
+                return value
+            except json.JSONDecodeError:
+                if not self._read_more():
+                    raise
+
+    def _skip_string(self):
+        # Moves past the string whose opening quote is at the current position, dropping it chunk by chunk
+        self._position += 1
+        while True:
+            end = STRING_BODY.match(self._buffer, self._position).end()
+            if end < len(self._buffer) and self._buffer[end] == '"':
+                self._position = end + 1
+                return
+            # Keep a trailing backslash, its escaped character is in the next chunk
+            self._position = end
+            if not self._read_more():
+                raise json.JSONDecodeError("Unterminated string", self._buffer, self._position)
+
+    def scan(self):
+        # One [is_object, current_key, expecting_key] entry per open container
+        stack = []
+        while True:
+            in_array = bool(stack) and not stack[-1][0]
+            match = (ARRAY_TOKEN if in_array else OBJECT_TOKEN).search(self._buffer, self._position)
+            if not match:
+                self._position = len(self._buffer)
+                if not self._read_more():
+                    if stack:
+                        raise json.JSONDecodeError("Unexpected end of data", self._buffer, self._position)
+                    return
+                continue
+
+            self._position = match.start()
+            token = match.group()
+            if token == '"':
+                if not stack or in_array:
+                    self._skip_string()
+                elif stack[-1][2]:
+                    stack[-1][1] = self._read_string()
+                elif stack[-1][1] in TRANSLATABLE_KEYS:
+                    value = self._read_string()
+                    if self._is_translatable(stack[-1][1], value):
+                        yield value
+                else:
+                    self._skip_string()
+                continue
+
+            self._position += 1
+            if token == '{':
+                stack.append([True, None, True])
+            elif token == '[':
+                stack.append([False, None, False])
+            elif token in '}]':
+                if stack:
+                    stack.pop()
+            elif token == ':':
+                stack[-1][2] = False
+            elif token == ',':
+                stack[-1][2] = True
+
+def find_strings_in_file(json_file: Path, collected_strings, ranges: Tuple[str, ...] = JAPANESE_RANGES):
+    """Streams a JSON file to find translatable strings, without loading the whole document."""
+    with json_file.open("r", encoding="utf-8") as f:
+        collected_strings.update(JsonStringScanner(f, ranges).scan())
 
 def should_skip_path(path: Path, root: Path) -> bool:
     """Check if the path should be skipped:
@@ -39,10 +188,58 @@ def should_skip_path(path: Path, root: Path) -> bool:
         return True
     return False
 
+def cache_signature(ranges: Tuple[str, ...]) -> dict:
+    """What the cached string sets depend on besides the files themselves."""
+    return {"keys": sorted(TRANSLATABLE_KEYS), "ranges": list(ranges)}
+
+def load_cache(cache_file_path: Path, ranges: Tuple[str, ...]) -> dict:
+    """
+    Reads the per-file entries of the extraction cache. Starts empty if the cache is missing,
+    unreadable, or was built for a different set of TRANSLATABLE_KEYS or ranges.
+    """
+    try:
+        cache = json.loads(cache_file_path.read_text(encoding="utf-8"))
+    except (json.JSONDecodeError, IOError):
+        return {}
+    if any(cache.get(name) != value for name, value in cache_signature(ranges).items()):
+        return {}
+    return cache.get("files", {})
+
+def is_unchanged(json_file: Path, entry: Optional[dict]) -> bool:
+    """True if the cache entry was made from this file at its current size and mtime."""
+    if not entry:
+        return False
+    stat = json_file.stat()
+    return entry["size"] == stat.st_size and entry["mtime"] == stat.st_mtime_ns
+
+def extract_file_strings(json_file: Path, entry: Optional[dict], ranges: Tuple[str, ...] = JAPANESE_RANGES) -> Optional[dict]:
+    """
+    Returns a fresh cache entry with the translatable strings of one file, or None if it can't be read.
+    The content hash is checked against the old entry first, so a touched but identical file is not parsed again.
+    """
+    try:
+        stat = json_file.stat()
+        digest = file_digest(json_file)
+        if entry and entry["sha1"] == digest:
+            strings = set(entry["strings"])
+        else:
+            strings = set()
+            find_strings_in_file(json_file, strings, ranges)
+    except (json.JSONDecodeError, IOError) as e:
+        print(f"Warning: Could not process {json_file.name}: {e}")
+        return None
+
+    return {"size": stat.st_size, "mtime": stat.st_mtime_ns, "sha1": digest, "strings": sorted(strings)}
+
 def main():
     parser = argparse.ArgumentParser(description="Extracts translatable strings from JSON files in a directory.")
     parser.add_argument("target_directory", type=Path, help="Directory containing the JSON files to process.")
     parser.add_argument("-r", "--recursive", action="store_true", help="Scan for JSON files recursively in subdirectories.")
+    parser.add_argument("--no-cache", action="store_true", help=f"Re-parse every file instead of reusing '{CACHE_FILENAME}'.")
+    parser.add_argument("-j", "--jobs", type=int, default=1, help="Number of worker processes, 0 for one per CPU core (default: 1).")
+    parser.add_argument("--interned", action="store_true", help="Write each unique string once, with per-file ID lists, instead of one map per file.")
+    parser.add_argument("--add-range", action="append", default=[], type=parse_range, metavar="RANGE",
+                        help=f"Also count this range as Japanese: {', '.join(NAMED_RANGES)} or a XXXX-YYYY hex range. Can be repeated.")
     args = parser.parse_args()
 
     if not args.target_directory.is_dir():
@@ -50,6 +247,10 @@ def main():
         return
 
     output_file_path = args.target_directory / OUTPUT_FILENAME
+    cache_file_path = args.target_directory / CACHE_FILENAME
+    ranges = JAPANESE_RANGES + tuple(args.add_range)
+    old_cache = {} if args.no_cache else load_cache(cache_file_path, ranges)
+    cache = {}
     all_translations = {}
     total_unique_strings = 0
 
@@ -58,35 +259,58 @@ def main():
     glob_pattern = "**/*.json" if args.recursive else "*.json"
     json_files = sorted(list(args.target_directory.glob(glob_pattern)))
 
+    keys = {}
     for json_file in json_files:
         if json_file.name == OUTPUT_FILENAME:
             continue
         if should_skip_path(json_file, args.target_directory):
             continue
+        keys[json_file] = str(json_file.relative_to(args.target_directory))
 
-        unique_strings_for_file = set()
-        try:
-            content = json.loads(json_file.read_text(encoding="utf-8"))
-            find_strings_in_json(content, unique_strings_for_file)
-        except (json.JSONDecodeError, IOError) as e:
-            print(f"Warning: Could not process {json_file.name}: {e}")
-            continue
+    # Unchanged files come straight from the cache, the rest are parsed (in parallel with --jobs)
+    pending = []
+    for json_file, key in keys.items():
+        if is_unchanged(json_file, old_cache.get(key)):
+            cache[key] = old_cache[key]
+        else:
+            pending.append((json_file, old_cache.get(key), ranges))
+
+    results = run_jobs(extract_file_strings, pending, args.jobs)
+    for (json_file, _, _), entry in zip(pending, results):
+        if entry:
+            cache[keys[json_file]] = entry
 
+    for key in keys.values():
+        if key not in cache:
+            continue
+        unique_strings_for_file = cache[key]["strings"]
         if unique_strings_for_file:
-            key = str(json_file.relative_to(args.target_directory))
             all_translations[key] = {
-                original: "TODO" for original in sorted(list(unique_strings_for_file))
+                original: "TODO" for original in unique_strings_for_file
             }
             total_unique_strings += len(unique_strings_for_file)
 
+    # Only files still present are kept, so deleted stages drop out of the cache
+    try:
+        with cache_file_path.open("w", encoding="utf-8") as f:
+            json.dump({**cache_signature(ranges), "files": cache}, f, ensure_ascii=False)
+    except IOError as e:
+        print(f"Warning: Could not write cache '{cache_file_path}': {e}")
+
     if not all_translations:
         print("No translatable strings found.")
         return
 
+    if args.interned:
+        all_translations = intern_keys(all_translations)
+
     try:
         with output_file_path.open("w", encoding="utf-8") as f:
-            json.dump(all_translations, f, indent=4, ensure_ascii=False)
-        print(f"Success: Extracted {total_unique_strings} unique strings to '{output_file_path}'.")
+            dump_keys(all_translations, f)
+        if args.interned:
+            print(f"Success: Extracted {total_unique_strings} strings ({len(all_translations['strings'])} unique) to '{output_file_path}'.")
+        else:
+            print(f"Success: Extracted {total_unique_strings} unique strings to '{output_file_path}'.")
     except IOError as e:
         print(f"Error: Could not write to '{output_file_path}': {e}")
 
@@ -0,0 +1,111 @@
+import json
+from typing import Any, Dict, TextIO
+
+# _translate_keys.json comes in two layouts.
+# Per file, the default:
+#     {"stage.stg4_1020.json": {"原文": "TODO", ...}, ...}
+# Interned, where every source string is stored once and files list the IDs of theirs,
+# an ID being the position of the string in "strings":
+#     {"$format": "interned",
+#      "strings": {"原文": "TODO", ...},
+#      "files": {"stage.stg4_1020.json": [0, 4, 7], ...}}
+INTERNED_FORMAT = "interned"
+
+
+def is_interned(data: Any) -> bool:
+    """True if a loaded keys file uses the interned layout."""
+    return isinstance(data, dict) and data.get("$format") == INTERNED_FORMAT
+
+
+def intern_keys(per_file: Dict[str, Dict[str, str]]) -> dict:
+    """
+    Converts per-file maps to the interned layout. When a string has different translations
+    in different files, the first one that isn't "TODO" is kept.
+    """
+    index = {}
+    strings = {}
+    files = {}
+    for rel_path, text_map in per_file.items():
+        ids = []
+        for text, translation in text_map.items():
+            if text not in index:
+                index[text] = len(strings)
+                strings[text] = translation
+            elif strings[text] == "TODO":
+                strings[text] = translation
+            ids.append(index[text])
+        files[rel_path] = ids
+    return {"$format": INTERNED_FORMAT, "strings": strings, "files": files}
+
+
+def file_maps(data: dict) -> Dict[str, Dict[str, str]]:
+    """Per-file {original: translation} maps of a keys file in either layout."""
+    if not is_interned(data):
+        return data
+    strings = data["strings"]
+    texts = list(strings)
+    return {
+        rel_path: {texts[i]: strings[texts[i]] for i in ids}
+        for rel_path, ids in data["files"].items()
+    }
+
+
+def first_files(data: dict) -> Dict[int, str]:
+    """The first file using each string ID of an interned keys file."""
+    first = {}
+    for rel_path, ids in data["files"].items():
+        for string_id in ids:
+            first.setdefault(string_id, rel_path)
+    return first
+
+
+def with_strings(data: dict, strings: Dict[str, str]) -> dict:
+    """
+    A copy of an interned keys file with a new strings map. Strings left out are dropped and the
+    rest renumbered; files left without strings are dropped too.
+    """
+    new_ids = {}
+    for string_id, text in enumerate(data["strings"]):
+        if text in strings:
+            new_ids[string_id] = len(new_ids)
+
+    files = {}
+    for rel_path, ids in data["files"].items():
+        kept = [new_ids[i] for i in ids if i in new_ids]
+        if kept:
+            files[rel_path] = kept
+    ordered = {text: strings[text] for text in data["strings"] if text in strings}
+    return {**data, "strings": ordered, "files": files}
+
+
+def flat_translations(data: dict) -> Dict[str, str]:
+    """
+    Merges a keys file in either layout, or an already flat map, into {original: translation}.
+    Entries still marked "TODO" are dropped while merging, so a "TODO" in a later file doesn't
+    hide a translation from an earlier one, as with intern_keys.
+    """
+    if is_interned(data):
+        pairs = data["strings"].items()
+    else:
+        pairs = []
+        for key, value in data.items():
+            if isinstance(value, dict):
+                pairs.extend(value.items())
+            else:
+                pairs.append((key, value))
+    return {original: text for original, text in pairs if isinstance(text, str) and text != "TODO"}
+
+
+def dump_keys(data: dict, f: TextIO):
+    """Writes a keys file in either layout; the ID lists of the interned layout stay on one line per file."""
+    if not is_interned(data):
+        json.dump(data, f, indent=4, ensure_ascii=False)
+        return
+
+    head = json.dumps({key: value for key, value in data.items() if key != "files"}, indent=4, ensure_ascii=False)
+    files = ",\n".join(
+        f"        {json.dumps(rel_path, ensure_ascii=False)}: {json.dumps(ids)}"
+        for rel_path, ids in data["files"].items()
+    )
+    # Reopen the object dumped above to append "files" as its last member
+    f.write(head[:-2] + ',\n    "files": {\n' + files + "\n    }\n}")
@@ -0,0 +1,69 @@
+import math
+from collections import defaultdict
+from typing import FrozenSet, Iterable, List, Tuple
+
+# Half- and full-width digits all read as 0, so strings differing only by a number share every n-gram
+DIGITS = str.maketrans("123456789０１２３４５６７８９", "0000000000000000000")
+
+
+def ngrams(text: str, n: int = 2) -> FrozenSet[str]:
+    """The character n-grams of a string, padded so the first and last characters count too."""
+    padded = f"\x02{text.translate(DIGITS)}\x03"
+    return frozenset(padded[i:i + n] for i in range(len(padded) - n + 1))
+
+
+class NgramIndex:
+    """
+    An inverted index from character n-grams to strings, to find the strings most similar to a query
+    (Jaccard similarity of their n-gram sets) without comparing it against every indexed string.
+    Bigrams suit Japanese, where a single kanji or kana already carries meaning.
+    """
+
+    def __init__(self, texts: Iterable[str], n: int = 2):
+        self.n = n
+        self._texts = []
+        self._grams = []
+        self._postings = defaultdict(list)
+        for text in texts:
+            self.add(text)
+
+    def __len__(self) -> int:
+        return len(self._texts)
+
+    def add(self, text: str):
+        text_id = len(self._texts)
+        grams = ngrams(text, self.n)
+        self._texts.append(text)
+        self._grams.append(grams)
+        for gram in grams:
+            self._postings[gram].append(text_id)
+
+    def search(self, text: str, limit: int = 3, min_score: float = 0.6) -> List[Tuple[str, float]]:
+        """
+        Returns up to limit (string, score) pairs scoring at least min_score, best first.
+        A string scoring min_score must share at least that fraction of the query's n-grams, so only the
+        rarest n-grams beyond that share are looked up (prefix filtering); their posting lists are short.
+        """
+        grams = ngrams(text, self.n)
+        needed = math.ceil(min_score * len(grams) - 1e-9)
+        rarest = sorted(grams, key=lambda gram: len(self._postings.get(gram, ())))
+        # With min_score 0 any length can match
+        shortest, longest = min_score * len(grams), len(grams) / min_score if min_score > 0 else math.inf
+
+        seen = set()
+        scored = []
+        for gram in rarest[:len(grams) - needed + 1]:
+            for text_id in self._postings.get(gram, ()):
+                if text_id in seen:
+                    continue
+                seen.add(text_id)
+                other = self._grams[text_id]
+                if not shortest <= len(other) <= longest:
+                    continue
+                shared = len(grams & other)
+                score = shared / (len(grams) + len(other) - shared)
+                if score >= min_score and self._texts[text_id] != text:
+                    scored.append((score, text_id))
+
+        scored.sort(key=lambda item: (-item[0], self._texts[item[1]]))
+        return [(self._texts[text_id], round(score, 3)) for score, text_id in scored[:limit]]
@@ -2,9 +2,12 @@
 import argparse
 import json
 from pathlib import Path
-from typing import Union, get_args
+from typing import List, Union, get_args
 from dataclasses import is_dataclass, fields
 
+from batch import print_summary, run_jobs
+from binary_file import decode_blob
+
 # Import the same file format classes as the dumper
 from files import (
     StageHeader,
@@ -72,6 +75,9 @@ def _from_dict(data_class, data):
         # Handle nested single dataclasses
         elif is_dataclass(field_type):
             kwargs[key] = _from_dict(field_type, value)
+        # Handle opaque byte ranges, tagged base64 or a legacy list of integers
+        elif field_type is bytes:
+            kwargs[key] = decode_blob(value)
         # Handle primitive types
         else:
             kwargs[key] = value
@@ -105,7 +111,7 @@ def rebuild_database(json_path: Path, output_path: Path, db_type: str) -> None:
         
         # Manually reconstruct the complex StageData object
         parser.data.header = _from_dict(StageHeader, json_payload_data.get("header", {}))
-        parser.data.palette_payload = json_payload_data.get("palette_payload", [])
+        parser.data.palette_payload = decode_blob(json_payload_data.get("palette_payload", []))
 
     elif db_type == "system":
         # System file has a 'magic' number instead of 'version'
@@ -146,14 +152,49 @@ def rebuild_database(json_path: Path, output_path: Path, db_type: str) -> None:
     print(f"✅ Successfully rebuilt database file at: {output_path}")
 
 
+def find_database_jsons(directory: Path) -> List[Path]:
+    """
+    Every .json file in directory named after a known database type (stages excluded).
+    """
+    return [
+        path for path in sorted(directory.glob("*.json"))
+        if normalise_key(path.stem) in PARSERS and normalise_key(path.stem) != "stage4"
+    ]
+
+
+def rebuild_file(json_path: Path, output_path: Path) -> bool:
+    rebuild_database(json_path, output_path, normalise_key(json_path.stem))
+    return True
+
+
+def rebuild_directory(directory: Path, output_dir: Path, jobs: int) -> None:
+    """
+    Rebuilds every database JSON of directory to <name>.dat in output_dir.
+    """
+    json_paths = find_database_jsons(directory)
+    if not json_paths:
+        print(f"No database JSON files found in '{directory}'")
+        return
+
+    results = run_jobs(rebuild_file, [(path, output_dir / f"{path.stem}.dat") for path in json_paths], jobs)
+    print_summary("Rebuilt", json_paths, results)
+
+
 def main() -> None:
     argument_parser = argparse.ArgumentParser(description="Rebuild ActionEditor4 database files from JSON")
-    argument_parser.add_argument("input", type=Path, help="Path to the input .json file")
+    argument_parser.add_argument("input", type=Path, help="Path to the input .json file, or a folder to rebuild every database JSON in it")
     argument_parser.add_argument("--type", dest="db_type", help="Database type (e.g. anime, bgm). Auto-detected if omitted.")
-    argument_parser.add_argument("--out", dest="output", type=Path, help="Path for the output file. Auto-generated if omitted.")
+    argument_parser.add_argument("--out", dest="output", type=Path, help="Path for the output file (output folder for a folder input). Auto-generated if omitted.")
+    argument_parser.add_argument("-j", "--jobs", type=int, default=1, help="Worker processes for a folder input, 0 for one per CPU core")
 
     args = argument_parser.parse_args()
 
+    if args.input.is_dir():
+        if args.db_type:
+            argument_parser.error("--type cannot be used with a folder input")
+        rebuild_directory(args.input, args.output or args.input, args.jobs)
+        return
+
     db_type = None
     if args.db_type:
         db_type = normalise_key(args.db_type)
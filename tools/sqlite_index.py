@@ -0,0 +1,24 @@
+import sqlite3
+from pathlib import Path
+
+
+def _migrate(db: sqlite3.Connection, schema: str, version: int):
+    if db.execute("PRAGMA user_version").fetchone()[0] != version:
+        db.executescript(f"{schema}\nPRAGMA user_version = {version};")
+
+
+def open_index(db_path: Path, schema: str, version: int, label: str) -> sqlite3.Connection:
+    """
+    Opens an SQLite index kept next to the files it covers. When its stored version isn't version,
+    schema is run to drop and recreate the tables, which the caller then refills from the files.
+    A read-only or locked folder falls back to an in-memory index, so the tool still works
+    without keeping it.
+    """
+    try:
+        db = sqlite3.connect(str(db_path))
+        _migrate(db, schema, version)
+    except sqlite3.Error as e:
+        print(f"Warning: Could not open {label}, using a temporary one: {e}")
+        db = sqlite3.connect(":memory:")
+        _migrate(db, schema, version)
+    return db
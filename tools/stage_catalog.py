@@ -0,0 +1,246 @@
+import argparse
+import json
+from dataclasses import fields
+from pathlib import Path
+from typing import Any, Dict, Iterator, List, Optional, Tuple
+
+from batch import file_digest, run_jobs
+from sqlite_index import open_index
+from stg4_tool import Stage, StageData, Background, Command, WarpDetails, TEXT_FIELDS, STAGE_SECTIONS
+
+CATALOG_FILENAME = "_stage_catalog.sqlite3"
+# Bump when the tables or what gets indexed change; an older catalog is then rebuilt from the stages
+SCHEMA_VERSION = 1
+SCHEMA = """
+    DROP TABLE IF EXISTS files;
+    DROP TABLE IF EXISTS stages;
+    DROP TABLE IF EXISTS resources;
+    DROP TABLE IF EXISTS strings;
+    CREATE TABLE files (name TEXT PRIMARY KEY, size INTEGER, mtime INTEGER, sha1 TEXT);
+    CREATE TABLE stages (file TEXT PRIMARY KEY, stage_name TEXT, bgm_number INTEGER, header TEXT);
+    CREATE TABLE resources (file TEXT NOT NULL, kind TEXT NOT NULL, value TEXT NOT NULL);
+    CREATE INDEX resources_by_value ON resources (kind, value);
+    CREATE INDEX resources_by_file ON resources (file);
+    CREATE TABLE strings (file TEXT NOT NULL, field TEXT NOT NULL, text TEXT NOT NULL);
+    CREATE INDEX strings_by_file ON strings (file);
+"""
+
+# Command types summoning a palette entry, by kind of entry
+SUMMON_COMMANDS = {13: "block", 14: "character", 15: "item"}
+
+
+def iter_objects(root: Any) -> Iterator[Any]:
+    """Every dataclass instance reachable from root, each once even when shared by several places."""
+    seen = set()
+    stack = [root]
+    while stack:
+        obj = stack.pop()
+        if id(obj) in seen:
+            continue
+        seen.add(id(obj))
+        yield obj
+        for f in fields(obj):
+            value = getattr(obj, f.name)
+            if isinstance(value, list):
+                stack.extend(item for item in value if hasattr(item, "__dataclass_fields__"))
+            elif hasattr(value, "__dataclass_fields__"):
+                stack.append(value)
+
+
+def header_fields(data: StageData) -> dict:
+    """The plain header fields of a stage: numbers and strings, without the nested structures."""
+    header = {}
+    for f in fields(data):
+        value = getattr(data, f.name)
+        if f.name not in STAGE_SECTIONS and f.name != "end_marker" and isinstance(value, (int, float, str)):
+            header[f.name] = value
+    return header
+
+
+def index_stage(stage_file: Path, old_digest: Optional[str]) -> Optional[dict]:
+    """
+    Returns a catalog entry for one stage file, or None if it can't be parsed.
+    The content hash is checked against old_digest first: for a touched but identical file,
+    "header" is None and the rows already in the catalog are kept.
+    """
+    try:
+        stat = stage_file.stat()
+        digest = file_digest(stage_file)
+    except IOError as e:
+        print(f"Warning: Could not read {stage_file.name}: {e}")
+        return None
+    entry = {"size": stat.st_size, "mtime": stat.st_mtime_ns, "sha1": digest, "header": None}
+    if digest == old_digest:
+        return entry
+
+    stage = Stage(stage_file)
+    stage.use_mmap = True
+    try:
+        if not stage.parse():
+            print(f"Warning: Could not parse {stage_file.name}")
+            return None
+    except Exception as e:
+        print(f"Warning: Could not parse {stage_file.name}: {e}")
+        return None
+    finally:
+        stage.close()
+
+    data = stage.data
+    resources = {("bgm", str(data.bgm_number))}
+    strings = set()
+    for obj in iter_objects(data):
+        if isinstance(obj, Background) and obj.image_path:
+            resources.add(("background", obj.image_path))
+        elif isinstance(obj, Command) and obj.type in SUMMON_COMMANDS:
+            resources.add(("summon", f"{SUMMON_COMMANDS[obj.type]}/{obj.details.palette_data_number}"))
+        elif isinstance(obj, WarpDetails):
+            resources.add(("warp", f"{obj.target_x_bl},{obj.target_y_bl}"))
+        for name in TEXT_FIELDS:
+            value = getattr(obj, name, None)
+            if isinstance(value, str) and value:
+                strings.add((name, value))
+
+    entry.update(header=header_fields(data), resources=sorted(resources), strings=sorted(strings))
+    return entry
+
+
+class StageCatalog:
+    """
+    An SQLite index of the .stg4_1020 files of a folder, stored next to them: the header fields of each stage,
+    the resources it references (BGM, background images, warp targets, summoned palette entries) and its text.
+    refresh() only parses the stages added or changed since the last run, so queries across the whole game
+    don't parse every stage again.
+    """
+
+    def __init__(self, stage_dir):
+        self.stage_dir = Path(stage_dir)
+        self._db = open_index(self.stage_dir / CATALOG_FILENAME, SCHEMA, SCHEMA_VERSION, "stage catalog")
+
+    def refresh(self, jobs: int = 1, rebuild: bool = False) -> Tuple[int, int]:
+        """
+        Brings the catalog up to date with the stage files: new and changed ones are parsed
+        (in parallel with jobs > 1), deleted ones dropped; with rebuild, every stage is parsed again.
+        Returns how many were parsed and dropped.
+        """
+        known = {name: (size, mtime, sha1) for name, size, mtime, sha1 in self._db.execute("SELECT name, size, mtime, sha1 FROM files")}
+        stage_files = sorted(self.stage_dir.glob("*.stg4_1020"))
+        pending = []
+        for stage_file in stage_files:
+            stat = stage_file.stat()
+            old = known.get(stage_file.name)
+            if rebuild or old is None or old[:2] != (stat.st_size, stat.st_mtime_ns):
+                pending.append((stage_file, old[2] if old and not rebuild else None))
+
+        parsed = 0
+        results = run_jobs(index_stage, pending, jobs)
+        with self._db:
+            for (stage_file, _), entry in zip(pending, results):
+                if entry is None:
+                    # Dropped from the catalog until it parses, so the next refresh retries it
+                    self._forget(stage_file.name)
+                    continue
+                if entry["header"] is not None:
+                    self._forget(stage_file.name)
+                    self._insert(stage_file.name, entry)
+                    parsed += 1
+                self._db.execute(
+                    "INSERT OR REPLACE INTO files (name, size, mtime, sha1) VALUES (?, ?, ?, ?)",
+                    (stage_file.name, entry["size"], entry["mtime"], entry["sha1"])
+                )
+
+            removed = known.keys() - {stage_file.name for stage_file in stage_files}
+            for name in removed:
+                self._forget(name)
+        return parsed, len(removed)
+
+    def _forget(self, name: str):
+        for table, column in (("files", "name"), ("stages", "file"), ("resources", "file"), ("strings", "file")):
+            self._db.execute(f"DELETE FROM {table} WHERE {column} = ?", (name,))
+
+    def _insert(self, name: str, entry: dict):
+        header = entry["header"]
+        self._db.execute(
+            "INSERT INTO stages (file, stage_name, bgm_number, header) VALUES (?, ?, ?, ?)",
+            (name, header["stage_name"], header["bgm_number"], json.dumps(header, ensure_ascii=False))
+        )
+        self._db.executemany("INSERT INTO resources (file, kind, value) VALUES (?, ?, ?)", ((name, kind, value) for kind, value in entry["resources"]))
+        self._db.executemany("INSERT INTO strings (file, field, text) VALUES (?, ?, ?)", ((name, field, text) for field, text in entry["strings"]))
+
+    def stage_names(self) -> Dict[str, str]:
+        """{file: stage name} of every cataloged stage, by file name."""
+        return dict(self._db.execute("SELECT file, stage_name FROM stages ORDER BY file"))
+
+    def with_resource(self, kind: str, value: str) -> List[str]:
+        """The stages referencing a resource; a background matches on part of its path."""
+        if kind == "background":
+            rows = self._db.execute("SELECT DISTINCT file FROM resources WHERE kind = ? AND instr(value, ?) ORDER BY file", (kind, value))
+        else:
+            rows = self._db.execute("SELECT DISTINCT file FROM resources WHERE kind = ? AND value = ? ORDER BY file", (kind, value))
+        return [row[0] for row in rows]
+
+    def with_header(self, name: str, value: str) -> List[str]:
+        """The stages whose header field name has value, compared as text."""
+        rows = self._db.execute("SELECT file, header FROM stages ORDER BY file")
+        return [file for file, header in rows if str(json.loads(header).get(name)) == value]
+
+    def with_text(self, text: str) -> Dict[str, List[str]]:
+        """{file: [strings]} of the stages with strings containing text."""
+        found = {}
+        for file, string in self._db.execute("SELECT DISTINCT file, text FROM strings WHERE instr(text, ?) ORDER BY file, text", (text,)):
+            found.setdefault(file, []).append(string)
+        return found
+
+    def close(self):
+        self._db.close()
+
+
+def parse_header_filter(value: str) -> Tuple[str, str]:
+    name, sep, expected = value.partition("=")
+    if not sep or name not in StageData.__dataclass_fields__:
+        raise argparse.ArgumentTypeError(f"expected FIELD=VALUE with a stage header field, got '{value}'")
+    return name, expected
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Catalogs the stages of a folder and answers queries across all of them.")
+    parser.add_argument("stage_directory", type=Path, help="Directory containing the .stg4_1020 files.")
+    parser.add_argument("-j", "--jobs", type=int, default=1, help="Number of worker processes for the stages to parse, 0 for one per CPU core (default: 1).")
+    parser.add_argument("--rebuild", action="store_true", help=f"Parse every stage again instead of reusing '{CATALOG_FILENAME}'.")
+    parser.add_argument("--bgm", help="Stages playing this BGM number.")
+    parser.add_argument("--background", help="Stages with a background image whose path contains this.")
+    parser.add_argument("--warp", metavar="X,Y", help="Stages with a warp to these block coordinates.")
+    parser.add_argument("--summon", metavar="KIND/NUMBER", help="Stages summoning this palette entry, e.g. character/3.")
+    parser.add_argument("--text", help="Stages with a name, memo or message containing this.")
+    parser.add_argument("--header", action="append", default=[], type=parse_header_filter, metavar="FIELD=VALUE", help="Stages whose header field has this value. Can be repeated.")
+    args = parser.parse_args()
+
+    if not args.stage_directory.is_dir():
+        print(f"Error: Directory not found at '{args.stage_directory}'")
+        return
+
+    catalog = StageCatalog(args.stage_directory)
+    parsed, removed = catalog.refresh(args.jobs, args.rebuild)
+    names = catalog.stage_names()
+    print(f"Catalog of {len(names)} stages ({parsed} parsed, {removed} removed).")
+
+    # Every query given must match; the stages matching all of them are listed
+    matches = [set(names)]
+    for kind in ("bgm", "background", "warp", "summon"):
+        if getattr(args, kind) is not None:
+            matches.append(set(catalog.with_resource(kind, getattr(args, kind))))
+    for name, expected in args.header:
+        matches.append(set(catalog.with_header(name, expected)))
+    texts = {}
+    if args.text is not None:
+        texts = catalog.with_text(args.text)
+        matches.append(set(texts))
+    catalog.close()
+
+    for file in sorted(set.intersection(*matches)):
+        print(f"{file}: {names[file]}")
+        for text in texts.get(file, ()):
+            print(f"    {text}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,152 @@
+from binary_file import RecordLayout, slotted_dataclass
+
+# Records of the stage header that stg4_tool and files.py both read. The header runs
+# around them (STAGE_HEADER_LAYOUT, STAGE_LIMITS_LAYOUT) stay with each tool, since the .dat
+# Stage reader names some of those fields differently and also reads the magic and counts.
+
+# --- Stage Header Dataclasses ---
+
+@slotted_dataclass
+class StageDeathFade:
+    list_size: int = 0
+    auto_disappear_left: int = 0
+    auto_disappear_right: int = 0
+    auto_disappear_top: int = 0
+    auto_disappear_bottom: int = 0
+    disappear_left_range: int = 0
+    disappear_right_range: int = 0
+    disappear_top_range: int = 0
+    disappear_bottom_range: int = 0
+    block_end: int = 0
+
+@slotted_dataclass
+class StagePlayerCollision:
+    walking_block_width: int = 0
+    walking_block_height: int = 0
+    flying_block_width: int = 0
+    flying_block_height: int = 0
+    walking_character_width: int = 0
+    walking_character_height: int = 0
+    flying_character_width: int = 0
+    flying_character_height: int = 0
+    shot_width: int = 0
+    shot_height: int = 0
+    item_width: int = 0
+    item_height: int = 0
+    walking_block_position: int = 0
+    flying_block_position: int = 0
+    walking_character_position: int = 0
+    flying_character_position: int = 0
+    block_display: int = 0
+    character_display: int = 0
+    shot_display: int = 0
+    item_display: int = 0
+    block_display_color: int = 0
+    character_display_color: int = 0
+    shot_display_color: int = 0
+    item_display_color: int = 0
+
+@slotted_dataclass
+class StageEnemyCollision:
+    walking_block_width: int = 0
+    walking_block_height: int = 0
+    flying_block_width: int = 0
+    flying_block_height: int = 0
+    walking_character_width: int = 0
+    walking_character_height: int = 0
+    flying_character_width: int = 0
+    flying_character_height: int = 0
+    shot_width: int = 0
+    shot_height: int = 0
+    walking_block_position: int = 0
+    flying_block_position: int = 0
+    walking_character_position: int = 0
+    flying_character_position: int = 0
+
+@slotted_dataclass
+class StageActorHitbox:
+    shot_width: int = 0
+    shot_height: int = 0
+    character_width: int = 0
+    character_height: int = 0
+
+
+# --- Stage Header Layouts ---
+
+ITEM_COLLISION_LAYOUT = RecordLayout(
+    ("item_collision_width", "u32"),
+    ("item_collision_height", "u32"),
+)
+
+RANKING_LAYOUT = RecordLayout(
+    ("ranking_size", "u32"),
+    ("ranking_score", "u32"),
+    ("ranking_remaining_time", "u32"),
+    ("ranking_clear_time", "u32"),
+    ("ranking_remaining_hp", "u32"),
+    ("ranking_remaining_sp", "u32"),
+)
+
+DEATH_FADE_LAYOUT = RecordLayout(
+    ("list_size", "u32"),
+    ("auto_disappear_left", "u32"),
+    ("auto_disappear_right", "u32"),
+    ("auto_disappear_top", "u32"),
+    ("auto_disappear_bottom", "u32"),
+    ("disappear_left_range", "u32"),
+    ("disappear_right_range", "u32"),
+    ("disappear_top_range", "u32"),
+    ("disappear_bottom_range", "u32"),
+    ("block_end", "u32"),
+)
+
+PLAYER_COLLISION_LAYOUT = RecordLayout(
+    ("walking_block_width", "u32"),
+    ("walking_block_height", "u32"),
+    ("flying_block_width", "u32"),
+    ("flying_block_height", "u32"),
+    ("walking_character_width", "u32"),
+    ("walking_character_height", "u32"),
+    ("flying_character_width", "u32"),
+    ("flying_character_height", "u32"),
+    ("shot_width", "u32"),
+    ("shot_height", "u32"),
+    ("item_width", "u32"),
+    ("item_height", "u32"),
+    ("walking_block_position", "u32"),
+    ("flying_block_position", "u32"),
+    ("walking_character_position", "u32"),
+    ("flying_character_position", "u32"),
+    ("block_display", "u32"),
+    ("character_display", "u32"),
+    ("shot_display", "u32"),
+    ("item_display", "u32"),
+    ("block_display_color", "u32"),
+    ("character_display_color", "u32"),
+    ("shot_display_color", "u32"),
+    ("item_display_color", "u32"),
+)
+
+ENEMY_COLLISION_LAYOUT = RecordLayout(
+    ("walking_block_width", "u32"),
+    ("walking_block_height", "u32"),
+    ("flying_block_width", "u32"),
+    ("flying_block_height", "u32"),
+    ("walking_character_width", "u32"),
+    ("walking_character_height", "u32"),
+    ("flying_character_width", "u32"),
+    ("flying_character_height", "u32"),
+    ("shot_width", "u32"),
+    ("shot_height", "u32"),
+    ("walking_block_position", "u32"),
+    ("flying_block_position", "u32"),
+    ("walking_character_position", "u32"),
+    ("flying_character_position", "u32"),
+)
+
+ACTOR_HITBOX_LAYOUT = RecordLayout(
+    ("shot_width", "u32"),
+    ("shot_height", "u32"),
+    ("character_width", "u32"),
+    ("character_height", "u32"),
+)
@@ -1,268 +1,30 @@
 import argparse
 import json
-from dataclasses import dataclass, field, is_dataclass, asdict
+from dataclasses import field, fields, is_dataclass, asdict
 from pathlib import Path
-from typing import List, Union, Callable, TypeVar, Any
-import struct
+from typing import Dict, List, Optional, Union, Callable, Any
+
+from batch import expand_paths, run_jobs, print_summary
+from binary_file import ActedBinaryFile, RecordLayout, slotted_dataclass, encode_blob, decode_blob
+from keys_format import flat_translations
+from stage_records import (
+    StageDeathFade,
+    StagePlayerCollision,
+    StageEnemyCollision,
+    StageActorHitbox,
+    ITEM_COLLISION_LAYOUT,
+    RANKING_LAYOUT,
+    DEATH_FADE_LAYOUT,
+    PLAYER_COLLISION_LAYOUT,
+    ENEMY_COLLISION_LAYOUT,
+    ACTOR_HITBOX_LAYOUT,
+)
 
 
-# --- Augmented Helper Class ---
-
-class ActedBinaryFile:
-    VERSIONS = [
-        0x03C6,  # ??
-        1020,    # v1020 (stg4 magic)
-        0x03FC   # v1020
-    ]
-    T = TypeVar('T')
-
-    def __init__(self, file_path: Union[str, Path]):
-        self.file_path = Path(file_path)
-        self._data = bytearray()
-        self._position = 0
-        self._append_mode = False
-
-    def load(self) -> bool:
-        try:
-            self._data = bytearray(self.file_path.read_bytes())
-            self._position = 0
-            return True
-        except Exception as e:
-            print(f"Error loading {self.file_path}: {e}")
-            return False
-
-    def save_file(self) -> bool:
-        try:
-            self.file_path.write_bytes(bytes(self._data))
-            return True
-        except Exception as e:
-            print(f"Error saving {self.file_path}: {e}")
-            return False
-
-    def save_to(self, file_path: Union[str, Path]) -> bool:
-        try:
-            Path(file_path).write_bytes(bytes(self._data))
-            return True
-        except Exception as e:
-            print(f"Error saving {file_path}: {e}")
-            return False
-
-    def start_writing(self):
-        self._data = bytearray()
-        self._position = 0
-        self._append_mode = True
-
-    def finish_writing(self):
-        self._append_mode = False
-        # Trim the buffer to the current position
-        self._data = self._data[:self._position]
-
-    def _ensure_space(self, size: int):
-        if self._append_mode or self._position + size > len(self._data):
-            needed = self._position + size - len(self._data)
-            if needed > 0:
-                self._data.extend(bytearray(needed))
-
-    def read_u8(self) -> int:
-        value = self._data[self._position]
-        self._position += 1
-        return value
-
-    def read_s8(self) -> int:
-        value = struct.unpack_from("<b", self._data, self._position)[0]
-        self._position += 1
-        return value
-
-    def read_u16(self) -> int:
-        value = struct.unpack_from("<H", self._data, self._position)[0]
-        self._position += 2
-        return value
-
-    def read_s16(self) -> int:
-        value = struct.unpack_from("<h", self._data, self._position)[0]
-        self._position += 2
-        return value
-
-    def read_u32(self) -> int:
-        value = struct.unpack_from("<I", self._data, self._position)[0]
-        self._position += 4
-        return value
-    
-    def read_s32(self) -> int:
-        value = struct.unpack_from("<i", self._data, self._position)[0]
-        self._position += 4
-        return value
-
-    def read_f32(self) -> float:
-        value = struct.unpack_from("<f", self._data, self._position)[0]
-        self._position += 4
-        return value
-
-    def read_f64(self) -> float:
-        value = struct.unpack_from("<d", self._data, self._position)[0]
-        self._position += 8
-        return value
-
-    def read_bytes(self, length: int) -> bytes:
-        data = self._data[self._position:self._position + length]
-        self._position += length
-        return bytes(data)
-
-    def read_str(self, length: int) -> str:
-        data = self.read_bytes(length)
-        try:
-            return data.decode('shift-jis').rstrip('\x00')
-        except UnicodeDecodeError:
-            return data.decode('latin-1').rstrip('\x00')
-
-    def read_std_string(self) -> str:
-        length = self.read_u32()
-        if length > 1:
-            # The length from file seems to include the null terminator
-            return self.read_str(length if length > 1 else 0)
-        return ""
-
-    def write_u8(self, value: int):
-        self._ensure_space(1)
-        struct.pack_into("<B", self._data, self._position, value)
-        self._position += 1
-
-    def write_s8(self, value: int):
-        self._ensure_space(1)
-        struct.pack_into("<b", self._data, self._position, value)
-        self._position += 1
-
-    def write_u16(self, value: int):
-        self._ensure_space(2)
-        struct.pack_into("<H", self._data, self._position, value)
-        self._position += 2
-
-    def write_s16(self, value: int):
-        self._ensure_space(2)
-        struct.pack_into("<h", self._data, self._position, value)
-        self._position += 2
-
-    def write_u32(self, value: int):
-        self._ensure_space(4)
-        struct.pack_into("<I", self._data, self._position, value)
-        self._position += 4
-    
-    def write_s32(self, value: int):
-        self._ensure_space(4)
-        struct.pack_into("<i", self._data, self._position, value)
-        self._position += 4
-
-    def write_f32(self, value: float):
-        self._ensure_space(4)
-        struct.pack_into("<f", self._data, self._position, value)
-        self._position += 4
-
-    def write_f64(self, value: float):
-        self._ensure_space(8)
-        struct.pack_into("<d", self._data, self._position, value)
-        self._position += 8
-
-    def write_bytes(self, data: Union[bytes, bytearray]):
-        length = len(data)
-        self._ensure_space(length)
-        self._data[self._position:self._position + length] = data
-        self._position += length
-        
-    def write_str(self, value: str, fixed_length: int = -1):
-        encoded = value.encode('shift-jis', errors='ignore')
-        if fixed_length != -1:
-            encoded = encoded[:fixed_length].ljust(fixed_length, b'\x00')
-        self.write_bytes(encoded)
-
-    def write_std_string(self, value: str):
-        if not value:
-            self.write_u32(1)
-            return
-        encoded = value.encode('shift-jis', errors='ignore')
-        # +1 for null terminator
-        self.write_u32(len(encoded) + 1)
-        self.write_bytes(encoded)
-        self.write_u8(0) # Null terminator
-
-    def _read_array(self, parser_func: Callable[[], T]) -> List[T]:
-        count = self.read_u32()
-        return [parser_func() for _ in range(count)]
-
-    def _write_array(self, arr: List[Any], writer_func: Callable[[Any], None]):
-        self.write_u32(len(arr))
-        for item in arr:
-            writer_func(item)
-
 # --- STG4 Dataclasses ---
 
-# region Stage Header
-@dataclass
-class StageDeathFade:
-    list_size: int = 0
-    auto_disappear_left: int = 0
-    auto_disappear_right: int = 0
-    auto_disappear_top: int = 0
-    auto_disappear_bottom: int = 0
-    disappear_left_range: int = 0
-    disappear_right_range: int = 0
-    disappear_top_range: int = 0
-    disappear_bottom_range: int = 0
-    block_end: int = 0
-
-@dataclass
-class StagePlayerCollision:
-    walking_block_width: int = 0
-    walking_block_height: int = 0
-    flying_block_width: int = 0
-    flying_block_height: int = 0
-    walking_character_width: int = 0
-    walking_character_height: int = 0
-    flying_character_width: int = 0
-    flying_character_height: int = 0
-    shot_width: int = 0
-    shot_height: int = 0
-    item_width: int = 0
-    item_height: int = 0
-    walking_block_position: int = 0
-    flying_block_position: int = 0
-    walking_character_position: int = 0
-    flying_character_position: int = 0
-    block_display: int = 0
-    character_display: int = 0
-    shot_display: int = 0
-    item_display: int = 0
-    block_display_color: int = 0
-    character_display_color: int = 0
-    shot_display_color: int = 0
-    item_display_color: int = 0
-
-@dataclass
-class StageEnemyCollision:
-    walking_block_width: int = 0
-    walking_block_height: int = 0
-    flying_block_width: int = 0
-    flying_block_height: int = 0
-    walking_character_width: int = 0
-    walking_character_height: int = 0
-    flying_character_width: int = 0
-    flying_character_height: int = 0
-    shot_width: int = 0
-    shot_height: int = 0
-    walking_block_position: int = 0
-    flying_block_position: int = 0
-    walking_character_position: int = 0
-    flying_character_position: int = 0
-
-@dataclass
-class StageActorHitbox:
-    shot_width: int = 0
-    shot_height: int = 0
-    character_width: int = 0
-    character_height: int = 0
-# endregion
-
 # region Palette Stage
-@dataclass
+@slotted_dataclass
 class BasicCondition:
     header: int = 0
     type: int = 0
@@ -293,7 +55,7 @@ class BasicCondition:
     unk4: int = 0
     unk5: int = 0
 
-@dataclass
+@slotted_dataclass
 class KeyCondition:
     header: int = 0
     right_and_left_to_front_and_back: int = 0
@@ -323,21 +85,21 @@ class KeyCondition:
     d_key: int = 0
     f_key: int = 0
 
-@dataclass
+@slotted_dataclass
 class Command:
     header: int = 8
     unk1: int = 0
     type: int = 0
     details: Any = None # Will hold specific detail dataclass
 
-@dataclass
+@slotted_dataclass
 class ItemEffect:
     header: int = 8
     unk1: int = 0
     type: int = 0
     details: Any = None # Will hold specific detail dataclass
 
-@dataclass
+@slotted_dataclass
 class Flow:
     header: int = 10
     id: int = 0
@@ -356,7 +118,7 @@ class Flow:
     key_conditions: List[KeyCondition] = field(default_factory=list)
     commands: List[Command] = field(default_factory=list)
 
-@dataclass
+@slotted_dataclass
 class Block:
     header: int = 0
     inherit_palette: int = 0
@@ -395,7 +157,7 @@ class Block:
     inherit_block_summon: int = 0
     display_conditions: List[BasicCondition] = field(default_factory=list)
 
-@dataclass
+@slotted_dataclass
 class Character:
     header: int = 0
     inherit_palette: int = 0
@@ -496,7 +258,7 @@ class Character:
     conditions: List[BasicCondition] = field(default_factory=list)
     flows: List[Flow] = field(default_factory=list)
 
-@dataclass
+@slotted_dataclass
 class Item:
     header: int = 0
     inherit_palette: int = 0
@@ -537,28 +299,28 @@ class Item:
     conditions: List[BasicCondition] = field(default_factory=list)
     item_effects: List[ItemEffect] = field(default_factory=list)
 
-@dataclass
+@slotted_dataclass
 class StagePalette:
     blocks: List[Block] = field(default_factory=list)
     characters: List[Character] = field(default_factory=list)
     items: List[Item] = field(default_factory=list)
 
-@dataclass
+@slotted_dataclass
 class StageBlock:
     position: int = 0
     block: Block = field(default_factory=Block)
 
-@dataclass
+@slotted_dataclass
 class StageCharacter:
     position: int = 0
     character: Character = field(default_factory=Character)
 
-@dataclass
+@slotted_dataclass
 class StageItem:
     position: int = 0
     item: Item = field(default_factory=Item)
 
-@dataclass
+@slotted_dataclass
 class Background:
     start: int = 0
     display_from_start: int = 0
@@ -574,7 +336,7 @@ class Background:
     bytes61_80: bytes = b'\x00' * 20
     image_path: str = ""
 
-@dataclass
+@slotted_dataclass
 class StageVar:
     unk: int = 0
     count: int = 1
@@ -583,7 +345,7 @@ class StageVar:
 
 # region Cmd + ItemFx
 # Note: Many structures are identical for Commands and ItemEffects, so they are shared.
-@dataclass
+@slotted_dataclass
 class FlowChangeDetails:
     bytes1_30: bytes = b'\x00' * 30
     flows: List[Flow] = field(default_factory=list)
@@ -591,7 +353,7 @@ class FlowChangeDetails:
     operation: int = 0
     bytes77_80: bytes = b'\x00' * 4
 
-@dataclass
+@slotted_dataclass
 class StageClearDetails:
     bytes1_14: bytes = b'\x00' * 14
     path: str = ""
@@ -608,7 +370,7 @@ class StageClearDetails:
     execute_autosave: int = 0
     add_clear_text_to_replay: int = 0
 
-@dataclass
+@slotted_dataclass
 class GameWaitDetails:
     execution_time: int = 0
     execution_time_double: int = 0
@@ -616,7 +378,7 @@ class GameWaitDetails:
     bytes6_38: bytes = b'\x00' * 33
     game_wait_execution_time: int = 0
 
-@dataclass
+@slotted_dataclass
 class MessageDetails:
     bytes1_14: bytes = b'\x00' * 14
     message: str = ""
@@ -643,7 +405,7 @@ class MessageDetails:
     set_options: int = 0
     assign_return_value_to_flow_variable: int = 0
 
-@dataclass
+@slotted_dataclass
 class WarpDetails:
     bytes1_26: bytes = b'\x00' * 26
     setting_type: int = 0
@@ -667,7 +429,7 @@ class WarpDetails:
     bytes64_101: bytes = b'\x00' * 38
     assign_return_value_to_flow: int = 0
 
-@dataclass
+@slotted_dataclass
 class StatusOperationDetails:
     bytes1_38: bytes = b'\x00' * 38
     operation_target_type: int = 0
@@ -695,7 +457,7 @@ class StatusOperationDetails:
     calculation_content_flow_variable_number: int = 0
     bytes103_138: bytes = b'\x00' * 36
 
-@dataclass
+@slotted_dataclass
 class StatusOperation2Details:
     bytes1_38: bytes = b'\x00' * 38
     target: int = 0
@@ -703,7 +465,7 @@ class StatusOperation2Details:
     on: int = 0
     bytes51_62: bytes = b'\x00' * 12
 
-@dataclass
+@slotted_dataclass
 class DisappearanceDetails:
     bytes1_38: bytes = b'\x00' * 38
     target: int = 0
@@ -711,58 +473,58 @@ class DisappearanceDetails:
     range: int = 0
     assign_return_value_to_flow_variable: int = 0
 
-@dataclass
+@slotted_dataclass
 class ItemAcquisitionDetails:
     bytes1_38: bytes = b'\x00' * 38
     palette_type: int = 0
     palette_data_number: int = 0
 
-@dataclass
+@slotted_dataclass
 class GraphicChangeDetails:
     bytes1_38: bytes = b'\x00' * 38
     image_type: int = 0
     image_number: int = 0
     offset: int = 0
 
-@dataclass
+@slotted_dataclass
 class BasicAnimationSetChangeDetails:
     bytes1_38: bytes = b'\x00' * 38
     animation_set: int = 0
 
-@dataclass
+@slotted_dataclass
 class AnimationExecutionDetails:
     execution_time: int = 0
     execution_time_double: int = 0
     parallel_execution: int = 0
     bytes: "bytes" = b'\x00' * 41
 
-@dataclass
+@slotted_dataclass
 class EffectExecutionDetails:
     bytes1_38: bytes = b'\x00' * 38
     bytes: "bytes" = b'\x00' * 40
 
-@dataclass
+@slotted_dataclass
 class CharacterEffectExecutionDetails:
     bytes1_38: bytes = b'\x00' * 38
     effect: int = 0
     execution_type: int = 0
     loop_execution: int = 0
 
-@dataclass
+@slotted_dataclass
 class ScreenEffectExecutionDetails:
     bytes1_38: bytes = b'\x00' * 38
     effect: int = 0
     execution_type: int = 0
     loop_execution: int = 0
 
-@dataclass
+@slotted_dataclass
 class PictureDisplayDetails:
     execution_time: int = 0
     execution_time_double: int = 0
     parallel_execution: int = 0
     bytes: "bytes" = b'\x00' * 113
 
-@dataclass
+@slotted_dataclass
 class ScreenColorChangeDetails:
     bytes1_38: bytes = b'\x00' * 38
     r: int = 0
@@ -774,28 +536,28 @@ class ScreenColorChangeDetails:
     instant_display: int = 0
     instant_display_count: int = 0
 
-@dataclass
+@slotted_dataclass
 class BackgroundChangeDetails:
     execution_time: int = 0
     execution_time_double: int = 0
     parallel_execution: int = 0
     bytes: "bytes" = b'\x00' * 41
 
-@dataclass
+@slotted_dataclass
 class SoundEffectPlaybackDetails:
     bytes1_7: bytes = b'\x00' * 7
     play_if_outside_screen: int = 0
     bytes9_38: bytes = b'\x00' * 30
     sound_effect: int = 0
 
-@dataclass
+@slotted_dataclass
 class BGMPlaybackDetails:
     execution_time: int = 0
     execution_time_double: int = 0
     parallel_execution: int = 0
     bytes: "bytes" = b'\x00' * 41
 
-@dataclass
+@slotted_dataclass
 class CodeExecutionDetails:
     execution_time: int = 0
     execution_time_double: int = 0
@@ -804,7 +566,7 @@ class CodeExecutionDetails:
     code: str = ""
     bytes19_38: bytes = b'\x00' * 20
 
-@dataclass
+@slotted_dataclass
 class ArrangementDetails:
     bytes1_38: bytes = b'\x00' * 38
     command: int = 0
@@ -813,20 +575,20 @@ class ArrangementDetails:
     variable_type: int = 0
     variable_number: int = 0
 
-@dataclass
+@slotted_dataclass
 class LoopDetails:
     bytes1_38: bytes = b'\x00' * 38
     repeat_count: int = 0
     command_count: int = 0
     
-@dataclass
+@slotted_dataclass
 class WaitDetails:
     execution_time: int = 0
     execution_time_double: int = 0
     parallel_execution: int = 0
     bytes: "bytes" = b'\x00' * 33
 
-@dataclass
+@slotted_dataclass
 class LinearMovementDetails:
     execution_time: int = 0
     execution_time_double: int = 0
@@ -869,21 +631,21 @@ class LinearMovementDetails:
     animation_type: int = 0
     bytes81_101: bytes = b'\x00' * 21
 
-@dataclass
+@slotted_dataclass
 class GenericMovementDetails:
     execution_time: int = 0
     execution_time_double: int = 0
     parallel_execution: int = 0
     bytes6_101: bytes = b'\x00' * 96
 
-@dataclass
+@slotted_dataclass
 class DirectionChangeDetails:
     execution_time: int = 0
     execution_time_double: int = 0
     parallel_execution: int = 0
     bytes6_42: bytes = b'\x00' * 37
 
-@dataclass
+@slotted_dataclass
 class JumpDetails:
     bytes1_5: bytes = b'\x00' * 5
     sound_effect: int = 0
@@ -896,7 +658,7 @@ class JumpDetails:
     min_jump_inertial_movement_speed: int = 0
     min_jump_height: int = 0
 
-@dataclass
+@slotted_dataclass
 class ShotDetails:
     execution_time: int = 0
     execution_time_double: int = 0
@@ -966,7 +728,7 @@ class ShotDetails:
     attack_id: int = 0
     bytes128_143: bytes = b'\x00' * 16
 
-@dataclass
+@slotted_dataclass
 class SwordDetails:
     execution_time: int = 0
     parallel_execution: int = 0
@@ -992,7 +754,7 @@ class SwordDetails:
     attack_id: int = 0
     bytes128_143: bytes = b'\x00' * 16
 
-@dataclass
+@slotted_dataclass
 class SummonDetails: # For Block, Character, Item
     execution_time: int = 0
     execution_time_double: int = 0
@@ -1032,7 +794,7 @@ class SummonDetails: # For Block, Character, Item
     return_value_to_flow_variable: int = 0 # For Block/Character
     bytes145_147: bytes = b'\x00' * 3 # For Block/Character
 
-@dataclass
+@slotted_dataclass
 class ItemSummonDetails: # For Block, Character, Item
     execution_time: int = 0
     execution_time_double: int = 0
@@ -1070,7 +832,7 @@ class ItemSummonDetails: # For Block, Character, Item
     attack_flow: int = 0
     bytes128_143: bytes = b'\x00' * 16
 
-@dataclass
+@slotted_dataclass
 class FlowOperationDetails:
     bytes1_34: bytes = b'\x00' * 34
     condition_present: int = 0
@@ -1084,14 +846,14 @@ class FlowOperationDetails:
     target_character: int = 0
     assign_return_value_to_flow_variable: int = 0
     
-@dataclass
+@slotted_dataclass
 class TargetSettingDetails:
     bytes1_38: bytes = b'\x00' * 38
     bytes39_106: bytes = b'\x00' * 68
 # endregion
 
 # --- Main Stage Data Container ---
-@dataclass
+@slotted_dataclass
 class StageData:
     magic: int = 1020
     some_count: int = 99
@@ -1178,15 +940,906 @@ class StageData:
     stage_vars: List[StageVar] = field(default_factory=list)
     end_marker: int = 123456789
 
+# region Record Layouts
+# Fixed-width field runs, in file order. Strings, arrays and nested structures
+# break a run and are still read field by field.
+STAGE_HEADER_LAYOUT = RecordLayout(
+    ("some_count", "u32"),
+    ("item_width", "u32"),
+    ("chunk_width", "u32"),
+    ("chunk_pow", "u32"),
+    ("height", "u32"),
+    ("enable_horizontal_scroll_minimum", "u32"),
+    ("enable_horizontal_scroll_maximum", "u32"),
+    ("enable_vertical_scroll_minimum", "u32"),
+    ("enable_vertical_scroll_maximum", "u32"),
+    ("horizontal_scroll_minimum_value", "u32"),
+    ("horizontal_scroll_maximum_value", "u32"),
+    ("vertical_scroll_minimum_value", "u32"),
+    ("vertical_scroll_maximum_value", "u32"),
+    ("frame_rate", "u32"),
+    ("enable_time_limit", "u32"),
+    ("time_limit_duration", "u32"),
+    ("warning_sound_start_time", "u32"),
+    ("enable_side_scroll", "u32"),
+    ("enable_vertical_scroll", "u32"),
+    ("autoscroll_speed", "u32"),
+    ("vertical_scroll_speed", "u32"),
+    ("gravity", "f64"),
+    ("hit_detection_level", "u32"),
+    ("character_shot_collision_detection_accuracy", "u32"),
+    ("bgm_number", "u32"),
+    ("bgm_loop_playback", "u32"),
+    ("dont_restart_bgm_if_no_change", "u32"),
+    ("enable_z_coordinate", "u32"),
+    ("inherit_status_from_stock", "u32"),
+    ("store_status_to_stock", "u32"),
+    ("show_status_window", "u32"),
+    ("switch_scene_immediately_on_clear", "u32"),
+    ("allow_replay_save", "u32"),
+    ("show_stage", "u32"),
+    ("show_ready", "u32"),
+    ("show_clear", "u32"),
+    ("show_gameover", "u32"),
+)
+
+STAGE_LIMITS_LAYOUT = RecordLayout(
+    ("undo_max_times", "u32"),
+    ("x_coordinate_upper_limit", "u32"),
+    ("y_coordinate_upper_limit", "u32"),
+    ("unk75", "u32"),
+    ("unk76", "u32"),
+    ("unk77", "u32"),
+    ("unk78", "u32"),
+    ("unk79", "u32"),
+    ("unk80", "u32"),
+    ("unk81", "u32"),
+    ("unk82", "u32"),
+    ("unk83", "u32"),
+    ("unk84", "u32"),
+    ("unk85", "u32"),
+    ("unk86", "u32"),
+    ("disable_damage_outside_screen", "u32"),
+    ("player_invincibility_from_same_enemy_duration", "u32"),
+    ("player_invincibility_duration", "u32"),
+    ("enemy_invincibility_from_same_player_duration", "u32"),
+    ("enemy_invincibility_duration", "u32"),
+)
+
+BASIC_CONDITION_LAYOUT = RecordLayout(
+    ("header", "u32"),
+    ("type", "u8"),
+    ("right_side_constant", "u32"),
+    ("right_side_random_lower_limit", "u32"),
+    ("right_side_random_upper_limit", "u32"),
+    ("left_side_status_target", "u8"),
+    ("left_side_status_number", "u8"),
+    ("left_side_type", "u8"),
+    ("left_side_common_variable_or_stage_variable", "u8"),
+    ("left_side_variable_number", "u16"),
+    ("left_side_flow_variable_number", "u8"),
+    ("right_side_type", "u8"),
+    ("right_side_status_target", "u8"),
+    ("right_side_status_number", "u8"),
+    ("right_side_common_variable_or_stage_variable", "u8"),
+    ("right_side_variable_number", "u16"),
+    ("right_side_flow_variable_number", "u8"),
+    ("how_to_compare", "u8"),
+    ("specify_in_percent", "u8"),
+    ("left_side_coordinate_type", "u8"),
+    ("right_side_coordinate_type", "u8"),
+    ("left_side_gigantic_character_coordinate_position", "u8"),
+    ("right_side_gigantic_character_coordinate_position", "u8"),
+    ("unk1", "u8"),
+    ("unk2", "u8"),
+    ("unk3", "u8"),
+    ("unk4", "u8"),
+    ("unk5", "u8"),
+)
+
+BLOCK_HEAD_LAYOUT = RecordLayout(
+    ("header", "u32"),
+    ("inherit_palette", "u8"),
+    ("inherit_palette_data", "u16"),
+    ("any_of_appearance_conditions_true", "u8"),
+    ("appearance_condition_once_met_always_true", "u8"),
+    ("image_number", "u16"),
+    ("image_type", "u16"),
+    ("unknown1", "u8"),
+    ("in_front_of_character", "u8"),
+    ("transparency", "u8"),
+    ("mark_display", "u8"),
+    ("mark_number", "u8"),
+    ("unknown2", "u8"),
+    ("block_type", "u8"),
+    ("invalid_faction", "u8"),
+    ("action", "u8"),
+    ("action_parameter", "u32"),
+    ("acquired_item_palette", "u8"),
+    ("acquired_item_palette_data_number", "u16"),
+    ("block_summon_invalid", "u8"),
+)
+
+BLOCK_TAIL_LAYOUT = RecordLayout(
+    ("position_x", "s16"),
+    ("position_y", "s16"),
+    ("inherited_data_count", "u32"),
+    ("inherit_block_name", "u8"),
+    ("inherit_appearance_condition", "u8"),
+    ("inherit_image", "u8"),
+    ("inherit_in_front_of_character", "u8"),
+    ("inherit_transparency", "u8"),
+    ("inherit_mark", "u8"),
+    ("inherit_block_type", "u8"),
+    ("inherit_invalid_faction", "u8"),
+    ("inherit_action", "u8"),
+    ("inherit_acquired_item", "u8"),
+    ("inherit_block_summon", "u8"),
+)
+
+CHARACTER_HEAD_LAYOUT = RecordLayout(
+    ("header", "u32"),
+    ("inherit_palette", "u8"),
+    ("inherit_palette_data_number", "u16"),
+    ("any_of_appearance_conditions_true", "u8"),
+    ("appearance_condition_once_met_always_true", "u8"),
+    ("facing_right", "u8"),
+    ("number_of_doubles", "u8"),
+    ("appearance_position_offset_x_bl", "u16"),
+    ("appearance_position_offset_x_dot", "u16"),
+    ("appearance_position_offset_y_bl", "u16"),
+    ("appearance_position_offset_y_dot", "u16"),
+    ("appearance_position_offset_x_flip_if_facing_right", "u8"),
+    ("appearance_position_offset_y_flip_if_facing_right", "u8"),
+    ("image_number", "u16"),
+    ("image_type", "u8"),
+    ("image_offset", "u16"),
+    ("animation_set", "u16"),
+    ("z_coordinate", "u8"),
+    ("transparency", "u8"),
+    ("initial_character_effect", "u16"),
+    ("initial_character_effect_execution_type", "u8"),
+    ("initial_character_effect_loop_execution", "u8"),
+    ("character_effect_on_death", "u16"),
+    ("character_effect_on_death_execution_type", "u8"),
+    ("mark_display", "u8"),
+    ("mark_number", "u16"),
+    ("operation", "u16"),
+    ("faction", "u8"),
+    ("character_id", "u8"),
+    ("flying", "u8"),
+    ("direction_fixed", "u8"),
+    ("invincible", "u8"),
+    ("invincible_effect", "u8"),
+    ("block", "u8"),
+    ("gigantic", "u8"),
+    ("synchronize_with_auto_scroll", "u8"),
+    ("line_of_sight", "u8"),
+    ("line_of_sight_range", "u8"),
+    ("hp", "u32"),
+    ("sp", "u32"),
+    ("stopping_ease_during_inertial_movement", "u16"),
+    ("body_hit_detection_range", "u8"),
+    ("body_hit_power", "u32"),
+    ("body_hit_impact", "u8"),
+    ("body_hit_effect", "u16"),
+    ("defense", "u32"),
+    ("impact_resistance", "u8"),
+    ("score", "u32"),
+    ("holds_item_at_same_position", "u8"),
+    ("has_group", "u8"),
+    ("group_number", "u16"),
+    ("action_condition_range", "u8"),
+    ("action_condition_judgment_type", "u8"),
+)
+
+CHARACTER_TAIL_LAYOUT = RecordLayout(
+    ("position_x", "u16"),
+    ("position_y", "u16"),
+    ("some_count", "s32"),
+    ("inherited_data_count", "u32"),
+    ("inherit_character_name", "u8"),
+    ("inherit_operation", "u8"),
+    ("inherit_faction", "u8"),
+    ("inherit_character_id", "u8"),
+    ("inherit_appearance_condition", "u8"),
+    ("inherit_facing_right", "u8"),
+    ("inherit_number_of_doubles", "u8"),
+    ("inherit_initial_position_offset_x", "u8"),
+    ("inherit_initial_position_offset_y", "u8"),
+    ("inherit_image", "u8"),
+    ("inherit_animation_set", "u8"),
+    ("inherit_z_coordinate", "u8"),
+    ("inherit_transparency", "u8"),
+    ("inherit_initial_character_effect", "u8"),
+    ("inherit_character_effect_on_death", "u8"),
+    ("inherit_mark", "u8"),
+    ("inherit_direction_fixed", "u8"),
+    ("inherit_flying", "u8"),
+    ("inherit_invincible", "u8"),
+    ("inherit_block", "u8"),
+    ("inherit_gigantic", "u8"),
+    ("inherit_synchronize_with_auto_scroll", "u8"),
+    ("inherit_line_of_sight", "u8"),
+    ("inherit_hp", "u8"),
+    ("inherit_sp", "u8"),
+    ("inherit_body_hit_detection_range", "u8"),
+    ("inherit_body_hit_power", "u8"),
+    ("inherit_body_hit_impact", "u8"),
+    ("inherit_body_hit_effect", "u8"),
+    ("inherit_defense", "u8"),
+    ("inherit_impact_resistance", "u8"),
+    ("inherit_stopping_ease_during_inertial_movement", "u8"),
+    ("inherit_action_condition", "u8"),
+    ("inherit_group", "u8"),
+    ("inherit_score", "u8"),
+    ("inherit_holds_item_at_same_position", "u8"),
+    ("inherit_action", "u8"),
+)
+
+ITEM_HEAD_LAYOUT = RecordLayout(
+    ("header", "u32"),
+    ("inherit_palette", "u8"),
+    ("inherit_palette_data_number", "u16"),
+    ("any_of_appearance_conditions_true", "u8"),
+    ("appearance_condition_once_met_always_true", "u8"),
+    ("appearance_position_offset_x_dot", "u16"),
+    ("appearance_position_offset_y_dot", "u16"),
+    ("image_number", "u16"),
+    ("image_type", "u8"),
+    ("frame", "u16"),
+    ("z_coordinate", "u8"),
+    ("transparency", "u8"),
+    ("mark_display", "u8"),
+    ("mark_number", "u16"),
+    ("display_above_head_on_acquisition", "u8"),
+    ("acquisition_type", "u8"),
+    ("gigantic", "u8"),
+    ("sound_effect", "u16"),
+)
+
+ITEM_TAIL_LAYOUT = RecordLayout(
+    ("position_x", "u16"),
+    ("position_y", "u16"),
+    ("number_of_inherited_data", "u32"),
+    ("inherit_item_name", "u8"),
+    ("inherit_appearance_condition", "u8"),
+    ("inherit_initial_position_offset_x", "u8"),
+    ("inherit_initial_position_offset_y", "u8"),
+    ("inherit_image", "u8"),
+    ("inherit_z_coordinate", "u8"),
+    ("inherit_transparency", "u8"),
+    ("inherit_mark", "u8"),
+    ("inherit_gigantic", "u8"),
+    ("inherit_acquisition_type", "u8"),
+    ("inherit_display_above_head_on_acquisition", "u8"),
+    ("inherit_sound_effect", "u8"),
+    ("inherit_effect", "u8"),
+)
+
+FLOW_LAYOUT = RecordLayout(
+    ("id", "u8"),
+    ("group", "u8"),
+    ("test_play_only", "u8"),
+    ("basic_condition_judgment_type", "u8"),
+    ("basic_condition_once_met_always_met", "u8"),
+    ("timing", "u8"),
+    ("target_character_involved_in_timing", "u8"),
+    ("target_number_of_character_involved_in_timing", "u8"),
+    ("ease_of_input_with_multiple_key_conditions", "u8"),
+    ("allow_continuous_execution_by_holding_key", "u8"),
+)
+
+KEY_CONDITION_LAYOUT = RecordLayout(
+    ("header", "u32"),
+    ("right_and_left_to_front_and_back", "u8"),
+    ("minimum_input_time", "u16"),
+    ("maximum_input_time", "u16"),
+    ("input_time_1_to_infinity", "u8"),
+    ("judgment_type", "u8"),
+    ("unknown", "u32"),
+    ("number_of_key_data", "u32"),
+    ("direction_key_neutral", "u8"),
+    ("left_key", "u8"),
+    ("right_key", "u8"),
+    ("up_key", "u8"),
+    ("down_key", "u8"),
+    ("up_left_key", "u8"),
+    ("down_left_key", "u8"),
+    ("up_right_key", "u8"),
+    ("down_right_key", "u8"),
+    ("any_direction_key", "u8"),
+    ("action_key_neutral", "u8"),
+    ("z_key", "u8"),
+    ("x_key", "u8"),
+    ("c_key", "u8"),
+    ("v_key", "u8"),
+    ("a_key", "u8"),
+    ("s_key", "u8"),
+    ("d_key", "u8"),
+    ("f_key", "u8"),
+)
+
+BACKGROUND_LAYOUT = RecordLayout(
+    ("start", "u32"),
+    ("display_from_start", "u32"),
+    ("specified_by_color", "u32"),
+    ("color_number", "u32"),
+    ("display_in_front_of_character", "u32"),
+    ("horizontal_scroll_speed", "f64"),
+    ("vertical_scroll_speed", "f64"),
+    ("horizontal_auto_scroll", "u32"),
+    ("vertical_auto_scroll", "u32"),
+    ("horizontal_auto_scroll_speed", "f64"),
+    ("vertical_auto_scroll_speed", "f64"),
+    ("bytes61_80", 20),
+)
+
+STAGE_VAR_LAYOUT = RecordLayout(
+    ("unk", "u32"),
+    ("count", "u32"),
+)
+
+# Command and item-effect details
+FLOW_CHANGE_DETAILS_LAYOUT = RecordLayout(
+    ("bytes69_72", 4),
+    ("operation", "u32"),
+    ("bytes77_80", 4),
+)
+
+STAGE_CLEAR_DETAILS_LAYOUT = RecordLayout(
+    ("bytes19_38", 20),
+    ("stage_transition", "u32"),
+    ("number", "u32"),
+    ("change_world_map_position", "u32"),
+    ("world_map_position_x", "u32"),
+    ("world_map_position_y", "u32"),
+    ("change_initial_position", "u32"),
+    ("initial_position_x", "u32"),
+    ("initial_position_y", "u32"),
+    ("initial_position_main_character_direction", "u32"),
+    ("execute_autosave", "u32"),
+    ("add_clear_text_to_replay", "u32"),
+)
+
+GAME_WAIT_DETAILS_LAYOUT = RecordLayout(
+    ("execution_time", "u16"),
+    ("execution_time_double", "u16"),
+    ("parallel_execution", "u8"),
+    ("bytes6_38", 33),
+    ("game_wait_execution_time", "u32"),
+)
+
+MESSAGE_DETAILS_LAYOUT = RecordLayout(
+    ("bytes19_38", 20),
+    ("display_position_specification_method", "u32"),
+    ("coordinate_x", "u32"),
+    ("coordinate_y", "u32"),
+    ("display_position_offset_x", "u32"),
+    ("display_position_offset_y", "u32"),
+    ("auto_adjust_to_not_go_off_screen", "u32"),
+    ("display_time_specification_method", "u32"),
+    ("display_time", "u32"),
+    ("pause", "u32"),
+    ("display_variables", "u32"),
+    ("follow_screen", "u32"),
+    ("auto_update", "u32"),
+    ("message_id_present", "u32"),
+    ("message_id", "u32"),
+    ("window_display", "u32"),
+    ("message_clear", "u32"),
+    ("update_interval", "u32"),
+    ("instant_display", "u32"),
+    ("coordinate_unit", "u32"),
+    ("set_options", "u32"),
+    ("assign_return_value_to_flow_variable", "u32"),
+)
+
+WAIT_DETAILS_LAYOUT = RecordLayout(
+    ("execution_time", "u16"),
+    ("execution_time_double", "u16"),
+    ("parallel_execution", "u8"),
+    ("bytes", 33),
+)
+
+LINEAR_MOVEMENT_DETAILS_LAYOUT = RecordLayout(
+    ("execution_time", "u16"),
+    ("execution_time_double", "u16"),
+    ("parallel_execution", "u8"),
+    ("bytes6_8", 3),
+    ("animation_and_other_type", "u16"),
+    ("bytes11_26", 16),
+    ("movement_direction_setting_type", "u8"),
+    ("movement_direction_direction", "u8"),
+    ("movement_direction_angle", "u16"),
+    ("movement_direction_angle_double", "u16"),
+    ("movement_direction_angle_reverse_rotation_if_facing_right", "u8"),
+    ("movement_direction_target_x_present", "u8"),
+    ("movement_direction_target_y_present", "u8"),
+    ("movement_direction_target_x", "u16"),
+    ("movement_direction_target_y", "u16"),
+    ("movement_direction_target_x_dot", "u16"),
+    ("movement_direction_target_y_dot", "u16"),
+    ("movement_direction_target_type", "u8"),
+    ("movement_direction_target_coordinate_unit", "u8"),
+    ("byte46", 1),
+    ("movement_direction_execute_until_target_coordinate_reached", "u8"),
+    ("movement_direction_invalidate_horizontal_movement", "u8"),
+    ("movement_direction_invalidate_vertical_movement", "u8"),
+    ("movement_direction_target_x_flip_if_facing_right", "u8"),
+    ("movement_direction_target_y_flip_if_facing_right", "u8"),
+    ("movement_direction_reverse_speed_if_direction_changes", "u8"),
+    ("movement_direction_prevent_blur", "u8"),
+    ("movement_direction_dont_change_character_direction", "u8"),
+    ("time_speed_distance_setting_type", "u8"),
+    ("time_speed_distance_speed", "u16"),
+    ("time_speed_distance_speed_double", "u16"),
+    ("time_speed_distance_distance", "u16"),
+    ("time_speed_distance_distance_double", "u16"),
+    ("time_speed_distance_distance_unit", "u8"),
+    ("bytes65_68", 4),
+    ("inertia_present", "u8"),
+    ("inertia_max_speed", "u16"),
+    ("inertia_speed_correction_on_direction_change", "f64"),
+    ("animation_type", "u8"),
+    ("bytes81_101", 21),
+)
+
+GENERIC_MOVEMENT_DETAILS_LAYOUT = RecordLayout(
+    ("execution_time", "u16"),
+    ("execution_time_double", "u16"),
+    ("parallel_execution", "u8"),
+    ("bytes6_101", 96),
+)
+
+SHOT_DETAILS_LAYOUT = RecordLayout(
+    ("execution_time", "u16"),
+    ("execution_time_double", "u16"),
+    ("parallel_execution", "u8"),
+    ("sound_effect", "u16"),
+    ("play_if_outside_screen", "u8"),
+    ("animation", "u16"),
+    ("bytes11_30", 20),
+    ("number_of_shots_fired", "u8"),
+    ("formation", "u8"),
+    ("firing_parameter1", "u16"),
+    ("firing_parameter2", "u16"),
+    ("firing_parameter3", "u16"),
+    ("target", "u8"),
+    ("direction", "u8"),
+    ("set_angle_to_target", "u8"),
+    ("firing_target", "u8"),
+    ("angle_offset", "u16"),
+    ("angle_offset_double", "u16"),
+    ("angle_offset_reverse_rotation_if_facing_right", "u8"),
+    ("angle_dispersion", "u16"),
+    ("change_firing_position_according_to_angle", "u8"),
+    ("number_of_doubles", "u8"),
+    ("firing_position_offset_x", "u16"),
+    ("firing_position_offset_x_double", "u16"),
+    ("firing_position_offset_y", "u16"),
+    ("firing_position_offset_y_double", "u16"),
+    ("firing_position_offset_x_flip_if_facing_right", "u8"),
+    ("firing_position_offset_y_flip_if_facing_right", "u8"),
+    ("graphic", "u16"),
+    ("z_coordinate", "u8"),
+    ("transparency", "u8"),
+    ("faction_same_as_user", "u8"),
+    ("faction", "u16"),
+    ("gigantic", "u16"),
+    ("movement_type", "u8"),
+    ("movement_type_parameter1", "u16"),
+    ("movement_type_parameter2", "u16"),
+    ("movement_type_parameter3", "u16"),
+    ("movement_target", "u8"),
+    ("synchronize_with_auto_scroll", "u8"),
+    ("speed", "u16"),
+    ("speed_double", "u16"),
+    ("acceleration_enabled", "u8"),
+    ("acceleration", "u16"),
+    ("acceleration_double", "u16"),
+    ("flight_distance", "u16"),
+    ("flight_distance_valid", "u8"),
+    ("flight_distance_double", "u16"),
+    ("flight_distance_does_not_disappear_at_end", "u8"),
+    ("disappearance_time_valid", "u8"),
+    ("disappearance_time", "u16"),
+    ("disappearance_time_double", "u16"),
+    ("penetrate_blocks", "u8"),
+    ("penetrate_actors", "u8"),
+    ("penetrate_block_actors", "u8"),
+    ("disappear_on_hitting_shot", "u8"),
+    ("value_for_disappearing_on_hitting_shot", "u8"),
+    ("power", "u32"),
+    ("bytes109_110", 2),
+    ("impact", "u8"),
+    ("effect", "u16"),
+    ("acquired_item_palette_type", "u8"),
+    ("acquired_item_palette_number", "u16"),
+    ("bytes117_125", 9),
+    ("attack", "u8"),
+    ("attack_id", "u8"),
+    ("bytes128_143", 16),
+)
+
+ITEM_SUMMON_DETAILS_LAYOUT = RecordLayout(
+    ("execution_time", "u16"),
+    ("execution_time_double", "u16"),
+    ("parallel_execution", "u8"),
+    ("sound_effect", "u16"),
+    ("play_sound_effect_if_outside_screen", "u8"),
+    ("animation", "u8"),
+    ("bytes10_30", 21),
+    ("count", "u8"),
+    ("formation", "u8"),
+    ("interval", "u16"),
+    ("number_of_columns", "u16"),
+    ("column_interval", "u16"),
+    ("target", "u8"),
+    ("direction", "u8"),
+    ("byte41", "u8"),
+    ("target2", "u8"),
+    ("bytes43_51", 9),
+    ("summon_position_offset_x", "u32"),
+    ("summon_position_offset_y", "u32"),
+    ("summon_position_offset_x_flip", "u8"),
+    ("summon_position_offset_y_flip", "u8"),
+    ("bytes62_66", 5),
+    ("faction", "u8"),
+    ("bytes68_88", 21),
+    ("existence_time", "u16"),
+    ("existence_time_present", "u8"),
+    ("bytes92_119", 28),
+    ("palette_type", "u8"),
+    ("palette_data_number", "u16"),
+    ("faction_specification_method", "u8"),
+    ("set_acquired_score_to_0", "u8"),
+    ("direction_flip", "u8"),
+    ("attack", "u8"),
+    ("attack_flow", "u8"),
+    ("bytes128_143", 16),
+)
+
+SUMMON_DETAILS_LAYOUT = RecordLayout(
+    ("execution_time", "u16"),
+    ("execution_time_double", "u16"),
+    ("parallel_execution", "u8"),
+    ("sound_effect", "u16"),
+    ("play_sound_effect_if_outside_screen", "u8"),
+    ("animation", "u8"),
+    ("bytes10_30", 21),
+    ("count", "u8"),
+    ("formation", "u8"),
+    ("interval", "u16"),
+    ("number_of_columns", "u16"),
+    ("column_interval", "u16"),
+    ("target", "u8"),
+    ("direction", "u8"),
+    ("byte41", "u8"),
+    ("target2", "u8"),
+    ("bytes43_51", 9),
+    ("summon_position_offset_x", "u32"),
+    ("summon_position_offset_y", "u32"),
+    ("summon_position_offset_x_flip", "u8"),
+    ("summon_position_offset_y_flip", "u8"),
+    ("bytes62_66", 5),
+    ("faction", "u8"),
+    ("bytes68_88", 21),
+    ("existence_time", "u16"),
+    ("existence_time_present", "u8"),
+    ("bytes92_119", 28),
+    ("palette_type", "u8"),
+    ("palette_data_number", "u16"),
+    ("faction_specification_method", "u8"),
+    ("set_acquired_score_to_0", "u8"),
+    ("direction_flip", "u8"),
+    ("attack", "u8"),
+    ("attack_flow", "u8"),
+    ("bytes128_143", 16),
+    ("return_value_to_flow_variable", "u8"),
+    ("bytes145_147", 3),
+)
+
+SWORD_DETAILS_LAYOUT = RecordLayout(
+    ("execution_time", "u32"),
+    ("parallel_execution", "u8"),
+    ("sound_effect", "u16"),
+    ("play_if_outside_screen", "u8"),
+    ("animation", "u16"),
+    ("bytes11_63", 53),
+    ("z_coordinate", "u8"),
+    ("transparency", "u8"),
+    ("faction_same_as_user", "u8"),
+    ("faction", "u16"),
+    ("gigantic", "u16"),
+    ("sword_type", "u32"),
+    ("bytes75_104", 30),
+    ("power", "u32"),
+    ("bytes109_110", 2),
+    ("impact", "u8"),
+    ("effect", "u16"),
+    ("acquired_item_palette_type", "u8"),
+    ("acquired_item_palette_number", "u16"),
+    ("bytes117_125", 9),
+    ("attack", "u8"),
+    ("attack_id", "u8"),
+    ("bytes128_143", 16),
+)
+
+CODE_EXECUTION_DETAILS_LAYOUT = RecordLayout(
+    ("execution_time", "u16"),
+    ("execution_time_double", "u16"),
+    ("parallel_execution", "u8"),
+    ("bytes6_14", 9),
+)
+
+WARP_DETAILS_LAYOUT = RecordLayout(
+    ("bytes1_26", 26),
+    ("setting_type", "u8"),
+    ("direction", "u8"),
+    ("bytes29_33", 5),
+    ("target_x_present", "u8"),
+    ("target_y_present", "u8"),
+    ("target_x_bl", "u16"),
+    ("target_y_bl", "u16"),
+    ("target_x_dot", "u16"),
+    ("target_y_dot", "u16"),
+    ("target_type", "u8"),
+    ("target_unit", "u8"),
+    ("gigantic_character_coordinate_position", "u8"),
+    ("bytes47_49", 3),
+    ("target_x_flip_if_facing_right", "u8"),
+    ("target_y_flip_if_facing_right", "u8"),
+    ("bytes52_59", 8),
+    ("distance", "u16"),
+    ("distance_double", "u16"),
+    ("bytes64_101", 38),
+    ("assign_return_value_to_flow", "u32"),
+)
+
+STATUS_OPERATION_DETAILS_LAYOUT = RecordLayout(
+    ("bytes1_38", 38),
+    ("operation_target_type", "u8"),
+    ("bytes40_43", 4),
+    ("operation_target_variable_type", "u8"),
+    ("bytes45_46", 2),
+    ("operation_target_variable_number", "u16"),
+    ("bytes49_52", 4),
+    ("operation_target_target", "u8"),
+    ("bytes54_56", 3),
+    ("operation_target_status", "u8"),
+    ("byte58", 1),
+    ("operation_target_flow_variable_number", "u8"),
+    ("bytes60_62", 3),
+    ("operator_type", "u8"),
+    ("bytes64_66", 3),
+    ("calculation_content_type", "u32"),
+    ("calculation_content_constant", "u32"),
+    ("calculation_content_random_lower_limit", "u32"),
+    ("calculation_content_random_upper_limit", "u32"),
+    ("calculation_content_variable_type", "u32"),
+    ("calculation_content_variable_number", "u32"),
+    ("calculation_content_target", "u32"),
+    ("calculation_content_status", "u32"),
+    ("calculation_content_flow_variable_number", "u32"),
+    ("bytes103_138", 36),
+)
+
+STATUS_OPERATION2_DETAILS_LAYOUT = RecordLayout(
+    ("bytes1_38", 38),
+    ("target", "u32"),
+    ("status", "u32"),
+    ("on", "u32"),
+    ("bytes51_62", 12),
+)
+
+DISAPPEARANCE_DETAILS_LAYOUT = RecordLayout(
+    ("bytes1_38", 38),
+    ("target", "u32"),
+    ("faction", "u32"),
+    ("range", "u32"),
+    ("assign_return_value_to_flow_variable", "u32"),
+)
+
+ITEM_ACQUISITION_DETAILS_LAYOUT = RecordLayout(
+    ("bytes1_38", 38),
+    ("palette_type", "u32"),
+    ("palette_data_number", "u32"),
+)
+
+GRAPHIC_CHANGE_DETAILS_LAYOUT = RecordLayout(
+    ("bytes1_38", 38),
+    ("image_type", "u32"),
+    ("image_number", "u32"),
+    ("offset", "u32"),
+)
+
+BASIC_ANIMATION_SET_CHANGE_DETAILS_LAYOUT = RecordLayout(
+    ("bytes1_38", 38),
+    ("animation_set", "u32"),
+)
+
+ANIMATION_EXECUTION_DETAILS_LAYOUT = RecordLayout(
+    ("execution_time", "u16"),
+    ("execution_time_double", "u16"),
+    ("parallel_execution", "u8"),
+    ("bytes", 41),
+)
+
+EFFECT_EXECUTION_DETAILS_LAYOUT = RecordLayout(
+    ("bytes1_38", 38),
+    ("bytes", 40),
+)
+
+CHARACTER_EFFECT_EXECUTION_DETAILS_LAYOUT = RecordLayout(
+    ("bytes1_38", 38),
+    ("effect", "u32"),
+    ("execution_type", "u32"),
+    ("loop_execution", "u32"),
+)
+
+SCREEN_EFFECT_EXECUTION_DETAILS_LAYOUT = RecordLayout(
+    ("bytes1_38", 38),
+    ("effect", "u32"),
+    ("execution_type", "u32"),
+    ("loop_execution", "u32"),
+)
+
+PICTURE_DISPLAY_DETAILS_LAYOUT = RecordLayout(
+    ("execution_time", "u16"),
+    ("execution_time_double", "u16"),
+    ("parallel_execution", "u8"),
+    ("bytes", 113),
+)
+
+SCREEN_COLOR_CHANGE_DETAILS_LAYOUT = RecordLayout(
+    ("bytes1_38", 38),
+    ("r", "u32"),
+    ("g", "u32"),
+    ("b", "u32"),
+    ("percent", "u32"),
+    ("restore_to_original_color", "u32"),
+    ("time_required_for_change", "u32"),
+    ("instant_display", "u32"),
+    ("instant_display_count", "u32"),
+)
+
+BACKGROUND_CHANGE_DETAILS_LAYOUT = RecordLayout(
+    ("execution_time", "u16"),
+    ("execution_time_double", "u16"),
+    ("parallel_execution", "u8"),
+    ("bytes", 41),
+)
+
+SOUND_EFFECT_PLAYBACK_DETAILS_LAYOUT = RecordLayout(
+    ("bytes1_7", 7),
+    ("play_if_outside_screen", "u8"),
+    ("bytes9_38", 30),
+    ("sound_effect", "u32"),
+)
+
+BGM_PLAYBACK_DETAILS_LAYOUT = RecordLayout(
+    ("execution_time", "u16"),
+    ("execution_time_double", "u16"),
+    ("parallel_execution", "u8"),
+    ("bytes", 41),
+)
+
+ARRANGEMENT_DETAILS_LAYOUT = RecordLayout(
+    ("bytes1_38", 38),
+    ("command", "u32"),
+    ("parameter", "u32"),
+    ("operator_type", "u32"),
+    ("variable_type", "u32"),
+    ("variable_number", "u32"),
+)
+
+LOOP_DETAILS_LAYOUT = RecordLayout(
+    ("bytes1_38", 38),
+    ("repeat_count", "u32"),
+    ("command_count", "u32"),
+)
+
+DIRECTION_CHANGE_DETAILS_LAYOUT = RecordLayout(
+    ("execution_time", "u16"),
+    ("execution_time_double", "u16"),
+    ("parallel_execution", "u8"),
+    ("bytes6_42", 37),
+)
+
+JUMP_DETAILS_LAYOUT = RecordLayout(
+    ("bytes1_5", 5),
+    ("sound_effect", "u16"),
+    ("play_if_outside_screen", "u8"),
+    ("animation", "u16"),
+    ("bytes11_38", 28),
+    ("jump_type", "u32"),
+    ("max_jump_inertial_movement_speed", "u32"),
+    ("max_jump_height", "u32"),
+    ("min_jump_inertial_movement_speed", "u32"),
+    ("min_jump_height", "u32"),
+)
+
+FLOW_OPERATION_DETAILS_HEAD_LAYOUT = RecordLayout(
+    ("bytes1_34", 34),
+    ("condition_present", "u8"),
+    ("judgment_type", "u8"),
+    ("bytes37_40", 4),
+)
+
+FLOW_OPERATION_DETAILS_TAIL_LAYOUT = RecordLayout(
+    ("bytes45_52", 8),
+    ("operation", "u32"),
+    ("target_flow", "u32"),
+    ("id", "u32"),
+    ("target_character", "u32"),
+    ("assign_return_value_to_flow_variable", "u32"),
+)
+
+TARGET_SETTING_DETAILS_LAYOUT = RecordLayout(
+    ("bytes1_38", 38),
+    ("bytes39_106", 68),
+)
+# endregion
+
 # --- Main Parser/Serializer Class ---
 
+class SharedObjects:
+    """
+    Objects read from a file, keyed by their bytes, so that identical ones share a single instance.
+    Bodies are also indexed by their first bytes, to spot a repeat before parsing it again.
+    """
+    PREFIX = 32
+
+    def __init__(self):
+        self.by_bytes = {}
+        self.by_prefix = {}
+
+    def match(self, data, offset: int):
+        """The (object, size) of a known body found at offset, or None."""
+        for body in self.by_prefix.get(bytes(data[offset:offset + self.PREFIX]), ()):
+            if data[offset:offset + len(body)] == body:
+                return self.by_bytes[body], len(body)
+        return None
+
+    def add(self, body: bytes, obj):
+        """Returns the instance already held for body if any, else keeps obj for it."""
+        if body in self.by_bytes:
+            return self.by_bytes[body]
+        self.by_bytes[body] = obj
+        self.by_prefix.setdefault(body[:self.PREFIX], []).append(body)
+        return obj
+
+# Placed object lists, named like the palette list of their kind, and the field holding each object.
+# A placed object identical to a palette entry is exported as {"$palette": index}.
+PLACED_OBJECTS = {
+    "blocks": "block",
+    "characters": "character",
+    "items": "item",
+}
+PALETTE_REF = "$palette"
+
+# The parts of a stage file after its magic number, in file order; the end marker follows
+STAGE_SECTIONS = ("header", "palette", "blocks", "characters", "items", "backgrounds", "stage_vars")
+
 class Stage(ActedBinaryFile):
     """
     Parser and serializer for STG4 stage files.
+
+    Palette entries and placed objects with identical bytes are parsed once and share one instance,
+    so parsed objects must not be modified in place.
     """
+    VERSIONS = [
+        0x03C6, # ??
+        0x03FC # v1020 (stg4/cplt4 magic)
+    ]
+    FALLBACK_ENCODING = "latin-1"
+
     def __init__(self, file_path: Union[str, Path]):
         super().__init__(file_path)
         self.data = StageData()
+        self._shared = {}
+        self._written = {}
 
     def parse(self) -> bool:
         if not self.load():
@@ -1198,19 +1851,11 @@ class Stage(ActedBinaryFile):
             print(f"Invalid STG4 magic number: {magic}, expected 1020")
             return False
         self.data.magic = magic
+        self._shared = {kind: SharedObjects() for kind in PLACED_OBJECTS}
         
-        # Read Header
-        self._read_stage_header()
-
-        # Read Palette
-        self.data.palette = self._read_stage_palette()
-        
-        # Read Stage Objects
-        self.data.blocks = self._read_array(self._read_stage_block)
-        self.data.characters = self._read_array(self._read_stage_character)
-        self.data.items = self._read_array(self._read_stage_item)
-        self.data.backgrounds = self._read_array(self._read_background)
-        self.data.stage_vars = self._read_array(self._read_stage_var)
+        # Read Header, Palette and Stage Objects
+        for name in STAGE_SECTIONS:
+            self._read_section(name)
         
         # Read End Marker
         self.data.end_marker = self.read_u32()
@@ -1227,22 +1872,15 @@ class Stage(ActedBinaryFile):
 
     def save(self) -> bool:
         try:
-            self.start_writing()
+            # The file being replaced is the best estimate of the output size
+            self.start_writing(self.file_path.stat().st_size if self.file_path.exists() else 0)
+            self._written = {}
             
             self.write_u32(self.data.magic)
             
-            # Write Header
-            self._write_stage_header()
-            
-            # Write Palette
-            self._write_stage_palette(StagePalette(**self.data.palette))
-            
-            # Write Stage Objects
-            self._write_array([StageBlock(**i) for i in self.data.blocks], self._write_stage_block)
-            self._write_array([StageCharacter(**i) for i in self.data.characters], self._write_stage_character)
-            self._write_array([StageItem(**i) for i in self.data.items], self._write_stage_item)
-            self._write_array([Background(**i) for i in self.data.backgrounds], self._write_background)
-            self._write_array([StageVar(**i) for i in self.data.stage_vars], self._write_stage_var)
+            # Write Header, Palette and Stage Objects
+            for name in STAGE_SECTIONS:
+                self._write_section(name)
             
             # Write End Marker
             self.write_u32(self.data.end_marker or 123456789)
@@ -1256,84 +1894,43 @@ class Stage(ActedBinaryFile):
             print(f"Error saving Stage file: {e}")
             return False
 
+    def _read_section(self, name: str):
+        """Decodes one of STAGE_SECTIONS at the current position into self.data."""
+        if name == "header":
+            self._read_stage_header()
+        elif name == "palette":
+            self.data.palette = self._read_stage_palette()
+        else:
+            _, reader, _ = self.ARRAY_SECTIONS[name]
+            setattr(self.data, name, self._read_array(lambda: reader(self)))
+
+    def _write_section(self, name: str):
+        """Encodes one of STAGE_SECTIONS from self.data, as loaded from JSON."""
+        if name == "header":
+            self._write_stage_header()
+        elif name == "palette":
+            self._write_stage_palette(StagePalette(**self.data.palette))
+        else:
+            cls, _, writer = self.ARRAY_SECTIONS[name]
+            self._write_array([cls(**i) for i in getattr(self.data, name)], lambda item: writer(self, item))
+
     # region Header R/W
     def _read_stage_header(self):
         d = self.data
-        d.some_count = self.read_u32()
-        d.item_width = self.read_u32()
-        d.chunk_width = self.read_u32()
-        d.chunk_pow = self.read_u32()
-        d.height = self.read_u32()
-        d.enable_horizontal_scroll_minimum = self.read_u32()
-        d.enable_horizontal_scroll_maximum = self.read_u32()
-        d.enable_vertical_scroll_minimum = self.read_u32()
-        d.enable_vertical_scroll_maximum = self.read_u32()
-        d.horizontal_scroll_minimum_value = self.read_u32()
-        d.horizontal_scroll_maximum_value = self.read_u32()
-        d.vertical_scroll_minimum_value = self.read_u32()
-        d.vertical_scroll_maximum_value = self.read_u32()
-        d.frame_rate = self.read_u32()
-        d.enable_time_limit = self.read_u32()
-        d.time_limit_duration = self.read_u32()
-        d.warning_sound_start_time = self.read_u32()
-        d.enable_side_scroll = self.read_u32()
-        d.enable_vertical_scroll = self.read_u32()
-        d.autoscroll_speed = self.read_u32()
-        d.vertical_scroll_speed = self.read_u32()
-        d.gravity = self.read_f64()
-        d.hit_detection_level = self.read_u32()
-        d.character_shot_collision_detection_accuracy = self.read_u32()
-        d.bgm_number = self.read_u32()
-        d.bgm_loop_playback = self.read_u32()
-        d.dont_restart_bgm_if_no_change = self.read_u32()
-        d.enable_z_coordinate = self.read_u32()
-        d.inherit_status_from_stock = self.read_u32()
-        d.store_status_to_stock = self.read_u32()
-        d.show_status_window = self.read_u32()
-        d.switch_scene_immediately_on_clear = self.read_u32()
-        d.allow_replay_save = self.read_u32()
-        d.show_stage = self.read_u32()
-        d.show_ready = self.read_u32()
-        d.show_clear = self.read_u32()
-        d.show_gameover = self.read_u32()
+        self.read_record(STAGE_HEADER_LAYOUT, d)
         d.player_collide = self._read_player_collision()
         d.enemy_collide = self._read_enemy_collision()
-        d.item_collision_width = self.read_u32()
-        d.item_collision_height = self.read_u32()
+        self.read_record(ITEM_COLLISION_LAYOUT, d)
         d.player_hitbox = self._read_actor_hitbox()
         d.enemy_hitbox = self._read_actor_hitbox()
-        d.undo_max_times = self.read_u32()
-        d.x_coordinate_upper_limit = self.read_u32()
-        d.y_coordinate_upper_limit = self.read_u32()
-        d.unk75 = self.read_u32()
-        d.unk76 = self.read_u32()
-        d.unk77 = self.read_u32()
-        d.unk78 = self.read_u32()
-        d.unk79 = self.read_u32()
-        d.unk80 = self.read_u32()
-        d.unk81 = self.read_u32()
-        d.unk82 = self.read_u32()
-        d.unk83 = self.read_u32()
-        d.unk84 = self.read_u32()
-        d.unk85 = self.read_u32()
-        d.unk86 = self.read_u32()
-        d.disable_damage_outside_screen = self.read_u32()
-        d.player_invincibility_from_same_enemy_duration = self.read_u32()
-        d.player_invincibility_duration = self.read_u32()
-        d.enemy_invincibility_from_same_player_duration = self.read_u32()
-        d.enemy_invincibility_duration = self.read_u32()
+        self.read_record(STAGE_LIMITS_LAYOUT, d)
         
         stage_names_count = self.read_u32() # Should be 1
         d.stage_names = stage_names_count
         if stage_names_count > 0:
-            d.stage_name = self.read_std_string()
+            d.stage_name = self.read_std_string("stage_name")
         
-        d.ranking_size = self.read_u32()
-        d.ranking_score = self.read_u32()
-        d.ranking_remaining_time = self.read_u32()
-        d.ranking_clear_time = self.read_u32()
-        d.ranking_remaining_hp = self.read_u32()
-        d.ranking_remaining_sp = self.read_u32()
+        self.read_record(RANKING_LAYOUT, d)
         
         d.nonblock_enemy_death = self._read_death_fade()
         d.block_enemy_death = self._read_death_fade()
@@ -1343,79 +1940,18 @@ class Stage(ActedBinaryFile):
 
     def _write_stage_header(self):
         d = self.data
-        self.write_u32(d.some_count)
-        self.write_u32(d.item_width)
-        self.write_u32(d.chunk_width)
-        self.write_u32(d.chunk_pow)
-        self.write_u32(d.height)
-        self.write_u32(d.enable_horizontal_scroll_minimum)
-        self.write_u32(d.enable_horizontal_scroll_maximum)
-        self.write_u32(d.enable_vertical_scroll_minimum)
-        self.write_u32(d.enable_vertical_scroll_maximum)
-        self.write_u32(d.horizontal_scroll_minimum_value)
-        self.write_u32(d.horizontal_scroll_maximum_value)
-        self.write_u32(d.vertical_scroll_minimum_value)
-        self.write_u32(d.vertical_scroll_maximum_value)
-        self.write_u32(d.frame_rate)
-        self.write_u32(d.enable_time_limit)
-        self.write_u32(d.time_limit_duration)
-        self.write_u32(d.warning_sound_start_time)
-        self.write_u32(d.enable_side_scroll)
-        self.write_u32(d.enable_vertical_scroll)
-        self.write_u32(d.autoscroll_speed)
-        self.write_u32(d.vertical_scroll_speed)
-        self.write_f64(d.gravity)
-        self.write_u32(d.hit_detection_level)
-        self.write_u32(d.character_shot_collision_detection_accuracy)
-        self.write_u32(d.bgm_number)
-        self.write_u32(d.bgm_loop_playback)
-        self.write_u32(d.dont_restart_bgm_if_no_change)
-        self.write_u32(d.enable_z_coordinate)
-        self.write_u32(d.inherit_status_from_stock)
-        self.write_u32(d.store_status_to_stock)
-        self.write_u32(d.show_status_window)
-        self.write_u32(d.switch_scene_immediately_on_clear)
-        self.write_u32(d.allow_replay_save)
-        self.write_u32(d.show_stage)
-        self.write_u32(d.show_ready)
-        self.write_u32(d.show_clear)
-        self.write_u32(d.show_gameover)
+        self.write_record(STAGE_HEADER_LAYOUT, d)
         self._write_player_collision(StagePlayerCollision(**d.player_collide))
         self._write_enemy_collision(StageEnemyCollision(**d.enemy_collide))
-        self.write_u32(d.item_collision_width)
-        self.write_u32(d.item_collision_height)
+        self.write_record(ITEM_COLLISION_LAYOUT, d)
         self._write_actor_hitbox(StageActorHitbox(**d.player_hitbox))
         self._write_actor_hitbox(StageActorHitbox(**d.enemy_hitbox))
-        self.write_u32(d.undo_max_times)
-        self.write_u32(d.x_coordinate_upper_limit)
-        self.write_u32(d.y_coordinate_upper_limit)
-        self.write_u32(d.unk75)
-        self.write_u32(d.unk76)
-        self.write_u32(d.unk77)
-        self.write_u32(d.unk78)
-        self.write_u32(d.unk79)
-        self.write_u32(d.unk80)
-        self.write_u32(d.unk81)
-        self.write_u32(d.unk82)
-        self.write_u32(d.unk83)
-        self.write_u32(d.unk84)
-        self.write_u32(d.unk85)
-        self.write_u32(d.unk86)
-        self.write_u32(d.disable_damage_outside_screen)
-        self.write_u32(d.player_invincibility_from_same_enemy_duration)
-        self.write_u32(d.player_invincibility_duration)
-        self.write_u32(d.enemy_invincibility_from_same_player_duration)
-        self.write_u32(d.enemy_invincibility_duration)
+        self.write_record(STAGE_LIMITS_LAYOUT, d)
         
         self.write_u32(1) # Stage names count, always 1
         self.write_std_string(d.stage_name)
         
-        self.write_u32(d.ranking_size)
-        self.write_u32(d.ranking_score)
-        self.write_u32(d.ranking_remaining_time)
-        self.write_u32(d.ranking_clear_time)
-        self.write_u32(d.ranking_remaining_hp)
-        self.write_u32(d.ranking_remaining_sp)
+        self.write_record(RANKING_LAYOUT, d)
         
         self._write_death_fade(StageDeathFade(**d.nonblock_enemy_death))
         self._write_death_fade(StageDeathFade(**d.block_enemy_death))
@@ -1424,577 +1960,102 @@ class Stage(ActedBinaryFile):
         self._write_death_fade(StageDeathFade(**d.enemy_death))
 
     def _read_death_fade(self) -> StageDeathFade:
-        fade = StageDeathFade()
-        fade.list_size = self.read_u32()
-        fade.auto_disappear_left = self.read_u32()
-        fade.auto_disappear_right = self.read_u32()
-        fade.auto_disappear_top = self.read_u32()
-        fade.auto_disappear_bottom = self.read_u32()
-        fade.disappear_left_range = self.read_u32()
-        fade.disappear_right_range = self.read_u32()
-        fade.disappear_top_range = self.read_u32()
-        fade.disappear_bottom_range = self.read_u32()
-        fade.block_end = self.read_u32()
-        return fade
+        return self.read_record(DEATH_FADE_LAYOUT, StageDeathFade())
 
     def _write_death_fade(self, fade: StageDeathFade):
-        self.write_u32(fade.list_size)
-        self.write_u32(fade.auto_disappear_left)
-        self.write_u32(fade.auto_disappear_right)
-        self.write_u32(fade.auto_disappear_top)
-        self.write_u32(fade.auto_disappear_bottom)
-        self.write_u32(fade.disappear_left_range)
-        self.write_u32(fade.disappear_right_range)
-        self.write_u32(fade.disappear_top_range)
-        self.write_u32(fade.disappear_bottom_range)
-        self.write_u32(fade.block_end)
+        self.write_record(DEATH_FADE_LAYOUT, fade)
 
     def _read_player_collision(self) -> StagePlayerCollision:
-        coll = StagePlayerCollision()
-        coll.walking_block_width = self.read_u32()
-        coll.walking_block_height = self.read_u32()
-        coll.flying_block_width = self.read_u32()
-        coll.flying_block_height = self.read_u32()
-        coll.walking_character_width = self.read_u32()
-        coll.walking_character_height = self.read_u32()
-        coll.flying_character_width = self.read_u32()
-        coll.flying_character_height = self.read_u32()
-        coll.shot_width = self.read_u32()
-        coll.shot_height = self.read_u32()
-        coll.item_width = self.read_u32()
-        coll.item_height = self.read_u32()
-        coll.walking_block_position = self.read_u32()
-        coll.flying_block_position = self.read_u32()
-        coll.walking_character_position = self.read_u32()
-        coll.flying_character_position = self.read_u32()
-        coll.block_display = self.read_u32()
-        coll.character_display = self.read_u32()
-        coll.shot_display = self.read_u32()
-        coll.item_display = self.read_u32()
-        coll.block_display_color = self.read_u32()
-        coll.character_display_color = self.read_u32()
-        coll.shot_display_color = self.read_u32()
-        coll.item_display_color = self.read_u32()
-        return coll
+        return self.read_record(PLAYER_COLLISION_LAYOUT, StagePlayerCollision())
     
     def _write_player_collision(self, coll: StagePlayerCollision):
-        self.write_u32(coll.walking_block_width)
-        self.write_u32(coll.walking_block_height)
-        self.write_u32(coll.flying_block_width)
-        self.write_u32(coll.flying_block_height)
-        self.write_u32(coll.walking_character_width)
-        self.write_u32(coll.walking_character_height)
-        self.write_u32(coll.flying_character_width)
-        self.write_u32(coll.flying_character_height)
-        self.write_u32(coll.shot_width)
-        self.write_u32(coll.shot_height)
-        self.write_u32(coll.item_width)
-        self.write_u32(coll.item_height)
-        self.write_u32(coll.walking_block_position)
-        self.write_u32(coll.flying_block_position)
-        self.write_u32(coll.walking_character_position)
-        self.write_u32(coll.flying_character_position)
-        self.write_u32(coll.block_display)
-        self.write_u32(coll.character_display)
-        self.write_u32(coll.shot_display)
-        self.write_u32(coll.item_display)
-        self.write_u32(coll.block_display_color)
-        self.write_u32(coll.character_display_color)
-        self.write_u32(coll.shot_display_color)
-        self.write_u32(coll.item_display_color)
+        self.write_record(PLAYER_COLLISION_LAYOUT, coll)
 
     def _read_enemy_collision(self) -> StageEnemyCollision:
-        coll = StageEnemyCollision()
-        coll.walking_block_width = self.read_u32()
-        coll.walking_block_height = self.read_u32()
-        coll.flying_block_width = self.read_u32()
-        coll.flying_block_height = self.read_u32()
-        coll.walking_character_width = self.read_u32()
-        coll.walking_character_height = self.read_u32()
-        coll.flying_character_width = self.read_u32()
-        coll.flying_character_height = self.read_u32()
-        coll.shot_width = self.read_u32()
-        coll.shot_height = self.read_u32()
-        coll.walking_block_position = self.read_u32()
-        coll.flying_block_position = self.read_u32()
-        coll.walking_character_position = self.read_u32()
-        coll.flying_character_position = self.read_u32()
-        return coll
+        return self.read_record(ENEMY_COLLISION_LAYOUT, StageEnemyCollision())
 
     def _write_enemy_collision(self, coll: StageEnemyCollision):
-        self.write_u32(coll.walking_block_width)
-        self.write_u32(coll.walking_block_height)
-        self.write_u32(coll.flying_block_width)
-        self.write_u32(coll.flying_block_height)
-        self.write_u32(coll.walking_character_width)
-        self.write_u32(coll.walking_character_height)
-        self.write_u32(coll.flying_character_width)
-        self.write_u32(coll.flying_character_height)
-        self.write_u32(coll.shot_width)
-        self.write_u32(coll.shot_height)
-        self.write_u32(coll.walking_block_position)
-        self.write_u32(coll.flying_block_position)
-        self.write_u32(coll.walking_character_position)
-        self.write_u32(coll.flying_character_position)
+        self.write_record(ENEMY_COLLISION_LAYOUT, coll)
         
     def _read_actor_hitbox(self) -> StageActorHitbox:
-        hitbox = StageActorHitbox()
-        hitbox.shot_width = self.read_u32()
-        hitbox.shot_height = self.read_u32()
-        hitbox.character_width = self.read_u32()
-        hitbox.character_height = self.read_u32()
-        return hitbox
+        return self.read_record(ACTOR_HITBOX_LAYOUT, StageActorHitbox())
 
     def _write_actor_hitbox(self, hitbox: StageActorHitbox):
-        self.write_u32(hitbox.shot_width)
-        self.write_u32(hitbox.shot_height)
-        self.write_u32(hitbox.character_width)
-        self.write_u32(hitbox.character_height)
+        self.write_record(ACTOR_HITBOX_LAYOUT, hitbox)
     # endregion
 
     # region Struct R/W
     def _read_basic_condition(self) -> BasicCondition:
-        c = BasicCondition()
-        c.header = self.read_u32()
-        c.type = self.read_u8()
-        c.right_side_constant = self.read_u32()
-        c.right_side_random_lower_limit = self.read_u32()
-        c.right_side_random_upper_limit = self.read_u32()
-        c.left_side_status_target = self.read_u8()
-        c.left_side_status_number = self.read_u8()
-        c.left_side_type = self.read_u8()
-        c.left_side_common_variable_or_stage_variable = self.read_u8()
-        c.left_side_variable_number = self.read_u16()
-        c.left_side_flow_variable_number = self.read_u8()
-        c.right_side_type = self.read_u8()
-        c.right_side_status_target = self.read_u8()
-        c.right_side_status_number = self.read_u8()
-        c.right_side_common_variable_or_stage_variable = self.read_u8()
-        c.right_side_variable_number = self.read_u16()
-        c.right_side_flow_variable_number = self.read_u8()
-        c.how_to_compare = self.read_u8()
-        c.specify_in_percent = self.read_u8()
-        c.left_side_coordinate_type = self.read_u8()
-        c.right_side_coordinate_type = self.read_u8()
-        c.left_side_gigantic_character_coordinate_position = self.read_u8()
-        c.right_side_gigantic_character_coordinate_position = self.read_u8()
-        c.unk1 = self.read_u8()
-        c.unk2 = self.read_u8()
-        c.unk3 = self.read_u8()
-        c.unk4 = self.read_u8()
-        c.unk5 = self.read_u8()
-        return c
+        return self.read_record(BASIC_CONDITION_LAYOUT, BasicCondition())
 
     def _write_basic_condition(self, c: BasicCondition):
-        self.write_u32(c.header)
-        self.write_u8(c.type)
-        self.write_u32(c.right_side_constant)
-        self.write_u32(c.right_side_random_lower_limit)
-        self.write_u32(c.right_side_random_upper_limit)
-        self.write_u8(c.left_side_status_target)
-        self.write_u8(c.left_side_status_number)
-        self.write_u8(c.left_side_type)
-        self.write_u8(c.left_side_common_variable_or_stage_variable)
-        self.write_u16(c.left_side_variable_number)
-        self.write_u8(c.left_side_flow_variable_number)
-        self.write_u8(c.right_side_type)
-        self.write_u8(c.right_side_status_target)
-        self.write_u8(c.right_side_status_number)
-        self.write_u8(c.right_side_common_variable_or_stage_variable)
-        self.write_u16(c.right_side_variable_number)
-        self.write_u8(c.right_side_flow_variable_number)
-        self.write_u8(c.how_to_compare)
-        self.write_u8(c.specify_in_percent)
-        self.write_u8(c.left_side_coordinate_type)
-        self.write_u8(c.right_side_coordinate_type)
-        self.write_u8(c.left_side_gigantic_character_coordinate_position)
-        self.write_u8(c.right_side_gigantic_character_coordinate_position)
-        self.write_u8(c.unk1)
-        self.write_u8(c.unk2)
-        self.write_u8(c.unk3)
-        self.write_u8(c.unk4)
-        self.write_u8(c.unk5)
+        self.write_record(BASIC_CONDITION_LAYOUT, c)
 
     def _read_block(self) -> Block:
-        b = Block()
-        b.header = self.read_u32()
-        b.inherit_palette = self.read_u8()
-        b.inherit_palette_data = self.read_u16()
-        b.any_of_appearance_conditions_true = self.read_u8()
-        b.appearance_condition_once_met_always_true = self.read_u8()
-        b.image_number = self.read_u16()
-        b.image_type = self.read_u16()
-        b.unknown1 = self.read_u8()
-        b.in_front_of_character = self.read_u8()
-        b.transparency = self.read_u8()
-        b.mark_display = self.read_u8()
-        b.mark_number = self.read_u8()
-        b.unknown2 = self.read_u8()
-        b.block_type = self.read_u8()
-        b.invalid_faction = self.read_u8()
-        b.action = self.read_u8()
-        b.action_parameter = self.read_u32()
-        b.acquired_item_palette = self.read_u8()
-        b.acquired_item_palette_data_number = self.read_u16()
-        b.block_summon_invalid = self.read_u8()
+        b = self.read_record(BLOCK_HEAD_LAYOUT, Block())
         
         strings_count = self.read_u32()
         if strings_count > 0:
-            b.name = self.read_std_string()
-
-        b.position_x = self.read_s16()
-        b.position_y = self.read_s16()
-        b.inherited_data_count = self.read_u32()
-        b.inherit_block_name = self.read_u8()
-        b.inherit_appearance_condition = self.read_u8()
-        b.inherit_image = self.read_u8()
-        b.inherit_in_front_of_character = self.read_u8()
-        b.inherit_transparency = self.read_u8()
-        b.inherit_mark = self.read_u8()
-        b.inherit_block_type = self.read_u8()
-        b.inherit_invalid_faction = self.read_u8()
-        b.inherit_action = self.read_u8()
-        b.inherit_acquired_item = self.read_u8()
-        b.inherit_block_summon = self.read_u8()
+            b.name = self.read_std_string("name")
+
+        self.read_record(BLOCK_TAIL_LAYOUT, b)
         b.display_conditions = self._read_array(self._read_basic_condition)
         return b
 
     def _write_block(self, b: Block):
-        self.write_u32(b.header)
-        self.write_u8(b.inherit_palette)
-        self.write_u16(b.inherit_palette_data)
-        self.write_u8(b.any_of_appearance_conditions_true)
-        self.write_u8(b.appearance_condition_once_met_always_true)
-        self.write_u16(b.image_number)
-        self.write_u16(b.image_type)
-        self.write_u8(b.unknown1)
-        self.write_u8(b.in_front_of_character)
-        self.write_u8(b.transparency)
-        self.write_u8(b.mark_display)
-        self.write_u8(b.mark_number)
-        self.write_u8(b.unknown2)
-        self.write_u8(b.block_type)
-        self.write_u8(b.invalid_faction)
-        self.write_u8(b.action)
-        self.write_u32(b.action_parameter)
-        self.write_u8(b.acquired_item_palette)
-        self.write_u16(b.acquired_item_palette_data_number)
-        self.write_u8(b.block_summon_invalid)
+        self.write_record(BLOCK_HEAD_LAYOUT, b)
         
         self.write_u32(1) # strings_count, must be 1
         self.write_std_string(b.name)
         
-        self.write_s16(b.position_x)
-        self.write_s16(b.position_y)
-        self.write_u32(b.inherited_data_count)
-        self.write_u8(b.inherit_block_name)
-        self.write_u8(b.inherit_appearance_condition)
-        self.write_u8(b.inherit_image)
-        self.write_u8(b.inherit_in_front_of_character)
-        self.write_u8(b.inherit_transparency)
-        self.write_u8(b.inherit_mark)
-        self.write_u8(b.inherit_block_type)
-        self.write_u8(b.inherit_invalid_faction)
-        self.write_u8(b.inherit_action)
-        self.write_u8(b.inherit_acquired_item)
-        self.write_u8(b.inherit_block_summon)
+        self.write_record(BLOCK_TAIL_LAYOUT, b)
         self._write_array([BasicCondition(**i) for i in b.display_conditions], self._write_basic_condition)
 
     def _read_character(self) -> Character:
-        c = Character()
-        c.header = self.read_u32()
-        c.inherit_palette = self.read_u8()
-        c.inherit_palette_data_number = self.read_u16()
-        c.any_of_appearance_conditions_true = self.read_u8()
-        c.appearance_condition_once_met_always_true = self.read_u8()
-        c.facing_right = self.read_u8()
-        c.number_of_doubles = self.read_u8()
-        c.appearance_position_offset_x_bl = self.read_u16()
-        c.appearance_position_offset_x_dot = self.read_u16()
-        c.appearance_position_offset_y_bl = self.read_u16()
-        c.appearance_position_offset_y_dot = self.read_u16()
-        c.appearance_position_offset_x_flip_if_facing_right = self.read_u8()
-        c.appearance_position_offset_y_flip_if_facing_right = self.read_u8()
-        c.image_number = self.read_u16()
-        c.image_type = self.read_u8()
-        c.image_offset = self.read_u16()
-        c.animation_set = self.read_u16()
-        c.z_coordinate = self.read_u8()
-        c.transparency = self.read_u8()
-        c.initial_character_effect = self.read_u16()
-        c.initial_character_effect_execution_type = self.read_u8()
-        c.initial_character_effect_loop_execution = self.read_u8()
-        c.character_effect_on_death = self.read_u16()
-        c.character_effect_on_death_execution_type = self.read_u8()
-        c.mark_display = self.read_u8()
-        c.mark_number = self.read_u16()
-        c.operation = self.read_u16()
-        c.faction = self.read_u8()
-        c.character_id = self.read_u8()
-        c.flying = self.read_u8()
-        c.direction_fixed = self.read_u8()
-        c.invincible = self.read_u8()
-        c.invincible_effect = self.read_u8()
-        c.block = self.read_u8()
-        c.gigantic = self.read_u8()
-        c.synchronize_with_auto_scroll = self.read_u8()
-        c.line_of_sight = self.read_u8()
-        c.line_of_sight_range = self.read_u8()
-        c.hp = self.read_u32()
-        c.sp = self.read_u32()
-        c.stopping_ease_during_inertial_movement = self.read_u16()
-        c.body_hit_detection_range = self.read_u8()
-        c.body_hit_power = self.read_u32()
-        c.body_hit_impact = self.read_u8()
-        c.body_hit_effect = self.read_u16()
-        c.defense = self.read_u32()
-        c.impact_resistance = self.read_u8()
-        c.score = self.read_u32()
-        c.holds_item_at_same_position = self.read_u8()
-        c.has_group = self.read_u8()
-        c.group_number = self.read_u16()
-        c.action_condition_range = self.read_u8()
-        c.action_condition_judgment_type = self.read_u8()
+        c = self.read_record(CHARACTER_HEAD_LAYOUT, Character())
         
         c.strings_count = self.read_u32()
         if c.strings_count > 0:
-            c.character_name = self.read_std_string()
+            c.character_name = self.read_std_string("character_name")
             for _ in range(1, c.strings_count):
                 self.read_std_string() # Read and discard extra strings
 
-        c.position_x = self.read_u16()
-        c.position_y = self.read_u16()
-        c.some_count = self.read_s32()
-        c.inherited_data_count = self.read_u32()
-        c.inherit_character_name = self.read_u8()
-        c.inherit_operation = self.read_u8()
-        c.inherit_faction = self.read_u8()
-        c.inherit_character_id = self.read_u8()
-        c.inherit_appearance_condition = self.read_u8()
-        c.inherit_facing_right = self.read_u8()
-        c.inherit_number_of_doubles = self.read_u8()
-        c.inherit_initial_position_offset_x = self.read_u8()
-        c.inherit_initial_position_offset_y = self.read_u8()
-        c.inherit_image = self.read_u8()
-        c.inherit_animation_set = self.read_u8()
-        c.inherit_z_coordinate = self.read_u8()
-        c.inherit_transparency = self.read_u8()
-        c.inherit_initial_character_effect = self.read_u8()
-        c.inherit_character_effect_on_death = self.read_u8()
-        c.inherit_mark = self.read_u8()
-        c.inherit_direction_fixed = self.read_u8()
-        c.inherit_flying = self.read_u8()
-        c.inherit_invincible = self.read_u8()
-        c.inherit_block = self.read_u8()
-        c.inherit_gigantic = self.read_u8()
-        c.inherit_synchronize_with_auto_scroll = self.read_u8()
-        c.inherit_line_of_sight = self.read_u8()
-        c.inherit_hp = self.read_u8()
-        c.inherit_sp = self.read_u8()
-        c.inherit_body_hit_detection_range = self.read_u8()
-        c.inherit_body_hit_power = self.read_u8()
-        c.inherit_body_hit_impact = self.read_u8()
-        c.inherit_body_hit_effect = self.read_u8()
-        c.inherit_defense = self.read_u8()
-        c.inherit_impact_resistance = self.read_u8()
-        c.inherit_stopping_ease_during_inertial_movement = self.read_u8()
-        c.inherit_action_condition = self.read_u8()
-        c.inherit_group = self.read_u8()
-        c.inherit_score = self.read_u8()
-        c.inherit_holds_item_at_same_position = self.read_u8()
-        c.inherit_action = self.read_u8()
+        self.read_record(CHARACTER_TAIL_LAYOUT, c)
         
         c.conditions = self._read_array(self._read_basic_condition)
         c.flows = self._read_array(self._read_flow)
         return c
 
     def _write_character(self, c: Character):
-        self.write_u32(c.header)
-        self.write_u8(c.inherit_palette)
-        self.write_u16(c.inherit_palette_data_number)
-        self.write_u8(c.any_of_appearance_conditions_true)
-        self.write_u8(c.appearance_condition_once_met_always_true)
-        self.write_u8(c.facing_right)
-        self.write_u8(c.number_of_doubles)
-        self.write_u16(c.appearance_position_offset_x_bl)
-        self.write_u16(c.appearance_position_offset_x_dot)
-        self.write_u16(c.appearance_position_offset_y_bl)
-        self.write_u16(c.appearance_position_offset_y_dot)
-        self.write_u8(c.appearance_position_offset_x_flip_if_facing_right)
-        self.write_u8(c.appearance_position_offset_y_flip_if_facing_right)
-        self.write_u16(c.image_number)
-        self.write_u8(c.image_type)
-        self.write_u16(c.image_offset)
-        self.write_u16(c.animation_set)
-        self.write_u8(c.z_coordinate)
-        self.write_u8(c.transparency)
-        self.write_u16(c.initial_character_effect)
-        self.write_u8(c.initial_character_effect_execution_type)
-        self.write_u8(c.initial_character_effect_loop_execution)
-        self.write_u16(c.character_effect_on_death)
-        self.write_u8(c.character_effect_on_death_execution_type)
-        self.write_u8(c.mark_display)
-        self.write_u16(c.mark_number)
-        self.write_u16(c.operation)
-        self.write_u8(c.faction)
-        self.write_u8(c.character_id)
-        self.write_u8(c.flying)
-        self.write_u8(c.direction_fixed)
-        self.write_u8(c.invincible)
-        self.write_u8(c.invincible_effect)
-        self.write_u8(c.block)
-        self.write_u8(c.gigantic)
-        self.write_u8(c.synchronize_with_auto_scroll)
-        self.write_u8(c.line_of_sight)
-        self.write_u8(c.line_of_sight_range)
-        self.write_u32(c.hp)
-        self.write_u32(c.sp)
-        self.write_u16(c.stopping_ease_during_inertial_movement)
-        self.write_u8(c.body_hit_detection_range)
-        self.write_u32(c.body_hit_power)
-        self.write_u8(c.body_hit_impact)
-        self.write_u16(c.body_hit_effect)
-        self.write_u32(c.defense)
-        self.write_u8(c.impact_resistance)
-        self.write_u32(c.score)
-        self.write_u8(c.holds_item_at_same_position)
-        self.write_u8(c.has_group)
-        self.write_u16(c.group_number)
-        self.write_u8(c.action_condition_range)
-        self.write_u8(c.action_condition_judgment_type)
+        self.write_record(CHARACTER_HEAD_LAYOUT, c)
 
         self.write_u32(1) # c.strings_count
         self.write_std_string(c.character_name)
 
-        self.write_u16(c.position_x)
-        self.write_u16(c.position_y)
-        self.write_s32(c.some_count)
-        self.write_u32(c.inherited_data_count)
-        self.write_u8(c.inherit_character_name)
-        self.write_u8(c.inherit_operation)
-        self.write_u8(c.inherit_faction)
-        self.write_u8(c.inherit_character_id)
-        self.write_u8(c.inherit_appearance_condition)
-        self.write_u8(c.inherit_facing_right)
-        self.write_u8(c.inherit_number_of_doubles)
-        self.write_u8(c.inherit_initial_position_offset_x)
-        self.write_u8(c.inherit_initial_position_offset_y)
-        self.write_u8(c.inherit_image)
-        self.write_u8(c.inherit_animation_set)
-        self.write_u8(c.inherit_z_coordinate)
-        self.write_u8(c.inherit_transparency)
-        self.write_u8(c.inherit_initial_character_effect)
-        self.write_u8(c.inherit_character_effect_on_death)
-        self.write_u8(c.inherit_mark)
-        self.write_u8(c.inherit_direction_fixed)
-        self.write_u8(c.inherit_flying)
-        self.write_u8(c.inherit_invincible)
-        self.write_u8(c.inherit_block)
-        self.write_u8(c.inherit_gigantic)
-        self.write_u8(c.inherit_synchronize_with_auto_scroll)
-        self.write_u8(c.inherit_line_of_sight)
-        self.write_u8(c.inherit_hp)
-        self.write_u8(c.inherit_sp)
-        self.write_u8(c.inherit_body_hit_detection_range)
-        self.write_u8(c.inherit_body_hit_power)
-        self.write_u8(c.inherit_body_hit_impact)
-        self.write_u8(c.inherit_body_hit_effect)
-        self.write_u8(c.inherit_defense)
-        self.write_u8(c.inherit_impact_resistance)
-        self.write_u8(c.inherit_stopping_ease_during_inertial_movement)
-        self.write_u8(c.inherit_action_condition)
-        self.write_u8(c.inherit_group)
-        self.write_u8(c.inherit_score)
-        self.write_u8(c.inherit_holds_item_at_same_position)
-        self.write_u8(c.inherit_action)
+        self.write_record(CHARACTER_TAIL_LAYOUT, c)
         
         self._write_array([BasicCondition(**i) for i in c.conditions], self._write_basic_condition)
         self._write_array([Flow(**i) for i in c.flows], self._write_flow)
 
     def _read_item(self) -> Item:
-        i = Item()
-        i.header = self.read_u32()
-        i.inherit_palette = self.read_u8()
-        i.inherit_palette_data_number = self.read_u16()
-        i.any_of_appearance_conditions_true = self.read_u8()
-        i.appearance_condition_once_met_always_true = self.read_u8()
-        i.appearance_position_offset_x_dot = self.read_u16()
-        i.appearance_position_offset_y_dot = self.read_u16()
-        i.image_number = self.read_u16()
-        i.image_type = self.read_u8()
-        i.frame = self.read_u16()
-        i.z_coordinate = self.read_u8()
-        i.transparency = self.read_u8()
-        i.mark_display = self.read_u8()
-        i.mark_number = self.read_u16()
-        i.display_above_head_on_acquisition = self.read_u8()
-        i.acquisition_type = self.read_u8()
-        i.gigantic = self.read_u8()
-        i.sound_effect = self.read_u16()
+        i = self.read_record(ITEM_HEAD_LAYOUT, Item())
         
         i.item_name_length = self.read_u32()
         if i.item_name_length > 0:
-            i.item_name = self.read_std_string()
-
-        i.position_x = self.read_u16()
-        i.position_y = self.read_u16()
-        i.number_of_inherited_data = self.read_u32()
-        i.inherit_item_name = self.read_u8()
-        i.inherit_appearance_condition = self.read_u8()
-        i.inherit_initial_position_offset_x = self.read_u8()
-        i.inherit_initial_position_offset_y = self.read_u8()
-        i.inherit_image = self.read_u8()
-        i.inherit_z_coordinate = self.read_u8()
-        i.inherit_transparency = self.read_u8()
-        i.inherit_mark = self.read_u8()
-        i.inherit_gigantic = self.read_u8()
-        i.inherit_acquisition_type = self.read_u8()
-        i.inherit_display_above_head_on_acquisition = self.read_u8()
-        i.inherit_sound_effect = self.read_u8()
-        i.inherit_effect = self.read_u8()
+            i.item_name = self.read_std_string("item_name")
+
+        self.read_record(ITEM_TAIL_LAYOUT, i)
         i.conditions = self._read_array(self._read_basic_condition)
         i.item_effects = self._read_array(self._read_item_effect)
         return i
 
     def _write_item(self, i: Item):
-        self.write_u32(i.header)
-        self.write_u8(i.inherit_palette)
-        self.write_u16(i.inherit_palette_data_number)
-        self.write_u8(i.any_of_appearance_conditions_true)
-        self.write_u8(i.appearance_condition_once_met_always_true)
-        self.write_u16(i.appearance_position_offset_x_dot)
-        self.write_u16(i.appearance_position_offset_y_dot)
-        self.write_u16(i.image_number)
-        self.write_u8(i.image_type)
-        self.write_u16(i.frame)
-        self.write_u8(i.z_coordinate)
-        self.write_u8(i.transparency)
-        self.write_u8(i.mark_display)
-        self.write_u16(i.mark_number)
-        self.write_u8(i.display_above_head_on_acquisition)
-        self.write_u8(i.acquisition_type)
-        self.write_u8(i.gigantic)
-        self.write_u16(i.sound_effect)
+        self.write_record(ITEM_HEAD_LAYOUT, i)
         
         self.write_u32(1) # Item name count, must be 1
         self.write_std_string(i.item_name)
         
-        self.write_u16(i.position_x)
-        self.write_u16(i.position_y)
-        self.write_u32(i.number_of_inherited_data)
-        self.write_u8(i.inherit_item_name)
-        self.write_u8(i.inherit_appearance_condition)
-        self.write_u8(i.inherit_initial_position_offset_x)
-        self.write_u8(i.inherit_initial_position_offset_y)
-        self.write_u8(i.inherit_image)
-        self.write_u8(i.inherit_z_coordinate)
-        self.write_u8(i.inherit_transparency)
-        self.write_u8(i.inherit_mark)
-        self.write_u8(i.inherit_gigantic)
-        self.write_u8(i.inherit_acquisition_type)
-        self.write_u8(i.inherit_display_above_head_on_acquisition)
-        self.write_u8(i.inherit_sound_effect)
-        self.write_u8(i.inherit_effect)
+        self.write_record(ITEM_TAIL_LAYOUT, i)
         self._write_array([BasicCondition(**i) for i in i.conditions], self._write_basic_condition)
         self._write_array([ItemEffect(**i) for i in i.item_effects], self._write_item_effect)
 
@@ -2003,20 +2064,11 @@ class Stage(ActedBinaryFile):
         f.header = self.read_u32()
         if f.header != 10:
             raise ValueError(f"Invalid Flow header: expected 10, got {f.header}")
-        f.id = self.read_u8()
-        f.group = self.read_u8()
-        f.test_play_only = self.read_u8()
-        f.basic_condition_judgment_type = self.read_u8()
-        f.basic_condition_once_met_always_met = self.read_u8()
-        f.timing = self.read_u8()
-        f.target_character_involved_in_timing = self.read_u8()
-        f.target_number_of_character_involved_in_timing = self.read_u8()
-        f.ease_of_input_with_multiple_key_conditions = self.read_u8()
-        f.allow_continuous_execution_by_holding_key = self.read_u8()
+        self.read_record(FLOW_LAYOUT, f)
         
         f.memo_count = self.read_u32()
         # if f.memo_count > 0:
-        f.memo = self.read_std_string()
+        f.memo = self.read_std_string("memo")
 
         f.conditions = self._read_array(self._read_basic_condition)
         f.key_conditions = self._read_array(self._read_key_condition)
@@ -2025,16 +2077,7 @@ class Stage(ActedBinaryFile):
 
     def _write_flow(self, f: Flow):
         self.write_u32(f.header or 10)
-        self.write_u8(f.id)
-        self.write_u8(f.group)
-        self.write_u8(f.test_play_only)
-        self.write_u8(f.basic_condition_judgment_type)
-        self.write_u8(f.basic_condition_once_met_always_met)
-        self.write_u8(f.timing)
-        self.write_u8(f.target_character_involved_in_timing)
-        self.write_u8(f.target_number_of_character_involved_in_timing)
-        self.write_u8(f.ease_of_input_with_multiple_key_conditions)
-        self.write_u8(f.allow_continuous_execution_by_holding_key)
+        self.write_record(FLOW_LAYOUT, f)
         
         self.write_u32(1)
         self.write_std_string(f.memo)
@@ -2044,70 +2087,47 @@ class Stage(ActedBinaryFile):
         self._write_array([Command(**i) for i in f.commands], self._write_command)
 
     def _read_key_condition(self) -> KeyCondition:
-        kc = KeyCondition()
-        kc.header = self.read_u32()
-        kc.right_and_left_to_front_and_back = self.read_u8()
-        kc.minimum_input_time = self.read_u16()
-        kc.maximum_input_time = self.read_u16()
-        kc.input_time_1_to_infinity = self.read_u8()
-        kc.judgment_type = self.read_u8()
-        kc.unknown = self.read_u32()
-        kc.number_of_key_data = self.read_u32()
-        kc.direction_key_neutral = self.read_u8()
-        kc.left_key = self.read_u8()
-        kc.right_key = self.read_u8()
-        kc.up_key = self.read_u8()
-        kc.down_key = self.read_u8()
-        kc.up_left_key = self.read_u8()
-        kc.down_left_key = self.read_u8()
-        kc.up_right_key = self.read_u8()
-        kc.down_right_key = self.read_u8()
-        kc.any_direction_key = self.read_u8()
-        kc.action_key_neutral = self.read_u8()
-        kc.z_key = self.read_u8()
-        kc.x_key = self.read_u8()
-        kc.c_key = self.read_u8()
-        kc.v_key = self.read_u8()
-        kc.a_key = self.read_u8()
-        kc.s_key = self.read_u8()
-        kc.d_key = self.read_u8()
-        kc.f_key = self.read_u8()
-        return kc
+        return self.read_record(KEY_CONDITION_LAYOUT, KeyCondition())
     
     def _write_key_condition(self, kc: KeyCondition):
-        self.write_u32(kc.header)
-        self.write_u8(kc.right_and_left_to_front_and_back)
-        self.write_u16(kc.minimum_input_time)
-        self.write_u16(kc.maximum_input_time)
-        self.write_u8(kc.input_time_1_to_infinity)
-        self.write_u8(kc.judgment_type)
-        self.write_u32(kc.unknown)
-        self.write_u32(kc.number_of_key_data)
-        self.write_u8(kc.direction_key_neutral)
-        self.write_u8(kc.left_key)
-        self.write_u8(kc.right_key)
-        self.write_u8(kc.up_key)
-        self.write_u8(kc.down_key)
-        self.write_u8(kc.up_left_key)
-        self.write_u8(kc.down_left_key)
-        self.write_u8(kc.up_right_key)
-        self.write_u8(kc.down_right_key)
-        self.write_u8(kc.any_direction_key)
-        self.write_u8(kc.action_key_neutral)
-        self.write_u8(kc.z_key)
-        self.write_u8(kc.x_key)
-        self.write_u8(kc.c_key)
-        self.write_u8(kc.v_key)
-        self.write_u8(kc.a_key)
-        self.write_u8(kc.s_key)
-        self.write_u8(kc.d_key)
-        self.write_u8(kc.f_key)
+        self.write_record(KEY_CONDITION_LAYOUT, kc)
+
+    def _read_shared(self, reader: Callable[[], Any], kind: str) -> Any:
+        """
+        Reads a palette entry or placed object, returning the instance already read for the same bytes if any.
+        A repeat is skipped without parsing, unless string spans are recorded: every occurrence needs its own.
+        """
+        shared = self._shared[kind]
+        start = self._position
+        if self.string_spans is None:
+            found = shared.match(self._data, start)
+            if found is not None:
+                self._position += found[1]
+                return found[0]
+        obj = reader()
+        return shared.add(bytes(self._data[start:self._position]), obj)
+
+    def _write_shared(self, body: dict, kind: str, cls: type, writer: Callable[[Any], None]):
+        """
+        Writes a placed object, expanding a {"$palette": index} reference to that palette entry.
+        The bytes of a palette entry are only serialized once, then copied.
+        """
+        if PALETTE_REF not in body:
+            writer(cls(**body))
+            return
+        key = (kind, body[PALETTE_REF])
+        if key not in self._written:
+            start = self._position
+            writer(cls(**self.data.palette[kind][key[1]]))
+            self._written[key] = bytes(self._data[start:self._position])
+        else:
+            self.write_bytes(self._written[key])
 
     def _read_stage_palette(self) -> StagePalette:
         p = StagePalette()
-        p.blocks = self._read_array(self._read_block)
-        p.characters = self._read_array(self._read_character)
-        p.items = self._read_array(self._read_item)
+        p.blocks = self._read_array(lambda: self._read_shared(self._read_block, "blocks"))
+        p.characters = self._read_array(lambda: self._read_shared(self._read_character, "characters"))
+        p.items = self._read_array(lambda: self._read_shared(self._read_item, "items"))
         return p
 
     def _write_stage_palette(self, p: StagePalette):
@@ -2118,75 +2138,49 @@ class Stage(ActedBinaryFile):
     def _read_stage_block(self) -> StageBlock:
         sb = StageBlock()
         sb.position = self.read_u32()
-        sb.block = self._read_block()
+        sb.block = self._read_shared(self._read_block, "blocks")
         return sb
 
     def _write_stage_block(self, sb: StageBlock):
         self.write_u32(sb.position)
-        self._write_block(Block(**sb.block))
+        self._write_shared(sb.block, "blocks", Block, self._write_block)
 
     def _read_stage_character(self) -> StageCharacter:
         sc = StageCharacter()
         sc.position = self.read_u32()
-        sc.character = self._read_character()
+        sc.character = self._read_shared(self._read_character, "characters")
         return sc
 
     def _write_stage_character(self, sc: StageCharacter):
         self.write_u32(sc.position)
-        self._write_character(Character(**sc.character))
+        self._write_shared(sc.character, "characters", Character, self._write_character)
 
     def _read_stage_item(self) -> StageItem:
         si = StageItem()
         si.position = self.read_u32()
-        si.item = self._read_item()
+        si.item = self._read_shared(self._read_item, "items")
         return si
     
     def _write_stage_item(self, si: StageItem):
         self.write_u32(si.position)
-        self._write_item(Item(**si.item))
+        self._write_shared(si.item, "items", Item, self._write_item)
 
     def _read_background(self) -> Background:
-        b = Background()
-        b.start = self.read_u32()
-        b.display_from_start = self.read_u32()
-        b.specified_by_color = self.read_u32()
-        b.color_number = self.read_u32()
-        b.display_in_front_of_character = self.read_u32()
-        b.horizontal_scroll_speed = self.read_f64()
-        b.vertical_scroll_speed = self.read_f64()
-        b.horizontal_auto_scroll = self.read_u32()
-        b.vertical_auto_scroll = self.read_u32()
-        b.horizontal_auto_scroll_speed = self.read_f64()
-        b.vertical_auto_scroll_speed = self.read_f64()
-        b.bytes61_80 = self.read_bytes(20)
-        b.image_path = self.read_std_string()
+        b = self.read_record(BACKGROUND_LAYOUT, Background())
+        b.image_path = self.read_std_string("image_path")
         return b
 
     def _write_background(self, b: Background):
-        self.write_u32(b.start)
-        self.write_u32(b.display_from_start)
-        self.write_u32(b.specified_by_color)
-        self.write_u32(b.color_number)
-        self.write_u32(b.display_in_front_of_character)
-        self.write_f64(b.horizontal_scroll_speed)
-        self.write_f64(b.vertical_scroll_speed)
-        self.write_u32(b.horizontal_auto_scroll)
-        self.write_u32(b.vertical_auto_scroll)
-        self.write_f64(b.horizontal_auto_scroll_speed)
-        self.write_f64(b.vertical_auto_scroll_speed)
-        self.write_bytes(b.bytes61_80)
+        self.write_record(BACKGROUND_LAYOUT, b)
         self.write_std_string(b.image_path)
 
     def _read_stage_var(self) -> StageVar:
-        sv = StageVar()
-        sv.unk = self.read_u32()
-        sv.count = self.read_u32()
-        sv.var_name = self.read_std_string()
+        sv = self.read_record(STAGE_VAR_LAYOUT, StageVar())
+        sv.var_name = self.read_std_string("var_name")
         return sv
 
     def _write_stage_var(self, sv: StageVar):
-        self.write_u32(sv.unk)
-        self.write_u32(sv.count)
+        self.write_record(STAGE_VAR_LAYOUT, sv)
         self.write_std_string(sv.var_name)
     # endregion
 
@@ -2198,55 +2192,11 @@ class Stage(ActedBinaryFile):
             raise ValueError(f"Invalid Command header: expected 8, got {cmd.header}")
         cmd.unk1 = self.read_u8()
         cmd.type = self.read_u8()
-        
-        # Dispatch to the correct details reader based on type
-        reader_map = {
-            1: self._read_wait_details,
-            2: self._read_linear_movement_details,
-            3: self._read_generic_movement_details, # GroundMovement
-            4: self._read_generic_movement_details, # CircularMovement
-            5: self._read_generic_movement_details, # ChargeMovement
-            6: self._read_generic_movement_details, # GuidedMovement
-            7: self._read_generic_movement_details, # ScreenOutsideAvoidanceMovement
-            8: self._read_generic_movement_details, # MovementInvalidation
-            9: self._read_direction_change_details,
-            10: self._read_jump_details,
-            11: self._read_shot_details,
-            12: self._read_sword_details,
-            13: self._read_block_summon_details, # BlockSummon
-            14: self._read_chara_summon_details, # CharacterSummon
-            15: self._read_item_summon_details, # ItemSummon
-            16: self._read_flow_operation_details,
-            17: self._read_stage_clear_details,
-            18: self._read_game_wait_details,
-            19: self._read_message_details,
-            20: self._read_warp_details,
-            21: self._read_target_setting_details,
-            22: self._read_status_operation_details,
-            23: self._read_status_operation2_details,
-            24: self._read_disappearance_details,
-            25: self._read_item_acquisition_details,
-            26: self._read_graphic_change_details,
-            27: self._read_basic_animation_set_change_details,
-            28: self._read_animation_execution_details,
-            29: self._read_effect_execution_details,
-            30: self._read_character_effect_execution_details,
-            31: self._read_screen_effect_execution_details,
-            32: self._read_picture_display_details,
-            33: self._read_screen_color_change_details,
-            34: self._read_background_change_details,
-            35: self._read_sound_effect_playback_details,
-            36: self._read_bgm_playback_details,
-            37: self._read_code_execution_details,
-            38: self._read_arrangement_details,
-            39: self._read_loop_details,
-        }
-        reader_func = reader_map.get(cmd.type)
-        if reader_func:
-            cmd.details = reader_func()
-        else:
+
+        codec = self.COMMAND_CODECS.get(cmd.type)
+        if codec is None:
             raise ValueError(f"Unknown command type: {cmd.type}")
-            
+        cmd.details = codec[1](self)
         return cmd
 
     def _write_command(self, cmd: Command):
@@ -2254,78 +2204,14 @@ class Stage(ActedBinaryFile):
         self.write_u8(cmd.unk1)
         self.write_u8(cmd.type)
 
-        writer_map = {
-            1: self._write_wait_details,
-            2: self._write_linear_movement_details,
-            3: self._write_generic_movement_details,
-            4: self._write_generic_movement_details,
-            5: self._write_generic_movement_details,
-            6: self._write_generic_movement_details,
-            7: self._write_generic_movement_details,
-            8: self._write_generic_movement_details,
-            9: self._write_direction_change_details,
-            10: self._write_jump_details,
-            11: self._write_shot_details,
-            12: self._write_sword_details,
-            13: self._write_summon_details,
-            14: self._write_summon_details,
-            15: self._write_item_summon_details,
-            16: self._write_flow_operation_details,
-            17: self._write_stage_clear_details,
-            18: self._write_game_wait_details,
-            19: self._write_message_details,
-            20: self._write_warp_details,
-            21: self._write_target_setting_details,
-            22: self._write_status_operation_details,
-            23: self._write_status_operation2_details,
-            24: self._write_disappearance_details,
-            25: self._write_item_acquisition_details,
-            26: self._write_graphic_change_details,
-            27: self._write_basic_animation_set_change_details,
-            28: self._write_animation_execution_details,
-            29: self._write_effect_execution_details,
-            30: self._write_character_effect_execution_details,
-            31: self._write_screen_effect_execution_details,
-            32: self._write_picture_display_details,
-            33: self._write_screen_color_change_details,
-            34: self._write_background_change_details,
-            35: self._write_sound_effect_playback_details,
-            36: self._write_bgm_playback_details,
-            37: self._write_code_execution_details,
-            38: self._write_arrangement_details,
-            39: self._write_loop_details,
-        }
-
-        command_details_map = {
-            1: WaitDetails, 2: LinearMovementDetails, 3: GenericMovementDetails,
-            4: GenericMovementDetails, 5: GenericMovementDetails, 6: GenericMovementDetails,
-            7: GenericMovementDetails, 8: GenericMovementDetails, 9: DirectionChangeDetails,
-            10: JumpDetails, 11: ShotDetails, 12: SwordDetails, 13: SummonDetails,
-            14: SummonDetails, 15: ItemSummonDetails, 16: FlowOperationDetails,
-            17: StageClearDetails, 18: GameWaitDetails, 19: MessageDetails,
-            20: WarpDetails, 21: TargetSettingDetails, 22: StatusOperationDetails,
-            23: StatusOperation2Details, 24: DisappearanceDetails, 25: ItemAcquisitionDetails,
-            26: GraphicChangeDetails, 27: BasicAnimationSetChangeDetails,
-            28: AnimationExecutionDetails, 29: EffectExecutionDetails,
-            30: CharacterEffectExecutionDetails, 31: ScreenEffectExecutionDetails,
-            32: PictureDisplayDetails, 33: ScreenColorChangeDetails,
-            34: BackgroundChangeDetails, 35: SoundEffectPlaybackDetails,
-            36: BGMPlaybackDetails, 37: CodeExecutionDetails, 38: ArrangementDetails,
-            39: LoopDetails
-        }
-        
-        writer_func = writer_map.get(cmd.type)
-        details_class = command_details_map.get(cmd.type)
-        if writer_func and details_class:
-            details_data = cmd.details
-            if isinstance(details_data, dict):
-                details_obj = details_class(**details_data)
-            else:
-                details_obj = details_data
-            
-            writer_func(details_obj)
-        else:
+        codec = self.COMMAND_CODECS.get(cmd.type)
+        if codec is None:
             raise ValueError(f"Unknown command type to write: {cmd.type}")
+        details_class, _, writer_func = codec
+        details = cmd.details
+        if isinstance(details, dict):
+            details = details_class(**details)
+        writer_func(self, details)
 
     def _read_item_effect(self) -> ItemEffect:
         effect = ItemEffect()
@@ -2335,37 +2221,10 @@ class Stage(ActedBinaryFile):
         effect.unk1 = self.read_s8()
         effect.type = self.read_u8()
 
-        reader_map = {
-            1: self._read_flow_change_details,
-            2: self._read_stage_clear_details,
-            3: self._read_game_wait_details,
-            4: self._read_message_details,
-            5: self._read_warp_details,
-            7: self._read_status_operation_details,
-            8: self._read_status_operation2_details,
-            9: self._read_disappearance_details,
-            10: self._read_item_acquisition_details,
-            11: self._read_graphic_change_details,
-            12: self._read_basic_animation_set_change_details,
-            13: self._read_animation_execution_details,
-            14: self._read_effect_execution_details,
-            15: self._read_character_effect_execution_details,
-            16: self._read_screen_effect_execution_details,
-            17: self._read_picture_display_details,
-            18: self._read_screen_color_change_details,
-            19: self._read_background_change_details,
-            20: self._read_sound_effect_playback_details,
-            21: self._read_bgm_playback_details,
-            22: self._read_code_execution_details,
-            23: self._read_arrangement_details,
-            24: self._read_loop_details,
-        }
-        reader_func = reader_map.get(effect.type)
-        if reader_func:
-            effect.details = reader_func()
-        else:
+        codec = self.ITEM_EFFECT_CODECS.get(effect.type)
+        if codec is None:
             raise ValueError(f"Unknown item effect type: {effect.type}")
-
+        effect.details = codec[1](self)
         return effect
 
     def _write_item_effect(self, effect: ItemEffect):
@@ -2373,436 +2232,80 @@ class Stage(ActedBinaryFile):
         self.write_s8(effect.unk1)
         self.write_u8(effect.type)
 
-        writer_map = {
-            1: self._write_flow_change_details,
-            2: self._write_stage_clear_details,
-            3: self._write_game_wait_details,
-            4: self._write_message_details,
-            5: self._write_warp_details,
-            7: self._write_status_operation_details,
-            8: self._write_status_operation2_details,
-            9: self._write_disappearance_details,
-            10: self._write_item_acquisition_details,
-            11: self._write_graphic_change_details,
-            12: self._write_basic_animation_set_change_details,
-            13: self._write_animation_execution_details,
-            14: self._write_effect_execution_details,
-            15: self._write_character_effect_execution_details,
-            16: self._write_screen_effect_execution_details,
-            17: self._write_picture_display_details,
-            18: self._write_screen_color_change_details,
-            19: self._write_background_change_details,
-            20: self._write_sound_effect_playback_details,
-            21: self._write_bgm_playback_details,
-            22: self._write_code_execution_details,
-            23: self._write_arrangement_details,
-            24: self._write_loop_details,
-        }
-
-        item_effect_details_map = {
-            1: FlowChangeDetails, 2: StageClearDetails, 3: GameWaitDetails,
-            4: MessageDetails, 5: WarpDetails, 7: StatusOperationDetails,
-            8: StatusOperation2Details, 9: DisappearanceDetails, 10: ItemAcquisitionDetails,
-            11: GraphicChangeDetails, 12: BasicAnimationSetChangeDetails,
-            13: AnimationExecutionDetails, 14: EffectExecutionDetails,
-            15: CharacterEffectExecutionDetails, 16: ScreenEffectExecutionDetails,
-            17: PictureDisplayDetails, 18: ScreenColorChangeDetails,
-            19: BackgroundChangeDetails, 20: SoundEffectPlaybackDetails,
-            21: BGMPlaybackDetails, 22: CodeExecutionDetails, 23: ArrangementDetails,
-            24: LoopDetails
-        }
-            
-        writer_func = writer_map.get(effect.type)
-        details_class = item_effect_details_map.get(effect.type)
-
-        if writer_func and details_class:
-            details_data = effect.details
-            if isinstance(details_data, dict):
-                details_obj = details_class(**details_data)
-            else:
-                details_obj = details_data
-
-            writer_func(details_obj)
-        else:
+        codec = self.ITEM_EFFECT_CODECS.get(effect.type)
+        if codec is None:
             raise ValueError(f"Unknown item effect type to write: {effect.type}")
-
-    # The implementation for each _read_*_details and _write_*_details follows
-    # Due to the large number and repetitive nature, they are defined below.
-    # Note: I've created methods for each specific detail type for clarity.
+        details_class, _, writer_func = codec
+        details = effect.details
+        if isinstance(details, dict):
+            details = details_class(**details)
+        writer_func(self, details)
 
     def _read_flow_change_details(self) -> FlowChangeDetails:
         d = FlowChangeDetails()
         d.bytes1_30 = self.read_bytes(30)
         d.flows = self._read_array(self._read_flow)
-        d.bytes69_72 = self.read_bytes(4)
-        d.operation = self.read_u32()
-        d.bytes77_80 = self.read_bytes(4)
+        self.read_record(FLOW_CHANGE_DETAILS_LAYOUT, d)
         return d
 
     def _write_flow_change_details(self, d: FlowChangeDetails):
         self.write_bytes(d.bytes1_30)
         self._write_array([Flow(**i) for i in d.flows], self._write_flow)
-        self.write_bytes(d.bytes69_72)
-        self.write_u32(d.operation)
-        self.write_bytes(d.bytes77_80)
+        self.write_record(FLOW_CHANGE_DETAILS_LAYOUT, d)
 
     def _read_stage_clear_details(self) -> StageClearDetails:
         d = StageClearDetails()
         d.bytes1_14 = self.read_bytes(14)
-        d.path = self.read_std_string()
-        d.bytes19_38 = self.read_bytes(20)
-        d.stage_transition = self.read_u32()
-        d.number = self.read_u32()
-        d.change_world_map_position = self.read_u32()
-        d.world_map_position_x = self.read_u32()
-        d.world_map_position_y = self.read_u32()
-        d.change_initial_position = self.read_u32()
-        d.initial_position_x = self.read_u32()
-        d.initial_position_y = self.read_u32()
-        d.initial_position_main_character_direction = self.read_u32()
-        d.execute_autosave = self.read_u32()
-        d.add_clear_text_to_replay = self.read_u32()
+        d.path = self.read_std_string("path")
+        self.read_record(STAGE_CLEAR_DETAILS_LAYOUT, d)
         return d
     
     def _write_stage_clear_details(self, d: StageClearDetails):
         self.write_bytes(d.bytes1_14)
         self.write_std_string(d.path)
-        self.write_bytes(d.bytes19_38)
-        self.write_u32(d.stage_transition)
-        self.write_u32(d.number)
-        self.write_u32(d.change_world_map_position)
-        self.write_u32(d.world_map_position_x)
-        self.write_u32(d.world_map_position_y)
-        self.write_u32(d.change_initial_position)
-        self.write_u32(d.initial_position_x)
-        self.write_u32(d.initial_position_y)
-        self.write_u32(d.initial_position_main_character_direction)
-        self.write_u32(d.execute_autosave)
-        self.write_u32(d.add_clear_text_to_replay)
+        self.write_record(STAGE_CLEAR_DETAILS_LAYOUT, d)
 
     def _read_game_wait_details(self) -> GameWaitDetails:
-        d = GameWaitDetails()
-        d.execution_time = self.read_u16()
-        d.execution_time_double = self.read_u16()
-        d.parallel_execution = self.read_u8()
-        d.bytes6_38 = self.read_bytes(33)
-        d.game_wait_execution_time = self.read_u32()
-        return d
+        return self.read_record(GAME_WAIT_DETAILS_LAYOUT, GameWaitDetails())
 
     def _write_game_wait_details(self, d: GameWaitDetails):
-        self.write_u16(d.execution_time)
-        self.write_u16(d.execution_time_double)
-        self.write_u8(d.parallel_execution)
-        self.write_bytes(d.bytes6_38)
-        self.write_u32(d.game_wait_execution_time)
+        self.write_record(GAME_WAIT_DETAILS_LAYOUT, d)
 
     def _read_message_details(self) -> MessageDetails:
         d = MessageDetails()
         d.bytes1_14 = self.read_bytes(14)
-        d.message = self.read_std_string()
-        d.bytes19_38 = self.read_bytes(20)
-        d.display_position_specification_method = self.read_u32()
-        d.coordinate_x = self.read_u32()
-        d.coordinate_y = self.read_u32()
-        d.display_position_offset_x = self.read_u32()
-        d.display_position_offset_y = self.read_u32()
-        d.auto_adjust_to_not_go_off_screen = self.read_u32()
-        d.display_time_specification_method = self.read_u32()
-        d.display_time = self.read_u32()
-        d.pause = self.read_u32()
-        d.display_variables = self.read_u32()
-        d.follow_screen = self.read_u32()
-        d.auto_update = self.read_u32()
-        d.message_id_present = self.read_u32()
-        d.message_id = self.read_u32()
-        d.window_display = self.read_u32()
-        d.message_clear = self.read_u32()
-        d.update_interval = self.read_u32()
-        d.instant_display = self.read_u32()
-        d.coordinate_unit = self.read_u32()
-        d.set_options = self.read_u32()
-        d.assign_return_value_to_flow_variable = self.read_u32()
+        d.message = self.read_std_string("message")
+        self.read_record(MESSAGE_DETAILS_LAYOUT, d)
         return d
     
     def _write_message_details(self, d: MessageDetails):
         self.write_bytes(d.bytes1_14)
         self.write_std_string(d.message)
-        self.write_bytes(d.bytes19_38)
-        self.write_u32(d.display_position_specification_method)
-        self.write_u32(d.coordinate_x)
-        self.write_u32(d.coordinate_y)
-        self.write_u32(d.display_position_offset_x)
-        self.write_u32(d.display_position_offset_y)
-        self.write_u32(d.auto_adjust_to_not_go_off_screen)
-        self.write_u32(d.display_time_specification_method)
-        self.write_u32(d.display_time)
-        self.write_u32(d.pause)
-        self.write_u32(d.display_variables)
-        self.write_u32(d.follow_screen)
-        self.write_u32(d.auto_update)
-        self.write_u32(d.message_id_present)
-        self.write_u32(d.message_id)
-        self.write_u32(d.window_display)
-        self.write_u32(d.message_clear)
-        self.write_u32(d.update_interval)
-        self.write_u32(d.instant_display)
-        self.write_u32(d.coordinate_unit)
-        self.write_u32(d.set_options)
-        self.write_u32(d.assign_return_value_to_flow_variable)
+        self.write_record(MESSAGE_DETAILS_LAYOUT, d)
 
     def _read_wait_details(self) -> WaitDetails:
-        d = WaitDetails()
-        d.execution_time = self.read_u16()
-        d.execution_time_double = self.read_u16()
-        d.parallel_execution = self.read_u8()
-        d.bytes = self.read_bytes(33)
-        return d
+        return self.read_record(WAIT_DETAILS_LAYOUT, WaitDetails())
     
     def _write_wait_details(self, d: WaitDetails):
-        self.write_u16(d.execution_time)
-        self.write_u16(d.execution_time_double)
-        self.write_u8(d.parallel_execution)
-        self.write_bytes(d.bytes)
+        self.write_record(WAIT_DETAILS_LAYOUT, d)
 
     def _read_linear_movement_details(self) -> LinearMovementDetails:
-        d = LinearMovementDetails()
-        d.execution_time = self.read_u16()
-        d.execution_time_double = self.read_u16()
-        d.parallel_execution = self.read_u8()
-        d.bytes6_8 = self.read_bytes(3)
-        d.animation_and_other_type = self.read_u16()
-        d.bytes11_26 = self.read_bytes(16)
-        d.movement_direction_setting_type = self.read_u8()
-        d.movement_direction_direction = self.read_u8()
-        d.movement_direction_angle = self.read_u16()
-        d.movement_direction_angle_double = self.read_u16()
-        d.movement_direction_angle_reverse_rotation_if_facing_right = self.read_u8()
-        d.movement_direction_target_x_present = self.read_u8()
-        d.movement_direction_target_y_present = self.read_u8()
-        d.movement_direction_target_x = self.read_u16()
-        d.movement_direction_target_y = self.read_u16()
-        d.movement_direction_target_x_dot = self.read_u16()
-        d.movement_direction_target_y_dot = self.read_u16()
-        d.movement_direction_target_type = self.read_u8()
-        d.movement_direction_target_coordinate_unit = self.read_u8()
-        d.byte46 = self.read_bytes(1)
-        d.movement_direction_execute_until_target_coordinate_reached = self.read_u8()
-        d.movement_direction_invalidate_horizontal_movement = self.read_u8()
-        d.movement_direction_invalidate_vertical_movement = self.read_u8()
-        d.movement_direction_target_x_flip_if_facing_right = self.read_u8()
-        d.movement_direction_target_y_flip_if_facing_right = self.read_u8()
-        d.movement_direction_reverse_speed_if_direction_changes = self.read_u8()
-        d.movement_direction_prevent_blur = self.read_u8()
-        d.movement_direction_dont_change_character_direction = self.read_u8()
-        d.time_speed_distance_setting_type = self.read_u8()
-        d.time_speed_distance_speed = self.read_u16()
-        d.time_speed_distance_speed_double = self.read_u16()
-        d.time_speed_distance_distance = self.read_u16()
-        d.time_speed_distance_distance_double = self.read_u16()
-        d.time_speed_distance_distance_unit = self.read_u8()
-        d.bytes65_68 = self.read_bytes(4)
-        d.inertia_present = self.read_u8()
-        d.inertia_max_speed = self.read_u16()
-        d.inertia_speed_correction_on_direction_change = self.read_f64()
-        d.animation_type = self.read_u8()
-        d.bytes81_101 = self.read_bytes(21)
-        return d
+        return self.read_record(LINEAR_MOVEMENT_DETAILS_LAYOUT, LinearMovementDetails())
     
     def _write_linear_movement_details(self, d: LinearMovementDetails):
-        self.write_u16(d.execution_time)
-        self.write_u16(d.execution_time_double)
-        self.write_u8(d.parallel_execution)
-        self.write_bytes(d.bytes6_8)
-        self.write_u16(d.animation_and_other_type)
-        self.write_bytes(d.bytes11_26)
-        self.write_u8(d.movement_direction_setting_type)
-        self.write_u8(d.movement_direction_direction)
-        self.write_u16(d.movement_direction_angle)
-        self.write_u16(d.movement_direction_angle_double)
-        self.write_u8(d.movement_direction_angle_reverse_rotation_if_facing_right)
-        self.write_u8(d.movement_direction_target_x_present)
-        self.write_u8(d.movement_direction_target_y_present)
-        self.write_u16(d.movement_direction_target_x)
-        self.write_u16(d.movement_direction_target_y)
-        self.write_u16(d.movement_direction_target_x_dot)
-        self.write_u16(d.movement_direction_target_y_dot)
-        self.write_u8(d.movement_direction_target_type)
-        self.write_u8(d.movement_direction_target_coordinate_unit)
-        self.write_bytes(d.byte46)
-        self.write_u8(d.movement_direction_execute_until_target_coordinate_reached)
-        self.write_u8(d.movement_direction_invalidate_horizontal_movement)
-        self.write_u8(d.movement_direction_invalidate_vertical_movement)
-        self.write_u8(d.movement_direction_target_x_flip_if_facing_right)
-        self.write_u8(d.movement_direction_target_y_flip_if_facing_right)
-        self.write_u8(d.movement_direction_reverse_speed_if_direction_changes)
-        self.write_u8(d.movement_direction_prevent_blur)
-        self.write_u8(d.movement_direction_dont_change_character_direction)
-        self.write_u8(d.time_speed_distance_setting_type)
-        self.write_u16(d.time_speed_distance_speed)
-        self.write_u16(d.time_speed_distance_speed_double)
-        self.write_u16(d.time_speed_distance_distance)
-        self.write_u16(d.time_speed_distance_distance_double)
-        self.write_u8(d.time_speed_distance_distance_unit)
-        self.write_bytes(d.bytes65_68)
-        self.write_u8(d.inertia_present)
-        self.write_u16(d.inertia_max_speed)
-        self.write_f64(d.inertia_speed_correction_on_direction_change)
-        self.write_u8(d.animation_type)
-        self.write_bytes(d.bytes81_101)
+        self.write_record(LINEAR_MOVEMENT_DETAILS_LAYOUT, d)
     
     def _read_generic_movement_details(self) -> GenericMovementDetails:
-        d = GenericMovementDetails()
-        d.execution_time = self.read_u16()
-        d.execution_time_double = self.read_u16()
-        d.parallel_execution = self.read_u8()
-        d.bytes6_101 = self.read_bytes(96)
-        return d
+        return self.read_record(GENERIC_MOVEMENT_DETAILS_LAYOUT, GenericMovementDetails())
         
     def _write_generic_movement_details(self, d: GenericMovementDetails):
-        self.write_u16(d.execution_time)
-        self.write_u16(d.execution_time_double)
-        self.write_u8(d.parallel_execution)
-        self.write_bytes(d.bytes6_101)
+        self.write_record(GENERIC_MOVEMENT_DETAILS_LAYOUT, d)
 
     def _read_shot_details(self) -> ShotDetails:
-        d = ShotDetails()
-        d.execution_time = self.read_u16()
-        d.execution_time_double = self.read_u16()
-        d.parallel_execution = self.read_u8()
-        d.sound_effect = self.read_u16()
-        d.play_if_outside_screen = self.read_u8()
-        d.animation = self.read_u16()
-        d.bytes11_30 = self.read_bytes(20)
-        d.number_of_shots_fired = self.read_u8()
-        d.formation = self.read_u8()
-        d.firing_parameter1 = self.read_u16()
-        d.firing_parameter2 = self.read_u16()
-        d.firing_parameter3 = self.read_u16()
-        d.target = self.read_u8()
-        d.direction = self.read_u8()
-        d.set_angle_to_target = self.read_u8()
-        d.firing_target = self.read_u8()
-        d.angle_offset = self.read_u16()
-        d.angle_offset_double = self.read_u16()
-        d.angle_offset_reverse_rotation_if_facing_right = self.read_u8()
-        d.angle_dispersion = self.read_u16()
-        d.change_firing_position_according_to_angle = self.read_u8()
-        d.number_of_doubles = self.read_u8()
-        d.firing_position_offset_x = self.read_u16()
-        d.firing_position_offset_x_double = self.read_u16()
-        d.firing_position_offset_y = self.read_u16()
-        d.firing_position_offset_y_double = self.read_u16()
-        d.firing_position_offset_x_flip_if_facing_right = self.read_u8()
-        d.firing_position_offset_y_flip_if_facing_right = self.read_u8()
-        d.graphic = self.read_u16()
-        d.z_coordinate = self.read_u8()
-        d.transparency = self.read_u8()
-        d.faction_same_as_user = self.read_u8()
-        d.faction = self.read_u16()
-        d.gigantic = self.read_u16()
-        d.movement_type = self.read_u8()
-        d.movement_type_parameter1 = self.read_u16()
-        d.movement_type_parameter2 = self.read_u16()
-        d.movement_type_parameter3 = self.read_u16()
-        d.movement_target = self.read_u8()
-        d.synchronize_with_auto_scroll = self.read_u8()
-        d.speed = self.read_u16()
-        d.speed_double = self.read_u16()
-        d.acceleration_enabled = self.read_u8()
-        d.acceleration = self.read_u16()
-        d.acceleration_double = self.read_u16()
-        d.flight_distance = self.read_u16()
-        d.flight_distance_valid = self.read_u8()
-        d.flight_distance_double = self.read_u16()
-        d.flight_distance_does_not_disappear_at_end = self.read_u8()
-        d.disappearance_time_valid = self.read_u8()
-        d.disappearance_time = self.read_u16()
-        d.disappearance_time_double = self.read_u16()
-        d.penetrate_blocks = self.read_u8()
-        d.penetrate_actors = self.read_u8()
-        d.penetrate_block_actors = self.read_u8()
-        d.disappear_on_hitting_shot = self.read_u8()
-        d.value_for_disappearing_on_hitting_shot = self.read_u8()
-        d.power = self.read_u32()
-        d.bytes109_110 = self.read_bytes(2)
-        d.impact = self.read_u8()
-        d.effect = self.read_u16()
-        d.acquired_item_palette_type = self.read_u8()
-        d.acquired_item_palette_number = self.read_u16()
-        d.bytes117_125 = self.read_bytes(9)
-        d.attack = self.read_u8()
-        d.attack_id = self.read_u8()
-        d.bytes128_143 = self.read_bytes(16)
-        return d
+        return self.read_record(SHOT_DETAILS_LAYOUT, ShotDetails())
     
     def _write_shot_details(self, d: ShotDetails):
-        self.write_u16(d.execution_time)
-        self.write_u16(d.execution_time_double)
-        self.write_u8(d.parallel_execution)
-        self.write_u16(d.sound_effect)
-        self.write_u8(d.play_if_outside_screen)
-        self.write_u16(d.animation)
-        self.write_bytes(d.bytes11_30)
-        self.write_u8(d.number_of_shots_fired)
-        self.write_u8(d.formation)
-        self.write_u16(d.firing_parameter1)
-        self.write_u16(d.firing_parameter2)
-        self.write_u16(d.firing_parameter3)
-        self.write_u8(d.target)
-        self.write_u8(d.direction)
-        self.write_u8(d.set_angle_to_target)
-        self.write_u8(d.firing_target)
-        self.write_u16(d.angle_offset)
-        self.write_u16(d.angle_offset_double)
-        self.write_u8(d.angle_offset_reverse_rotation_if_facing_right)
-        self.write_u16(d.angle_dispersion)
-        self.write_u8(d.change_firing_position_according_to_angle)
-        self.write_u8(d.number_of_doubles)
-        self.write_u16(d.firing_position_offset_x)
-        self.write_u16(d.firing_position_offset_x_double)
-        self.write_u16(d.firing_position_offset_y)
-        self.write_u16(d.firing_position_offset_y_double)
-        self.write_u8(d.firing_position_offset_x_flip_if_facing_right)
-        self.write_u8(d.firing_position_offset_y_flip_if_facing_right)
-        self.write_u16(d.graphic)
-        self.write_u8(d.z_coordinate)
-        self.write_u8(d.transparency)
-        self.write_u8(d.faction_same_as_user)
-        self.write_u16(d.faction)
-        self.write_u16(d.gigantic)
-        self.write_u8(d.movement_type)
-        self.write_u16(d.movement_type_parameter1)
-        self.write_u16(d.movement_type_parameter2)
-        self.write_u16(d.movement_type_parameter3)
-        self.write_u8(d.movement_target)
-        self.write_u8(d.synchronize_with_auto_scroll)
-        self.write_u16(d.speed)
-        self.write_u16(d.speed_double)
-        self.write_u8(d.acceleration_enabled)
-        self.write_u16(d.acceleration)
-        self.write_u16(d.acceleration_double)
-        self.write_u16(d.flight_distance)
-        self.write_u8(d.flight_distance_valid)
-        self.write_u16(d.flight_distance_double)
-        self.write_u8(d.flight_distance_does_not_disappear_at_end)
-        self.write_u8(d.disappearance_time_valid)
-        self.write_u16(d.disappearance_time)
-        self.write_u16(d.disappearance_time_double)
-        self.write_u8(d.penetrate_blocks)
-        self.write_u8(d.penetrate_actors)
-        self.write_u8(d.penetrate_block_actors)
-        self.write_u8(d.disappear_on_hitting_shot)
-        self.write_u8(d.value_for_disappearing_on_hitting_shot)
-        self.write_u32(d.power)
-        self.write_bytes(d.bytes109_110)
-        self.write_u8(d.impact)
-        self.write_u16(d.effect)
-        self.write_u8(d.acquired_item_palette_type)
-        self.write_u16(d.acquired_item_palette_number)
-        self.write_bytes(d.bytes117_125)
-        self.write_u8(d.attack)
-        self.write_u8(d.attack_id)
-        self.write_bytes(d.bytes128_143)
+        self.write_record(SHOT_DETAILS_LAYOUT, d)
 
     def _read_block_summon_details(self) -> SummonDetails:
         return self._read_summon_details()
@@ -2811,689 +2314,364 @@ class Stage(ActedBinaryFile):
         return self._read_summon_details()
     
     def _read_item_summon_details(self) -> ItemSummonDetails:
-        d = ItemSummonDetails()
-        d.execution_time = self.read_u16()
-        d.execution_time_double = self.read_u16()
-        d.parallel_execution = self.read_u8()
-        d.sound_effect = self.read_u16()
-        d.play_sound_effect_if_outside_screen = self.read_u8()
-        d.animation = self.read_u8()
-        d.bytes10_30 = self.read_bytes(21)
-        d.count = self.read_u8()
-        d.formation = self.read_u8()
-        d.interval = self.read_u16()
-        d.number_of_columns = self.read_u16()
-        d.column_interval = self.read_u16()
-        d.target = self.read_u8()
-        d.direction = self.read_u8()
-        d.byte41 = self.read_u8()
-        d.target2 = self.read_u8()
-        d.bytes43_51 = self.read_bytes(9)
-        d.summon_position_offset_x = self.read_u32()
-        d.summon_position_offset_y = self.read_u32()
-        d.summon_position_offset_x_flip = self.read_u8()
-        d.summon_position_offset_y_flip = self.read_u8()
-        d.bytes62_66 = self.read_bytes(5)
-        d.faction = self.read_u8()
-        d.bytes68_88 = self.read_bytes(21)
-        d.existence_time = self.read_u16()
-        d.existence_time_present = self.read_u8()
-        d.bytes92_119 = self.read_bytes(28)
-        d.palette_type = self.read_u8()
-        d.palette_data_number = self.read_u16()
-        d.faction_specification_method = self.read_u8()
-        d.set_acquired_score_to_0 = self.read_u8()
-        d.direction_flip = self.read_u8()
-        d.attack = self.read_u8()
-        d.attack_flow = self.read_u8()
-        d.bytes128_143 = self.read_bytes(16)
-        return d
+        return self.read_record(ITEM_SUMMON_DETAILS_LAYOUT, ItemSummonDetails())
 
     def _read_summon_details(self) -> SummonDetails:
-        d = SummonDetails()
-        d.execution_time = self.read_u16()
-        d.execution_time_double = self.read_u16()
-        d.parallel_execution = self.read_u8()
-        d.sound_effect = self.read_u16()
-        d.play_sound_effect_if_outside_screen = self.read_u8()
-        d.animation = self.read_u8()
-        d.bytes10_30 = self.read_bytes(21)
-        d.count = self.read_u8()
-        d.formation = self.read_u8()
-        d.interval = self.read_u16()
-        d.number_of_columns = self.read_u16()
-        d.column_interval = self.read_u16()
-        d.target = self.read_u8()
-        d.direction = self.read_u8()
-        d.byte41 = self.read_u8()
-        d.target2 = self.read_u8()
-        d.bytes43_51 = self.read_bytes(9)
-        d.summon_position_offset_x = self.read_u32()
-        d.summon_position_offset_y = self.read_u32()
-        d.summon_position_offset_x_flip = self.read_u8()
-        d.summon_position_offset_y_flip = self.read_u8()
-        d.bytes62_66 = self.read_bytes(5)
-        d.faction = self.read_u8()
-        d.bytes68_88 = self.read_bytes(21)
-        d.existence_time = self.read_u16()
-        d.existence_time_present = self.read_u8()
-        d.bytes92_119 = self.read_bytes(28)
-        d.palette_type = self.read_u8()
-        d.palette_data_number = self.read_u16()
-        d.faction_specification_method = self.read_u8()
-        d.set_acquired_score_to_0 = self.read_u8()
-        d.direction_flip = self.read_u8()
-        d.attack = self.read_u8()
-        d.attack_flow = self.read_u8()
-        d.bytes128_143 = self.read_bytes(16)
-        d.return_value_to_flow_variable = self.read_u8()
-        d.bytes145_147 = self.read_bytes(3)
-        return d
+        return self.read_record(SUMMON_DETAILS_LAYOUT, SummonDetails())
     
     def _write_item_summon_details(self, d: ItemSummonDetails):
-        self.write_u16(d.execution_time)
-        self.write_u16(d.execution_time_double)
-        self.write_u8(d.parallel_execution)
-        self.write_u16(d.sound_effect)
-        self.write_u8(d.play_sound_effect_if_outside_screen)
-        self.write_u8(d.animation)
-        self.write_bytes(d.bytes10_30)
-        self.write_u8(d.count)
-        self.write_u8(d.formation)
-        self.write_u16(d.interval)
-        self.write_u16(d.number_of_columns)
-        self.write_u16(d.column_interval)
-        self.write_u8(d.target)
-        self.write_u8(d.direction)
-        self.write_u8(d.byte41)
-        self.write_u8(d.target2)
-        self.write_bytes(d.bytes43_51)
-        self.write_u32(d.summon_position_offset_x)
-        self.write_u32(d.summon_position_offset_y)
-        self.write_u8(d.summon_position_offset_x_flip)
-        self.write_u8(d.summon_position_offset_y_flip)
-        self.write_bytes(d.bytes62_66)
-        self.write_u8(d.faction)
-        self.write_bytes(d.bytes68_88)
-        self.write_u16(d.existence_time)
-        self.write_u8(d.existence_time_present)
-        self.write_bytes(d.bytes92_119)
-        self.write_u8(d.palette_type)
-        self.write_u16(d.palette_data_number)
-        self.write_u8(d.faction_specification_method)
-        self.write_u8(d.set_acquired_score_to_0)
-        self.write_u8(d.direction_flip)
-        self.write_u8(d.attack)
-        self.write_u8(d.attack_flow)
-        self.write_bytes(d.bytes128_143)
+        self.write_record(ITEM_SUMMON_DETAILS_LAYOUT, d)
     
     def _write_summon_details(self, d: SummonDetails):
-        self.write_u16(d.execution_time)
-        self.write_u16(d.execution_time_double)
-        self.write_u8(d.parallel_execution)
-        self.write_u16(d.sound_effect)
-        self.write_u8(d.play_sound_effect_if_outside_screen)
-        self.write_u8(d.animation)
-        self.write_bytes(d.bytes10_30)
-        self.write_u8(d.count)
-        self.write_u8(d.formation)
-        self.write_u16(d.interval)
-        self.write_u16(d.number_of_columns)
-        self.write_u16(d.column_interval)
-        self.write_u8(d.target)
-        self.write_u8(d.direction)
-        self.write_u8(d.byte41)
-        self.write_u8(d.target2)
-        self.write_bytes(d.bytes43_51)
-        self.write_u32(d.summon_position_offset_x)
-        self.write_u32(d.summon_position_offset_y)
-        self.write_u8(d.summon_position_offset_x_flip)
-        self.write_u8(d.summon_position_offset_y_flip)
-        self.write_bytes(d.bytes62_66)
-        self.write_u8(d.faction)
-        self.write_bytes(d.bytes68_88)
-        self.write_u16(d.existence_time)
-        self.write_u8(d.existence_time_present)
-        self.write_bytes(d.bytes92_119)
-        self.write_u8(d.palette_type)
-        self.write_u16(d.palette_data_number)
-        self.write_u8(d.faction_specification_method)
-        self.write_u8(d.set_acquired_score_to_0)
-        self.write_u8(d.direction_flip)
-        self.write_u8(d.attack)
-        self.write_u8(d.attack_flow)
-        self.write_bytes(d.bytes128_143)
-        self.write_u8(d.return_value_to_flow_variable)
-        self.write_bytes(d.bytes145_147)
+        self.write_record(SUMMON_DETAILS_LAYOUT, d)
 
     # ... and so on for every single details structure ...
     # To save space and keep this response manageable, I'll implement a few more key ones
     # and you can extrapolate the pattern for the rest, as it's a direct translation.
     
     def _read_sword_details(self) -> SwordDetails:
-        d = SwordDetails()
-        d.execution_time = self.read_u32()
-        d.parallel_execution = self.read_u8()
-        d.sound_effect = self.read_u16()
-        d.play_if_outside_screen = self.read_u8()
-        d.animation = self.read_u16()
-        d.bytes11_63 = self.read_bytes(53)
-        d.z_coordinate = self.read_u8()
-        d.transparency = self.read_u8()
-        d.faction_same_as_user = self.read_u8()
-        d.faction = self.read_u16()
-        d.gigantic = self.read_u16()
-        d.sword_type = self.read_u32()
-        d.bytes75_104 = self.read_bytes(30)
-        d.power = self.read_u32()
-        d.bytes109_110 = self.read_bytes(2)
-        d.impact = self.read_u8()
-        d.effect = self.read_u16()
-        d.acquired_item_palette_type = self.read_u8()
-        d.acquired_item_palette_number = self.read_u16()
-        d.bytes117_125 = self.read_bytes(9)
-        d.attack = self.read_u8()
-        d.attack_id = self.read_u8()
-        d.bytes128_143 = self.read_bytes(16)
-        return d
+        return self.read_record(SWORD_DETAILS_LAYOUT, SwordDetails())
     
     def _write_sword_details(self, d: SwordDetails):
-        self.write_u32(d.execution_time)
-        self.write_u8(d.parallel_execution)
-        self.write_u16(d.sound_effect)
-        self.write_u8(d.play_if_outside_screen)
-        self.write_u16(d.animation)
-        self.write_bytes(d.bytes11_63)
-        self.write_u8(d.z_coordinate)
-        self.write_u8(d.transparency)
-        self.write_u8(d.faction_same_as_user)
-        self.write_u16(d.faction)
-        self.write_u16(d.gigantic)
-        self.write_u32(d.sword_type)
-        self.write_bytes(d.bytes75_104)
-        self.write_u32(d.power)
-        self.write_bytes(d.bytes109_110)
-        self.write_u8(d.impact)
-        self.write_u16(d.effect)
-        self.write_u8(d.acquired_item_palette_type)
-        self.write_u16(d.acquired_item_palette_number)
-        self.write_bytes(d.bytes117_125)
-        self.write_u8(d.attack)
-        self.write_u8(d.attack_id)
-        self.write_bytes(d.bytes128_143)
+        self.write_record(SWORD_DETAILS_LAYOUT, d)
 
     def _read_code_execution_details(self) -> CodeExecutionDetails:
-        d = CodeExecutionDetails()
-        d.execution_time = self.read_u16()
-        d.execution_time_double = self.read_u16()
-        d.parallel_execution = self.read_u8()
-        d.bytes6_14 = self.read_bytes(9)
-        d.code = self.read_std_string()
+        d = self.read_record(CODE_EXECUTION_DETAILS_LAYOUT, CodeExecutionDetails())
+        d.code = self.read_std_string("code")
         d.bytes19_38 = self.read_bytes(20)
         return d
 
     def _write_code_execution_details(self, d: CodeExecutionDetails):
-        self.write_u16(d.execution_time)
-        self.write_u16(d.execution_time_double)
-        self.write_u8(d.parallel_execution)
-        self.write_bytes(d.bytes6_14)
+        self.write_record(CODE_EXECUTION_DETAILS_LAYOUT, d)
         self.write_std_string(d.code)
         self.write_bytes(d.bytes19_38)
 
     def _read_warp_details(self) -> WarpDetails:
-        d = WarpDetails()
-        d.bytes1_26 = self.read_bytes(26)
-        d.setting_type = self.read_u8()
-        d.direction = self.read_u8()
-        d.bytes29_33 = self.read_bytes(5)
-        d.target_x_present = self.read_u8()
-        d.target_y_present = self.read_u8()
-        d.target_x_bl = self.read_u16()
-        d.target_y_bl = self.read_u16()
-        d.target_x_dot = self.read_u16()
-        d.target_y_dot = self.read_u16()
-        d.target_type = self.read_u8()
-        d.target_unit = self.read_u8()
-        d.gigantic_character_coordinate_position = self.read_u8()
-        d.bytes47_49 = self.read_bytes(3)
-        d.target_x_flip_if_facing_right = self.read_u8()
-        d.target_y_flip_if_facing_right = self.read_u8()
-        d.bytes52_59 = self.read_bytes(8)
-        d.distance = self.read_u16()
-        d.distance_double = self.read_u16()
-        d.bytes64_101 = self.read_bytes(38)
-        d.assign_return_value_to_flow = self.read_u32()
-        return d
+        return self.read_record(WARP_DETAILS_LAYOUT, WarpDetails())
 
     def _write_warp_details(self, d: WarpDetails):
-        self.write_bytes(d.bytes1_26)
-        self.write_u8(d.setting_type)
-        self.write_u8(d.direction)
-        self.write_bytes(d.bytes29_33)
-        self.write_u8(d.target_x_present)
-        self.write_u8(d.target_y_present)
-        self.write_u16(d.target_x_bl)
-        self.write_u16(d.target_y_bl)
-        self.write_u16(d.target_x_dot)
-        self.write_u16(d.target_y_dot)
-        self.write_u8(d.target_type)
-        self.write_u8(d.target_unit)
-        self.write_u8(d.gigantic_character_coordinate_position)
-        self.write_bytes(d.bytes47_49)
-        self.write_u8(d.target_x_flip_if_facing_right)
-        self.write_u8(d.target_y_flip_if_facing_right)
-        self.write_bytes(d.bytes52_59)
-        self.write_u16(d.distance)
-        self.write_u16(d.distance_double)
-        self.write_bytes(d.bytes64_101)
-        self.write_u32(d.assign_return_value_to_flow)
+        self.write_record(WARP_DETAILS_LAYOUT, d)
 
     def _read_status_operation_details(self) -> StatusOperationDetails:
-        d = StatusOperationDetails()
-        d.bytes1_38 = self.read_bytes(38)
-        d.operation_target_type = self.read_u8()
-        d.bytes40_43 = self.read_bytes(4)
-        d.operation_target_variable_type = self.read_u8()
-        d.bytes45_46 = self.read_bytes(2)
-        d.operation_target_variable_number = self.read_u16()
-        d.bytes49_52 = self.read_bytes(4)
-        d.operation_target_target = self.read_u8()
-        d.bytes54_56 = self.read_bytes(3)
-        d.operation_target_status = self.read_u8()
-        d.byte58 = self.read_bytes(1)
-        d.operation_target_flow_variable_number = self.read_u8()
-        d.bytes60_62 = self.read_bytes(3)
-        d.operator_type = self.read_u8()
-        d.bytes64_66 = self.read_bytes(3)
-        d.calculation_content_type = self.read_u32()
-        d.calculation_content_constant = self.read_u32()
-        d.calculation_content_random_lower_limit = self.read_u32()
-        d.calculation_content_random_upper_limit = self.read_u32()
-        d.calculation_content_variable_type = self.read_u32()
-        d.calculation_content_variable_number = self.read_u32()
-        d.calculation_content_target = self.read_u32()
-        d.calculation_content_status = self.read_u32()
-        d.calculation_content_flow_variable_number = self.read_u32()
-        d.bytes103_138 = self.read_bytes(36)
-        return d
+        return self.read_record(STATUS_OPERATION_DETAILS_LAYOUT, StatusOperationDetails())
 
     def _write_status_operation_details(self, d: StatusOperationDetails):
-        self.write_bytes(d.bytes1_38)
-        self.write_u8(d.operation_target_type)
-        self.write_bytes(d.bytes40_43)
-        self.write_u8(d.operation_target_variable_type)
-        self.write_bytes(d.bytes45_46)
-        self.write_u16(d.operation_target_variable_number)
-        self.write_bytes(d.bytes49_52)
-        self.write_u8(d.operation_target_target)
-        self.write_bytes(d.bytes54_56)
-        self.write_u8(d.operation_target_status)
-        self.write_bytes(d.byte58)
-        self.write_u8(d.operation_target_flow_variable_number)
-        self.write_bytes(d.bytes60_62)
-        self.write_u8(d.operator_type)
-        self.write_bytes(d.bytes64_66)
-        self.write_u32(d.calculation_content_type)
-        self.write_u32(d.calculation_content_constant)
-        self.write_u32(d.calculation_content_random_lower_limit)
-        self.write_u32(d.calculation_content_random_upper_limit)
-        self.write_u32(d.calculation_content_variable_type)
-        self.write_u32(d.calculation_content_variable_number)
-        self.write_u32(d.calculation_content_target)
-        self.write_u32(d.calculation_content_status)
-        self.write_u32(d.calculation_content_flow_variable_number)
-        self.write_bytes(d.bytes103_138)
+        self.write_record(STATUS_OPERATION_DETAILS_LAYOUT, d)
 
     def _read_status_operation2_details(self) -> StatusOperation2Details:
-        d = StatusOperation2Details()
-        d.bytes1_38 = self.read_bytes(38)
-        d.target = self.read_u32()
-        d.status = self.read_u32()
-        d.on = self.read_u32()
-        d.bytes51_62 = self.read_bytes(12)
-        return d
+        return self.read_record(STATUS_OPERATION2_DETAILS_LAYOUT, StatusOperation2Details())
 
     def _write_status_operation2_details(self, d: StatusOperation2Details):
-        self.write_bytes(d.bytes1_38)
-        self.write_u32(d.target)
-        self.write_u32(d.status)
-        self.write_u32(d.on)
-        self.write_bytes(d.bytes51_62)
+        self.write_record(STATUS_OPERATION2_DETAILS_LAYOUT, d)
 
     def _read_disappearance_details(self) -> DisappearanceDetails:
-        d = DisappearanceDetails()
-        d.bytes1_38 = self.read_bytes(38)
-        d.target = self.read_u32()
-        d.faction = self.read_u32()
-        d.range = self.read_u32()
-        d.assign_return_value_to_flow_variable = self.read_u32()
-        return d
+        return self.read_record(DISAPPEARANCE_DETAILS_LAYOUT, DisappearanceDetails())
 
     def _write_disappearance_details(self, d: DisappearanceDetails):
-        self.write_bytes(d.bytes1_38)
-        self.write_u32(d.target)
-        self.write_u32(d.faction)
-        self.write_u32(d.range)
-        self.write_u32(d.assign_return_value_to_flow_variable)
+        self.write_record(DISAPPEARANCE_DETAILS_LAYOUT, d)
 
     def _read_item_acquisition_details(self) -> ItemAcquisitionDetails:
-        d = ItemAcquisitionDetails()
-        d.bytes1_38 = self.read_bytes(38)
-        d.palette_type = self.read_u32()
-        d.palette_data_number = self.read_u32()
-        return d
+        return self.read_record(ITEM_ACQUISITION_DETAILS_LAYOUT, ItemAcquisitionDetails())
 
     def _write_item_acquisition_details(self, d: ItemAcquisitionDetails):
-        self.write_bytes(d.bytes1_38)
-        self.write_u32(d.palette_type)
-        self.write_u32(d.palette_data_number)
+        self.write_record(ITEM_ACQUISITION_DETAILS_LAYOUT, d)
 
     def _read_graphic_change_details(self) -> GraphicChangeDetails:
-        d = GraphicChangeDetails()
-        d.bytes1_38 = self.read_bytes(38)
-        d.image_type = self.read_u32()
-        d.image_number = self.read_u32()
-        d.offset = self.read_u32()
-        return d
+        return self.read_record(GRAPHIC_CHANGE_DETAILS_LAYOUT, GraphicChangeDetails())
 
     def _write_graphic_change_details(self, d: GraphicChangeDetails):
-        self.write_bytes(d.bytes1_38)
-        self.write_u32(d.image_type)
-        self.write_u32(d.image_number)
-        self.write_u32(d.offset)
+        self.write_record(GRAPHIC_CHANGE_DETAILS_LAYOUT, d)
 
     def _read_basic_animation_set_change_details(self) -> BasicAnimationSetChangeDetails:
-        d = BasicAnimationSetChangeDetails()
-        d.bytes1_38 = self.read_bytes(38)
-        d.animation_set = self.read_u32()
-        return d
+        return self.read_record(BASIC_ANIMATION_SET_CHANGE_DETAILS_LAYOUT, BasicAnimationSetChangeDetails())
 
     def _write_basic_animation_set_change_details(self, d: BasicAnimationSetChangeDetails):
-        self.write_bytes(d.bytes1_38)
-        self.write_u32(d.animation_set)
+        self.write_record(BASIC_ANIMATION_SET_CHANGE_DETAILS_LAYOUT, d)
 
     def _read_animation_execution_details(self) -> AnimationExecutionDetails:
-        d = AnimationExecutionDetails()
-        d.execution_time = self.read_u16()
-        d.execution_time_double = self.read_u16()
-        d.parallel_execution = self.read_u8()
-        d.bytes = self.read_bytes(41)
-        return d
+        return self.read_record(ANIMATION_EXECUTION_DETAILS_LAYOUT, AnimationExecutionDetails())
 
     def _write_animation_execution_details(self, d: AnimationExecutionDetails):
-        self.write_u16(d.execution_time)
-        self.write_u16(d.execution_time_double)
-        self.write_u8(d.parallel_execution)
-        self.write_bytes(d.bytes)
+        self.write_record(ANIMATION_EXECUTION_DETAILS_LAYOUT, d)
 
     def _read_effect_execution_details(self) -> EffectExecutionDetails:
-        d = EffectExecutionDetails()
-        d.bytes1_38 = self.read_bytes(38)
-        d.bytes = self.read_bytes(40)
-        return d
+        return self.read_record(EFFECT_EXECUTION_DETAILS_LAYOUT, EffectExecutionDetails())
 
     def _write_effect_execution_details(self, d: EffectExecutionDetails):
-        self.write_bytes(d.bytes1_38)
-        self.write_bytes(d.bytes)
+        self.write_record(EFFECT_EXECUTION_DETAILS_LAYOUT, d)
 
     def _read_character_effect_execution_details(self) -> CharacterEffectExecutionDetails:
-        d = CharacterEffectExecutionDetails()
-        d.bytes1_38 = self.read_bytes(38)
-        d.effect = self.read_u32()
-        d.execution_type = self.read_u32()
-        d.loop_execution = self.read_u32()
-        return d
+        return self.read_record(CHARACTER_EFFECT_EXECUTION_DETAILS_LAYOUT, CharacterEffectExecutionDetails())
 
     def _write_character_effect_execution_details(self, d: CharacterEffectExecutionDetails):
-        self.write_bytes(d.bytes1_38)
-        self.write_u32(d.effect)
-        self.write_u32(d.execution_type)
-        self.write_u32(d.loop_execution)
+        self.write_record(CHARACTER_EFFECT_EXECUTION_DETAILS_LAYOUT, d)
 
     def _read_screen_effect_execution_details(self) -> ScreenEffectExecutionDetails:
-        d = ScreenEffectExecutionDetails()
-        d.bytes1_38 = self.read_bytes(38)
-        d.effect = self.read_u32()
-        d.execution_type = self.read_u32()
-        d.loop_execution = self.read_u32()
-        return d
+        return self.read_record(SCREEN_EFFECT_EXECUTION_DETAILS_LAYOUT, ScreenEffectExecutionDetails())
 
     def _write_screen_effect_execution_details(self, d: ScreenEffectExecutionDetails):
-        self.write_bytes(d.bytes1_38)
-        self.write_u32(d.effect)
-        self.write_u32(d.execution_type)
-        self.write_u32(d.loop_execution)
+        self.write_record(SCREEN_EFFECT_EXECUTION_DETAILS_LAYOUT, d)
 
     def _read_picture_display_details(self) -> PictureDisplayDetails:
-        d = PictureDisplayDetails()
-        d.execution_time = self.read_u16()
-        d.execution_time_double = self.read_u16()
-        d.parallel_execution = self.read_u8()
-        d.bytes = self.read_bytes(113)
-        return d
+        return self.read_record(PICTURE_DISPLAY_DETAILS_LAYOUT, PictureDisplayDetails())
 
     def _write_picture_display_details(self, d: PictureDisplayDetails):
-        self.write_u16(d.execution_time)
-        self.write_u16(d.execution_time_double)
-        self.write_u8(d.parallel_execution)
-        self.write_bytes(d.bytes)
+        self.write_record(PICTURE_DISPLAY_DETAILS_LAYOUT, d)
 
     def _read_screen_color_change_details(self) -> ScreenColorChangeDetails:
-        d = ScreenColorChangeDetails()
-        d.bytes1_38 = self.read_bytes(38)
-        d.r = self.read_u32()
-        d.g = self.read_u32()
-        d.b = self.read_u32()
-        d.percent = self.read_u32()
-        d.restore_to_original_color = self.read_u32()
-        d.time_required_for_change = self.read_u32()
-        d.instant_display = self.read_u32()
-        d.instant_display_count = self.read_u32()
-        return d
+        return self.read_record(SCREEN_COLOR_CHANGE_DETAILS_LAYOUT, ScreenColorChangeDetails())
 
     def _write_screen_color_change_details(self, d: ScreenColorChangeDetails):
-        self.write_bytes(d.bytes1_38)
-        self.write_u32(d.r)
-        self.write_u32(d.g)
-        self.write_u32(d.b)
-        self.write_u32(d.percent)
-        self.write_u32(d.restore_to_original_color)
-        self.write_u32(d.time_required_for_change)
-        self.write_u32(d.instant_display)
-        self.write_u32(d.instant_display_count)
+        self.write_record(SCREEN_COLOR_CHANGE_DETAILS_LAYOUT, d)
 
     def _read_background_change_details(self) -> BackgroundChangeDetails:
-        d = BackgroundChangeDetails()
-        d.execution_time = self.read_u16()
-        d.execution_time_double = self.read_u16()
-        d.parallel_execution = self.read_u8()
-        d.bytes = self.read_bytes(41)
-        return d
+        return self.read_record(BACKGROUND_CHANGE_DETAILS_LAYOUT, BackgroundChangeDetails())
 
     def _write_background_change_details(self, d: BackgroundChangeDetails):
-        self.write_u16(d.execution_time)
-        self.write_u16(d.execution_time_double)
-        self.write_u8(d.parallel_execution)
-        self.write_bytes(d.bytes)
+        self.write_record(BACKGROUND_CHANGE_DETAILS_LAYOUT, d)
 
     def _read_sound_effect_playback_details(self) -> SoundEffectPlaybackDetails:
-        d = SoundEffectPlaybackDetails()
-        d.bytes1_7 = self.read_bytes(7)
-        d.play_if_outside_screen = self.read_u8()
-        d.bytes9_38 = self.read_bytes(30)
-        d.sound_effect = self.read_u32()
-        return d
+        return self.read_record(SOUND_EFFECT_PLAYBACK_DETAILS_LAYOUT, SoundEffectPlaybackDetails())
 
     def _write_sound_effect_playback_details(self, d: SoundEffectPlaybackDetails):
-        self.write_bytes(d.bytes1_7)
-        self.write_u8(d.play_if_outside_screen)
-        self.write_bytes(d.bytes9_38)
-        self.write_u32(d.sound_effect)
+        self.write_record(SOUND_EFFECT_PLAYBACK_DETAILS_LAYOUT, d)
 
     def _read_bgm_playback_details(self) -> BGMPlaybackDetails:
-        d = BGMPlaybackDetails()
-        d.execution_time = self.read_u16()
-        d.execution_time_double = self.read_u16()
-        d.parallel_execution = self.read_u8()
-        d.bytes = self.read_bytes(41)
-        return d
+        return self.read_record(BGM_PLAYBACK_DETAILS_LAYOUT, BGMPlaybackDetails())
 
     def _write_bgm_playback_details(self, d: BGMPlaybackDetails):
-        self.write_u16(d.execution_time)
-        self.write_u16(d.execution_time_double)
-        self.write_u8(d.parallel_execution)
-        self.write_bytes(d.bytes)
+        self.write_record(BGM_PLAYBACK_DETAILS_LAYOUT, d)
 
     def _read_arrangement_details(self) -> ArrangementDetails:
-        d = ArrangementDetails()
-        d.bytes1_38 = self.read_bytes(38)
-        d.command = self.read_u32()
-        d.parameter = self.read_u32()
-        d.operator_type = self.read_u32()
-        d.variable_type = self.read_u32()
-        d.variable_number = self.read_u32()
-        return d
+        return self.read_record(ARRANGEMENT_DETAILS_LAYOUT, ArrangementDetails())
 
     def _write_arrangement_details(self, d: ArrangementDetails):
-        self.write_bytes(d.bytes1_38)
-        self.write_u32(d.command)
-        self.write_u32(d.parameter)
-        self.write_u32(d.operator_type)
-        self.write_u32(d.variable_type)
-        self.write_u32(d.variable_number)
+        self.write_record(ARRANGEMENT_DETAILS_LAYOUT, d)
 
     def _read_loop_details(self) -> LoopDetails:
-        d = LoopDetails()
-        d.bytes1_38 = self.read_bytes(38)
-        d.repeat_count = self.read_u32()
-        d.command_count = self.read_u32()
-        return d
+        return self.read_record(LOOP_DETAILS_LAYOUT, LoopDetails())
 
     def _write_loop_details(self, d: LoopDetails):
-        self.write_bytes(d.bytes1_38)
-        self.write_u32(d.repeat_count)
-        self.write_u32(d.command_count)
+        self.write_record(LOOP_DETAILS_LAYOUT, d)
 
     def _read_direction_change_details(self) -> DirectionChangeDetails:
-        d = DirectionChangeDetails()
-        d.execution_time = self.read_u16()
-        d.execution_time_double = self.read_u16()
-        d.parallel_execution = self.read_u8()
-        d.bytes6_42 = self.read_bytes(37)
-        return d
+        return self.read_record(DIRECTION_CHANGE_DETAILS_LAYOUT, DirectionChangeDetails())
 
     def _write_direction_change_details(self, d: DirectionChangeDetails):
-        self.write_u16(d.execution_time)
-        self.write_u16(d.execution_time_double)
-        self.write_u8(d.parallel_execution)
-        self.write_bytes(d.bytes6_42)
+        self.write_record(DIRECTION_CHANGE_DETAILS_LAYOUT, d)
 
     def _read_jump_details(self) -> JumpDetails:
-        d = JumpDetails()
-        d.bytes1_5 = self.read_bytes(5)
-        d.sound_effect = self.read_u16()
-        d.play_if_outside_screen = self.read_u8()
-        d.animation = self.read_u16()
-        d.bytes11_38 = self.read_bytes(28)
-        d.jump_type = self.read_u32()
-        d.max_jump_inertial_movement_speed = self.read_u32()
-        d.max_jump_height = self.read_u32()
-        d.min_jump_inertial_movement_speed = self.read_u32()
-        d.min_jump_height = self.read_u32()
-        return d
+        return self.read_record(JUMP_DETAILS_LAYOUT, JumpDetails())
 
     def _write_jump_details(self, d: JumpDetails):
-        self.write_bytes(d.bytes1_5)
-        self.write_u16(d.sound_effect)
-        self.write_u8(d.play_if_outside_screen)
-        self.write_u16(d.animation)
-        self.write_bytes(d.bytes11_38)
-        self.write_u32(d.jump_type)
-        self.write_u32(d.max_jump_inertial_movement_speed)
-        self.write_u32(d.max_jump_height)
-        self.write_u32(d.min_jump_inertial_movement_speed)
-        self.write_u32(d.min_jump_height)
+        self.write_record(JUMP_DETAILS_LAYOUT, d)
 
     def _read_flow_operation_details(self) -> FlowOperationDetails:
-        d = FlowOperationDetails()
-        d.bytes1_34 = self.read_bytes(34)
-        d.condition_present = self.read_u8()
-        d.judgment_type = self.read_u8()
-        d.bytes37_40 = self.read_bytes(4)
+        d = self.read_record(FLOW_OPERATION_DETAILS_HEAD_LAYOUT, FlowOperationDetails())
         d.conditions = self._read_array(self._read_basic_condition)
-        d.bytes45_52 = self.read_bytes(8)
-        d.operation = self.read_u32()
-        d.target_flow = self.read_u32()
-        d.id = self.read_u32()
-        d.target_character = self.read_u32()
-        d.assign_return_value_to_flow_variable = self.read_u32()
+        self.read_record(FLOW_OPERATION_DETAILS_TAIL_LAYOUT, d)
         return d
 
     def _write_flow_operation_details(self, d: FlowOperationDetails):
-        self.write_bytes(d.bytes1_34)
-        self.write_u8(d.condition_present)
-        self.write_u8(d.judgment_type)
-        self.write_bytes(d.bytes37_40)
+        self.write_record(FLOW_OPERATION_DETAILS_HEAD_LAYOUT, d)
         self._write_array([BasicCondition(**i) for i in d.conditions], self._write_basic_condition)
-        self.write_bytes(d.bytes45_52)
-        self.write_u32(d.operation)
-        self.write_u32(d.target_flow)
-        self.write_u32(d.id)
-        self.write_u32(d.target_character)
-        self.write_u32(d.assign_return_value_to_flow_variable)
+        self.write_record(FLOW_OPERATION_DETAILS_TAIL_LAYOUT, d)
 
     def _read_target_setting_details(self) -> TargetSettingDetails:
-        d = TargetSettingDetails()
-        d.bytes1_38 = self.read_bytes(38)
-        d.bytes39_106 = self.read_bytes(68)
-        return d
+        return self.read_record(TARGET_SETTING_DETAILS_LAYOUT, TargetSettingDetails())
 
     def _write_target_setting_details(self, d: TargetSettingDetails):
-        self.write_bytes(d.bytes1_38)
-        self.write_bytes(d.bytes39_106)
+        self.write_record(TARGET_SETTING_DETAILS_LAYOUT, d)
+    # endregion
 
-    # NOTE: The remaining _read_*_details and _write_*_details methods would follow the same pattern
-    # of reading/writing fields for their corresponding dataclass.
-    # For brevity, they are omitted here but are required for a complete implementation.
-    # The structure has been established in the methods above.
-    
-    # Placeholder for other detail R/W
-    def __getattr__(self, name):
-        if name.startswith('_read_') and name.endswith('_details'):
-            # Generic reader for structures that are mostly bytes
-            def generic_reader():
-                # This is a fallback and might not be correct for all structures
-                print(f"Warning: Using generic reader for {name}")
-                details_cls = globals()[name[6:-8].title().replace('_','') + "Details"]
-                d = details_cls()
-                # A very basic implementation, assuming mostly byte fields
-                # This should be replaced with specific implementations
-                for fname, ftype in d.__annotations__.items():
-                    if ftype == bytes:
-                        # Guess length based on field name bytesX_Y
-                        try:
-                            parts = fname.replace('byte','').split('_')
-                            start, end = int(parts[0]), int(parts[1])
-                            setattr(d, fname, self.read_bytes(end - start + 1))
-                        except:
-                           pass # Not a byte range name
-                return d
-            return generic_reader
-        elif name.startswith('_write_') and name.endswith('_details'):
-            # Generic writer
-            def generic_writer(d):
-                print(f"Warning: Using generic writer for {name}")
-                for fname, value in d.__dict__.items():
-                    if isinstance(value, bytes): self.write_bytes(value)
-                    elif isinstance(value, int): self.write_u32(value) # Guess
-                    elif isinstance(value, str): self.write_std_string(value)
-                    # etc.
-            return generic_writer
-        raise AttributeError(f"'{type(self).__name__}' object has no attribute '{name}'")
+    # region Codec Tables
+    # Type id -> (details class, reader, writer), built once with the class
+    COMMAND_CODECS = {
+        1: (WaitDetails, _read_wait_details, _write_wait_details),
+        2: (LinearMovementDetails, _read_linear_movement_details, _write_linear_movement_details),
+        3: (GenericMovementDetails, _read_generic_movement_details, _write_generic_movement_details), # GroundMovement
+        4: (GenericMovementDetails, _read_generic_movement_details, _write_generic_movement_details), # CircularMovement
+        5: (GenericMovementDetails, _read_generic_movement_details, _write_generic_movement_details), # ChargeMovement
+        6: (GenericMovementDetails, _read_generic_movement_details, _write_generic_movement_details), # GuidedMovement
+        7: (GenericMovementDetails, _read_generic_movement_details, _write_generic_movement_details), # ScreenOutsideAvoidanceMovement
+        8: (GenericMovementDetails, _read_generic_movement_details, _write_generic_movement_details), # MovementInvalidation
+        9: (DirectionChangeDetails, _read_direction_change_details, _write_direction_change_details),
+        10: (JumpDetails, _read_jump_details, _write_jump_details),
+        11: (ShotDetails, _read_shot_details, _write_shot_details),
+        12: (SwordDetails, _read_sword_details, _write_sword_details),
+        13: (SummonDetails, _read_block_summon_details, _write_summon_details), # BlockSummon
+        14: (SummonDetails, _read_chara_summon_details, _write_summon_details), # CharacterSummon
+        15: (ItemSummonDetails, _read_item_summon_details, _write_item_summon_details), # ItemSummon
+        16: (FlowOperationDetails, _read_flow_operation_details, _write_flow_operation_details),
+        17: (StageClearDetails, _read_stage_clear_details, _write_stage_clear_details),
+        18: (GameWaitDetails, _read_game_wait_details, _write_game_wait_details),
+        19: (MessageDetails, _read_message_details, _write_message_details),
+        20: (WarpDetails, _read_warp_details, _write_warp_details),
+        21: (TargetSettingDetails, _read_target_setting_details, _write_target_setting_details),
+        22: (StatusOperationDetails, _read_status_operation_details, _write_status_operation_details),
+        23: (StatusOperation2Details, _read_status_operation2_details, _write_status_operation2_details),
+        24: (DisappearanceDetails, _read_disappearance_details, _write_disappearance_details),
+        25: (ItemAcquisitionDetails, _read_item_acquisition_details, _write_item_acquisition_details),
+        26: (GraphicChangeDetails, _read_graphic_change_details, _write_graphic_change_details),
+        27: (BasicAnimationSetChangeDetails, _read_basic_animation_set_change_details, _write_basic_animation_set_change_details),
+        28: (AnimationExecutionDetails, _read_animation_execution_details, _write_animation_execution_details),
+        29: (EffectExecutionDetails, _read_effect_execution_details, _write_effect_execution_details),
+        30: (CharacterEffectExecutionDetails, _read_character_effect_execution_details, _write_character_effect_execution_details),
+        31: (ScreenEffectExecutionDetails, _read_screen_effect_execution_details, _write_screen_effect_execution_details),
+        32: (PictureDisplayDetails, _read_picture_display_details, _write_picture_display_details),
+        33: (ScreenColorChangeDetails, _read_screen_color_change_details, _write_screen_color_change_details),
+        34: (BackgroundChangeDetails, _read_background_change_details, _write_background_change_details),
+        35: (SoundEffectPlaybackDetails, _read_sound_effect_playback_details, _write_sound_effect_playback_details),
+        36: (BGMPlaybackDetails, _read_bgm_playback_details, _write_bgm_playback_details),
+        37: (CodeExecutionDetails, _read_code_execution_details, _write_code_execution_details),
+        38: (ArrangementDetails, _read_arrangement_details, _write_arrangement_details),
+        39: (LoopDetails, _read_loop_details, _write_loop_details),
+    }
+
+    ITEM_EFFECT_CODECS = {
+        1: (FlowChangeDetails, _read_flow_change_details, _write_flow_change_details),
+        2: (StageClearDetails, _read_stage_clear_details, _write_stage_clear_details),
+        3: (GameWaitDetails, _read_game_wait_details, _write_game_wait_details),
+        4: (MessageDetails, _read_message_details, _write_message_details),
+        5: (WarpDetails, _read_warp_details, _write_warp_details),
+        7: (StatusOperationDetails, _read_status_operation_details, _write_status_operation_details),
+        8: (StatusOperation2Details, _read_status_operation2_details, _write_status_operation2_details),
+        9: (DisappearanceDetails, _read_disappearance_details, _write_disappearance_details),
+        10: (ItemAcquisitionDetails, _read_item_acquisition_details, _write_item_acquisition_details),
+        11: (GraphicChangeDetails, _read_graphic_change_details, _write_graphic_change_details),
+        12: (BasicAnimationSetChangeDetails, _read_basic_animation_set_change_details, _write_basic_animation_set_change_details),
+        13: (AnimationExecutionDetails, _read_animation_execution_details, _write_animation_execution_details),
+        14: (EffectExecutionDetails, _read_effect_execution_details, _write_effect_execution_details),
+        15: (CharacterEffectExecutionDetails, _read_character_effect_execution_details, _write_character_effect_execution_details),
+        16: (ScreenEffectExecutionDetails, _read_screen_effect_execution_details, _write_screen_effect_execution_details),
+        17: (PictureDisplayDetails, _read_picture_display_details, _write_picture_display_details),
+        18: (ScreenColorChangeDetails, _read_screen_color_change_details, _write_screen_color_change_details),
+        19: (BackgroundChangeDetails, _read_background_change_details, _write_background_change_details),
+        20: (SoundEffectPlaybackDetails, _read_sound_effect_playback_details, _write_sound_effect_playback_details),
+        21: (BGMPlaybackDetails, _read_bgm_playback_details, _write_bgm_playback_details),
+        22: (CodeExecutionDetails, _read_code_execution_details, _write_code_execution_details),
+        23: (ArrangementDetails, _read_arrangement_details, _write_arrangement_details),
+        24: (LoopDetails, _read_loop_details, _write_loop_details),
+    }
+
+    # Array section name -> (item class, reader, writer)
+    ARRAY_SECTIONS = {
+        "blocks": (StageBlock, _read_stage_block, _write_stage_block),
+        "characters": (StageCharacter, _read_stage_character, _write_stage_character),
+        "items": (StageItem, _read_stage_item, _write_stage_item),
+        "backgrounds": (Background, _read_background, _write_background),
+        "stage_vars": (StageVar, _read_stage_var, _write_stage_var),
+    }
     # endregion
 
 
 
+class StageSkimmer(Stage):
+    """
+    Walks the sections of a loaded stage with the regular readers, but steps over fixed-width records,
+    strings and byte runs instead of decoding them. Only counts and type ids are read, to find where
+    each section ends.
+    """
+    def __init__(self, stage: Stage):
+        super().__init__(stage.file_path)
+        self._data = stage._data
+        self._shared = {kind: SharedObjects() for kind in PLACED_OBJECTS}
+
+    def read_record(self, layout: RecordLayout, target: Any) -> Any:
+        self._position += layout.size
+        return target
+
+    def read_std_string(self, field: str = "") -> str:
+        length = self.read_u32()
+        if length > 1:
+            self._position += length
+        return ""
+
+    def read_bytes(self, length: int) -> bytes:
+        self._position += length
+        return b""
+
+    def skip_section(self, offset: int, name: str) -> int:
+        """Returns the offset right after the section starting at offset."""
+        self._position = offset
+        self._read_section(name)
+        return self._position
+
+class LazyStage(Stage):
+    """
+    A stage whose sections are only decoded when first accessed, with section(name).
+    parse() just checks the magic number; the start of a section is found by skimming the ones before it.
+    save() encodes the decoded sections from self.data and copies the others byte for byte.
+    """
+    def __init__(self, file_path: Union[str, Path]):
+        super().__init__(file_path)
+        self._offsets = []
+        self._decoded = set()
+
+    def parse(self) -> bool:
+        if not self.load():
+            return False
+
+        magic = self.read_u32()
+        if magic not in self.VERSIONS:
+            print(f"Invalid STG4 magic number: {magic}, expected 1020")
+            return False
+        self.data.magic = magic
+        self._shared = {kind: SharedObjects() for kind in PLACED_OBJECTS}
+        self._offsets = [self._position]
+        self._decoded = set()
+        return True
+
+    def _section_offset(self, index: int) -> int:
+        if len(self._offsets) <= index:
+            skimmer = StageSkimmer(self)
+            while len(self._offsets) <= index:
+                self._offsets.append(skimmer.skip_section(self._offsets[-1], STAGE_SECTIONS[len(self._offsets) - 1]))
+        return self._offsets[index]
+
+    def section(self, name: str) -> Any:
+        """
+        Decodes one of STAGE_SECTIONS into self.data the first time it is asked for, and returns it.
+        The header fields are attributes of self.data itself, so "header" returns self.data.
+        """
+        if name not in self._decoded:
+            index = STAGE_SECTIONS.index(name)
+            self._position = self._section_offset(index)
+            self._read_section(name)
+            self._decoded.add(name)
+            if len(self._offsets) == index + 1:
+                self._offsets.append(self._position)
+        return self.data if name == "header" else getattr(self.data, name)
+
+    def save(self) -> bool:
+        try:
+            # The loaded file stays the source of the sections never decoded, so the output is built apart
+            out = Stage(self.file_path)
+            written = stage_json(self.data, share_palette=False)
+            del written['__dataclass__']
+            out.data = StageData(**written)
+            out.start_writing(len(self._data))
+            out.write_u32(self.data.magic)
+
+            last = max((STAGE_SECTIONS.index(name) for name in self._decoded), default=-1)
+            for index in range(last + 1):
+                if STAGE_SECTIONS[index] in self._decoded:
+                    out._write_section(STAGE_SECTIONS[index])
+                else:
+                    out.write_bytes(self._data[self._offsets[index]:self._offsets[index + 1]])
+            # The sections after the last decoded one, then the end marker, are copied as they are
+            out.write_bytes(self._data[self._offsets[last + 1]:])
+
+            out.finish_writing()
+            return out.save_file()
+
+        except Exception as e:
+            import traceback
+            traceback.print_exc()
+            print(f"Error saving Stage file: {e}")
+            return False
+
+
 # --- JSON Conversion Logic ---
 
 # region Serialize
@@ -3509,8 +2687,8 @@ class DataclassJSONEncoder(json.JSONEncoder):
             d['__dataclass__'] = o.__class__.__name__
             return d
         if isinstance(o, bytes):
-            # Convert bytes to a list of integers for JSON compatibility
-            return list(o)
+            # Opaque byte ranges are stored as tagged base64 rather than a list of integers
+            return encode_blob(o)
         return super().default(o)
 
 def dataclass_json_hook(dct):
@@ -3519,8 +2697,9 @@ def dataclass_json_hook(dct):
     This version relies on json.load's natural bottom-up processing.
     """
     # First, check if the dictionary is our custom byte array representation.
-    if dct.get("$type") == "Uint8Array" and "data" in dct:
-        return bytes(dct["data"])
+    # Plain lists of integers from older exports are left as is; the writers accept them too.
+    if dct.get("$type") == "Uint8Array":
+        return decode_blob(dct)
 
     # Second, check if the dictionary represents one of our dataclasses.
     if '__dataclass__' in dct:
@@ -3549,62 +2728,300 @@ def dataclass_json_hook(dct):
     # If it's a regular dictionary with no special keys, return it.
     return dct
 
+def stage_json(data: StageData, share_palette: bool = True) -> dict:
+    """
+    Converts parsed stage data to the object DataclassJSONEncoder writes for it.
+    Objects shared since parsing are converted once, and the result reused for each of their places.
+    With share_palette, a placed object identical to a palette entry is written as {"$palette": index}.
+    """
+    converted = {}
+
+    def convert(obj):
+        if id(obj) not in converted:
+            converted[id(obj)] = asdict(obj)
+        return converted[id(obj)]
+
+    result = {}
+    for f in fields(data):
+        value = getattr(data, f.name)
+        if f.name in PLACED_OBJECTS:
+            object_field = PLACED_OBJECTS[f.name]
+            palette_ids = {}
+            if share_palette:
+                palette_ids = {id(obj): i for i, obj in enumerate(getattr(data.palette, f.name))}
+            result[f.name] = [
+                {
+                    "position": placed.position,
+                    object_field: {PALETTE_REF: palette_ids[id(obj)]} if id(obj) in palette_ids else convert(obj),
+                }
+                for placed in value for obj in [getattr(placed, object_field)]
+            ]
+        elif isinstance(value, StagePalette):
+            result[f.name] = {kind: [convert(obj) for obj in getattr(value, kind)] for kind in PLACED_OBJECTS}
+        elif is_dataclass(value):
+            result[f.name] = asdict(value)
+        elif isinstance(value, list):
+            result[f.name] = [asdict(item) if is_dataclass(item) else item for item in value]
+        else:
+            result[f.name] = value
+    result['__dataclass__'] = data.__class__.__name__
+    return result
+
 # --- Main Application Logic ---
 
-def export_to_json(in_files: List[Path]):
+def export_stage(in_file: Path, use_mmap: bool = False, share_palette: bool = True) -> bool:
+    """
+    Parses a single .stg4_1020 file and exports it to JSON next to it.
+    With share_palette, placed objects identical to a palette entry only reference it.
+    """
+    print(f"--> Exporting '{in_file}'...")
+    if not in_file.exists():
+        print(f"    ERROR: Input file not found.")
+        return False
+
+    stage = Stage(in_file)
+    stage.use_mmap = use_mmap
+    parsed = stage.parse()
+    stage.close()
+    if not parsed:
+        print(f"    ERROR: Failed to parse '{in_file}'.")
+        return False
+
+    out_file = in_file.with_suffix(in_file.suffix + '.json')
+    try:
+        with open(out_file, 'w', encoding='utf-8') as f:
+            json.dump(stage_json(stage.data, share_palette), f, cls=DataclassJSONEncoder, indent=2, ensure_ascii=False)
+        print(f"    SUCCESS: Exported to '{out_file}'")
+        return True
+    except Exception as e:
+        print(f"    ERROR: Could not write JSON file: {e}")
+        return False
+
+# Std string fields worth translating; paths, code and variable names are left out
+TEXT_FIELDS = {"stage_name", "name", "character_name", "item_name", "memo", "message"}
+STRINGS_SUFFIX = '.strings.json'
+
+def export_strings(in_file: Path, use_mmap: bool = False) -> bool:
+    """
+    Parses a single .stg4_1020 file and writes only its translatable strings to a sidecar JSON next to it.
+    Each string keeps the offset, size and original text it has in the file, so it can be patched back in place
+    once the source is checked to be unchanged; "text" is the one to translate.
+    """
+    print(f"--> Exporting strings of '{in_file}'...")
+    if not in_file.exists():
+        print(f"    ERROR: Input file not found.")
+        return False
+
+    stage = Stage(in_file)
+    stage.use_mmap = use_mmap
+    stage.string_spans = []
+    parsed = stage.parse()
+    stage.close()
+    if not parsed:
+        print(f"    ERROR: Failed to parse '{in_file}'.")
+        return False
+
+    strings = [
+        {"offset": span.offset, "size": span.size, "field": span.field, "original": span.text, "text": span.text}
+        for span in stage.string_spans if span.field in TEXT_FIELDS and span.text
+    ]
+    out_file = in_file.with_name(in_file.name + STRINGS_SUFFIX)
+    try:
+        with open(out_file, 'w', encoding='utf-8') as f:
+            json.dump({"source": in_file.name, "strings": strings}, f, indent=2, ensure_ascii=False)
+        print(f"    SUCCESS: Exported {len(strings)} strings to '{out_file}'")
+        return True
+    except Exception as e:
+        print(f"    ERROR: Could not write JSON file: {e}")
+        return False
+
+def export_to_json(in_files: List[Path], use_mmap: bool = False, jobs: int = 1, strings_only: bool = False, share_palette: bool = True):
     """
     Parses one or more .stg4_1020 files and exports them to JSON.
+    With use_mmap, each file is memory-mapped instead of read into memory.
+    With jobs > 1, files are exported in that many worker processes.
+    With strings_only, only the translatable strings are written, to sidecar files.
+    Without share_palette, placed objects are written in full even when identical to a palette entry.
     """
-    for in_file in in_files:
-        print(f"--> Exporting '{in_file}'...")
-        if not in_file.exists():
-            print(f"    ERROR: Input file not found.")
-            continue
+    export_func, extra_args = (export_strings, ()) if strings_only else (export_stage, (share_palette,))
+    results = run_jobs(export_func, [(in_file, use_mmap, *extra_args) for in_file in in_files], jobs)
+    if len(in_files) > 1:
+        print_summary("Exported", in_files, results)
 
-        stage = Stage(in_file)
-        if stage.parse():
-            out_file = in_file.with_suffix(in_file.suffix + '.json')
-            try:
-                with open(out_file, 'w', encoding='utf-8') as f:
-                    json.dump(stage.data, f, cls=DataclassJSONEncoder, indent=2, ensure_ascii=False)
-                print(f"    SUCCESS: Exported to '{out_file}'")
-            except Exception as e:
-                print(f"    ERROR: Could not write JSON file: {e}")
-        else:
-            print(f"    ERROR: Failed to parse '{in_file}'.")
+def print_stage_info(in_files: List[Path]):
+    """Prints the name and BGM number of each stage, decoding only their headers."""
+    for in_file in in_files:
+        stage = LazyStage(in_file)
+        stage.use_mmap = True
+        try:
+            if stage.parse():
+                header = stage.section("header")
+                print(f"{in_file}: {header.stage_name} (BGM {header.bgm_number})")
+            else:
+                print(f"{in_file}: ERROR: Failed to parse.")
+        except Exception as e:
+            print(f"{in_file}: ERROR: {e}")
+        finally:
+            stage.close()
+
+def translate_fields(dct: dict, translations: Dict[str, str]) -> dict:
+    """Replaces the TEXT_FIELDS values of a freshly decoded JSON object that have a translation."""
+    for key in TEXT_FIELDS.intersection(dct):
+        value = dct[key]
+        if isinstance(value, str) and value in translations:
+            dct[key] = translations[value]
+    return dct
 
-def import_from_json(in_file: Path, out_file: Path):
+def import_from_json(in_file: Path, out_file: Path, translations: Optional[Dict[str, str]] = None) -> bool:
     """
     Imports a JSON file and creates a new .stg4_1020 file.
+    With translations, text fields are translated while the JSON is decoded, so the JSON file itself is left untouched.
     """
     print(f"--> Importing '{in_file}'...")
     if not in_file.exists():
         print(f"    ERROR: Input JSON file not found.")
-        return
+        return False
 
     try:
         with open(in_file, 'r', encoding='utf-8') as f:
             # Use the object_hook to reconstruct our dataclasses from the dict
-            reconstructed_data = json.load(f, object_hook=dataclass_json_hook)
+            if translations:
+                reconstructed_data = json.load(f, object_hook=lambda dct: dataclass_json_hook(translate_fields(dct, translations)))
+            else:
+                reconstructed_data = json.load(f, object_hook=dataclass_json_hook)
 
         if not isinstance(reconstructed_data, StageData):
             print("    ERROR: JSON file does not represent valid StageData.")
-            return
+            return False
 
         new_stage = Stage(out_file)
         new_stage.data = reconstructed_data
         
         if new_stage.save():
             print(f"    SUCCESS: Imported to '{out_file}'")
-        else:
-            print(f"    ERROR: Failed to save new stage file.")
+            return True
+        print(f"    ERROR: Failed to save new stage file.")
+        return False
 
     except json.JSONDecodeError as e:
         print(f"    ERROR: Invalid JSON format in '{in_file}': {e}")
+        return False
     except Exception as e:
         import traceback
         traceback.print_exc()
         print(f"    ERROR: An unexpected error occurred during import: {e}")
+        return False
+
+def import_strings(strings_file: Path, out_file: Path) -> bool:
+    """
+    Patches the strings of a sidecar made by export_strings into a copy of its source .stg4_1020 file.
+    Every string must still read as its "original" in the source, or nothing is written. Only strings whose
+    "text" differs from it are rewritten; the rest of the file is copied byte for byte.
+    """
+    print(f"--> Importing strings from '{strings_file}'...")
+    try:
+        with open(strings_file, 'r', encoding='utf-8') as f:
+            table = json.load(f)
+
+        in_file = strings_file.parent / table["source"]
+        stage = Stage(in_file)
+        if not stage.load():
+            print(f"    ERROR: Could not read '{in_file}'.")
+            return False
+
+        replacements = {}
+        for entry in table["strings"]:
+            if "original" not in entry:
+                print(f"    ERROR: '{strings_file}' has no original texts to check '{in_file}' against; export its strings again.")
+                return False
+            span = stage.peek_std_string(entry["offset"])
+            if span.size != entry["size"] or span.text != entry["original"]:
+                print(f"    ERROR: '{in_file}' changed since its strings were exported (offset {entry['offset']}).")
+                return False
+            if entry["text"] != entry["original"]:
+                replacements[entry["offset"]] = entry["text"]
+
+        stage.patch_strings(replacements)
+        if stage.save_to(out_file):
+            print(f"    SUCCESS: Patched {len(replacements)} strings into '{out_file}'")
+            return True
+        return False
+
+    except json.JSONDecodeError as e:
+        print(f"    ERROR: Invalid JSON format in '{strings_file}': {e}")
+        return False
+    except Exception as e:
+        print(f"    ERROR: Could not patch strings: {e}")
+        return False
+
+def default_import_path(in_file: Path) -> Path:
+    """
+    Where an imported stage goes when no output is given: the same relative folder under 'update'.
+    """
+    update_dir = "update" / in_file.parent
+    update_dir.mkdir(parents=True, exist_ok=True)
+
+    out_name = in_file.name[:-5] if in_file.name.endswith('.json') else in_file.name
+    return update_dir / out_name
+
+def strings_source_path(strings_file: Path) -> Path:
+    """The .stg4_1020 file a strings sidecar was exported from."""
+    return strings_file.with_name(strings_file.name[:-len(STRINGS_SUFFIX)])
+
+def import_many(in_files: List[Path], jobs: int = 1, strings: bool = False, translations: Optional[Dict[str, str]] = None):
+    """
+    Imports several JSON files (or strings sidecars) to their default paths under 'update'.
+    With jobs > 1, files are rebuilt in that many worker processes.
+    """
+    if strings:
+        jobs_args = [(in_file, default_import_path(strings_source_path(in_file))) for in_file in in_files]
+        results = run_jobs(import_strings, jobs_args, jobs)
+    else:
+        jobs_args = [(in_file, default_import_path(in_file), translations) for in_file in in_files]
+        results = run_jobs(import_from_json, jobs_args, jobs)
+    print_summary("Imported", in_files, results)
+
+def load_translation_map(translation_file: Path) -> Dict[str, str]:
+    """
+    Reads {original: translation} pairs, either flat or from a '_translate_keys.json' in any layout.
+    Entries still marked "TODO" are dropped.
+    """
+    with open(translation_file, 'r', encoding='utf-8') as f:
+        return flat_translations(json.load(f))
+
+def patch_stage(in_file: Path, out_file: Path, translations: Dict[str, str]) -> bool:
+    """
+    Writes a copy of a .stg4_1020 file with its translatable strings replaced from translations.
+    The stage is parsed once to find the strings, then only those are spliced into the original bytes.
+    """
+    print(f"--> Patching '{in_file}'...")
+    if not in_file.exists():
+        print(f"    ERROR: Input file not found.")
+        return False
+
+    stage = Stage(in_file)
+    stage.string_spans = []
+    if not stage.parse():
+        print(f"    ERROR: Failed to parse '{in_file}'.")
+        return False
+
+    replacements = {
+        span.offset: translations[span.text]
+        for span in stage.string_spans if span.field in TEXT_FIELDS and span.text in translations
+    }
+    stage.patch_strings(replacements)
+    if stage.save_to(out_file):
+        print(f"    SUCCESS: Patched {len(replacements)} strings into '{out_file}'")
+        return True
+    return False
+
+def patch_many(in_files: List[Path], translations: Dict[str, str], jobs: int = 1):
+    """
+    Patches several .stg4_1020 files to their default paths under 'update'.
+    With jobs > 1, files are patched in that many worker processes.
+    """
+    results = run_jobs(patch_stage, [(in_file, default_import_path(in_file), translations) for in_file in in_files], jobs)
+    print_summary("Patched", in_files, results)
 
 def main():
     parser = argparse.ArgumentParser(description="Tool to export/import STG4 stage files to/from JSON.")
@@ -3612,27 +3029,66 @@ def main():
 
     # Export command
     export_parser = subparsers.add_parser('export', help="Export one or more .stg4_1020 files to JSON.")
-    export_parser.add_argument('in_files', nargs='+', type=Path, help="Path to input .stg4_1020 file(s).")
+    export_parser.add_argument('in_files', nargs='+', type=Path, help="Path to input .stg4_1020 file(s) or folder(s).")
+    export_parser.add_argument('--mmap', action='store_true', help="Memory-map the input files instead of reading them into memory.")
+    export_parser.add_argument('-j', '--jobs', type=int, default=1, help="Number of worker processes, 0 for one per CPU core (default: 1).")
+    export_parser.add_argument('--strings-only', action='store_true', help=f"Only write the translatable strings, to a '{STRINGS_SUFFIX}' sidecar per file.")
+    export_parser.add_argument('--full', action='store_true', help=f"Write placed blocks, characters and items in full, instead of as a '{PALETTE_REF}' reference to an identical palette entry.")
     
+    # Info command
+    info_parser = subparsers.add_parser('info', help="Print the name and BGM number of one or more .stg4_1020 files.")
+    info_parser.add_argument('in_files', nargs='+', type=Path, help="Path to input .stg4_1020 file(s) or folder(s).")
+
     # Import command
-    import_parser = subparsers.add_parser('import', help="Import a JSON file to a new .stg4_1020 file.")
-    import_parser.add_argument('in_file', type=Path, help="Path to the input JSON file.")
-    import_parser.add_argument('-o', '--output', type=Path, help="Path for the output .stg4_1020 file (optional).")
+    import_parser = subparsers.add_parser('import', help="Import one or more JSON files to new .stg4_1020 files.")
+    import_parser.add_argument('in_files', nargs='+', type=Path, help="Path to the input JSON file(s) or folder(s).")
+    import_parser.add_argument('-o', '--output', type=Path, help="Path for the output .stg4_1020 file (optional, single input only).")
+    import_parser.add_argument('-j', '--jobs', type=int, default=1, help="Number of worker processes, 0 for one per CPU core (default: 1).")
+    import_parser.add_argument('--strings', action='store_true', help=f"Inputs are '{STRINGS_SUFFIX}' sidecars to patch into their original .stg4_1020 files.")
+    import_parser.add_argument('-t', '--translations', type=Path, help="JSON map of original to translated strings to apply while importing, flat or in '_translate_keys.json' format.")
+
+    # Patch command
+    patch_parser = subparsers.add_parser('patch', help="Apply a translation map directly to one or more .stg4_1020 files.")
+    patch_parser.add_argument('in_files', nargs='+', type=Path, help="Path to input .stg4_1020 file(s) or folder(s).")
+    patch_parser.add_argument('-t', '--translations', type=Path, required=True, help="JSON map of original to translated strings, flat or in '_translate_keys.json' format.")
+    patch_parser.add_argument('-o', '--output', type=Path, help="Path for the output .stg4_1020 file (optional, single input only).")
+    patch_parser.add_argument('-j', '--jobs', type=int, default=1, help="Number of worker processes, 0 for one per CPU core (default: 1).")
 
     args = parser.parse_args()
 
     if args.command == 'export':
-        export_to_json(args.in_files)
+        export_to_json(expand_paths(args.in_files, '*.stg4_1020'), args.mmap, args.jobs, args.strings_only, not args.full)
+    elif args.command == 'info':
+        print_stage_info(expand_paths(args.in_files, '*.stg4_1020'))
     elif args.command == 'import':
-        out_file = args.output
-        if not out_file:
-            update_dir = "update" / args.in_file.parent 
-            update_dir.mkdir(exist_ok=True)
-            
-            out_name = args.in_file.name[:-5] if args.in_file.name.endswith('.json') else args.in_file.name
-            out_file = update_dir / out_name
-            
-        import_from_json(args.in_file, out_file)
+        if args.strings and args.translations:
+            parser.error("--translations can't be used with --strings.")
+        translations = load_translation_map(args.translations) if args.translations else None
+        if args.strings:
+            in_files = expand_paths(args.in_files, '*.stg4_1020' + STRINGS_SUFFIX)
+            import_func, source_path, extra_args = import_strings, strings_source_path, ()
+        else:
+            in_files = expand_paths(args.in_files, '*.stg4_1020.json')
+            import_func, source_path, extra_args = import_from_json, Path, (translations,)
+        if args.output:
+            if len(in_files) != 1:
+                parser.error("--output can only be used with a single input file.")
+            import_func(in_files[0], args.output, *extra_args)
+        elif len(in_files) == 1:
+            import_func(in_files[0], default_import_path(source_path(in_files[0])), *extra_args)
+        else:
+            import_many(in_files, args.jobs, args.strings, translations)
+    elif args.command == 'patch':
+        in_files = expand_paths(args.in_files, '*.stg4_1020')
+        translations = load_translation_map(args.translations)
+        if args.output:
+            if len(in_files) != 1:
+                parser.error("--output can only be used with a single input file.")
+            patch_stage(in_files[0], args.output, translations)
+        elif len(in_files) == 1:
+            patch_stage(in_files[0], default_import_path(in_files[0]), translations)
+        else:
+            patch_many(in_files, translations, args.jobs)
 
     # elif args.command == 'import':
     #     out_file = args.output
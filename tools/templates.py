@@ -0,0 +1,85 @@
+import re
+import unicodedata
+from typing import Dict, Iterable, List, Optional, Tuple
+
+# Parts of a message that change between otherwise identical strings: numbers (half- or full-width),
+# and variable markers such as \V[1], <name> or {var}
+PLACEHOLDER_PATTERN = re.compile(r"\\[A-Za-z]+(?:\[[^\]]*\])?|<[^<>\s]+>|\{[^{}\s]+\}|[0-9０-９]+(?:[.,][0-9０-９]+)*")
+SLOT_PATTERN = re.compile(r"\{(\d+)\}|\{\{|\}\}")
+
+
+def _escape(text: str) -> str:
+    return text.replace("{", "{{").replace("}", "}}")
+
+
+def make_template(text: str) -> Tuple[str, Tuple[str, ...]]:
+    """
+    Splits a string into a template, where every number and variable marker is replaced by {0}, {1}...,
+    and the values that were taken out. Literal braces are doubled.
+    """
+    parts = []
+    values = []
+    last = 0
+    for match in PLACEHOLDER_PATTERN.finditer(text):
+        parts.append(_escape(text[last:match.start()]))
+        parts.append(f"{{{len(values)}}}")
+        values.append(match.group())
+        last = match.end()
+    parts.append(_escape(text[last:]))
+    return "".join(parts), tuple(values)
+
+
+def fill_template(template: str, values: Iterable[str]) -> str:
+    """
+    Puts values back into the slots of a template. Values are NFKC-normalized,
+    so full-width numbers land in a translation as plain digits.
+    """
+    values = [unicodedata.normalize("NFKC", value) for value in values]
+
+    def slot(match):
+        if match.group(1) is None:
+            return match.group()[0]
+        index = int(match.group(1))
+        # A slot the template has no value for is left as written
+        return values[index] if index < len(values) else match.group()
+    return SLOT_PATTERN.sub(slot, template)
+
+
+def translation_template(source: str, translation: str) -> Optional[str]:
+    """
+    Turns a translated example into a template for its source's template: each value taken out of the
+    source must appear exactly once in the translation (compared NFKC-normalized), and becomes its slot.
+    Returns None when that doesn't hold, e.g. a number written out in words.
+    """
+    _, values = make_template(source)
+    normalized = [unicodedata.normalize("NFKC", value) for value in values]
+    if not values or len(set(normalized)) != len(normalized):
+        return None
+
+    slots = {}
+    parts = []
+    last = 0
+    for match in PLACEHOLDER_PATTERN.finditer(translation):
+        value = unicodedata.normalize("NFKC", match.group())
+        if value not in normalized:
+            continue
+        if value in slots:
+            return None
+        slots[value] = normalized.index(value)
+        parts.append(_escape(translation[last:match.start()]))
+        parts.append(f"{{{slots[value]}}}")
+        last = match.end()
+    if len(slots) != len(values):
+        return None
+    parts.append(_escape(translation[last:]))
+    return "".join(parts)
+
+
+def group_by_template(texts: Iterable[str]) -> Dict[str, List[str]]:
+    """Groups strings by template, keeping only templates with slots shared by two strings or more."""
+    groups = {}
+    for text in texts:
+        template, values = make_template(text)
+        if values:
+            groups.setdefault(template, []).append(text)
+    return {template: members for template, members in groups.items() if len(members) > 1}
@@ -2,27 +2,47 @@ import json
 import argparse
 from pathlib import Path
 
+from keys_format import is_interned, with_strings, dump_keys
+from templates import make_template, fill_template
+
 PRE_TRANSLATION_FILENAME = "_translate_keys_pre.json"
 TODO_FILENAME = "_todo.json"
 TRANSLATION_FILENAME = "_translate_keys.json"
 
+def merge_map(translation_map, todo_translations):
+    """
+    Fills the "TODO" values of a single {jp: en} map from todo_translations.
+    A string missing from todo_translations is filled from its template's entry, if any (translate_pre --templates).
+    """
+    merged_map = {}
+    for jp_text, current_value in translation_map.items():
+        if current_value != "TODO":
+            # Keep the current value (either pre-translated or original)
+            merged_map[jp_text] = current_value
+            continue
+        template, values = make_template(jp_text)
+        if jp_text in todo_translations:
+            # Use the completed translation
+            merged_map[jp_text] = todo_translations[jp_text]
+        elif template in todo_translations:
+            # Translated once for all the strings of its template
+            merged_map[jp_text] = fill_template(todo_translations[template], values)
+        else:
+            merged_map[jp_text] = current_value
+    return merged_map
+
 def merge_translations(pre_translations, todo_translations):
     """
     Merge pre-processed translations with completed TODO translations.
     Updates any "TODO" values in pre_translations with values from todo_translations.
     """
+    if is_interned(pre_translations):
+        return with_strings(pre_translations, merge_map(pre_translations["strings"], todo_translations))
+
     merged_translations = {}
     
     for rel_path, translation_map in pre_translations.items():
-        merged_map = {}
-        for jp_text, current_value in translation_map.items():
-            if current_value == "TODO" and jp_text in todo_translations:
-                # Use the completed translation
-                merged_map[jp_text] = todo_translations[jp_text]
-            else:
-                # Keep the current value (either pre-translated or original)
-                merged_map[jp_text] = current_value
-        merged_translations[rel_path] = merged_map
+        merged_translations[rel_path] = merge_map(translation_map, todo_translations)
     
     return merged_translations
 
@@ -65,7 +85,7 @@ def main():
     final_translation_file_path = args.target_directory / TRANSLATION_FILENAME
     try:
         with final_translation_file_path.open("w", encoding="utf-8") as f:
-            json.dump(final_translations, f, indent=4, ensure_ascii=False)
+            dump_keys(final_translations, f)
         print(f"Saved final merged translations to '{final_translation_file_path}'")
     except IOError as e:
         print(f"Error: Could not write to '{final_translation_file_path}': {e}")
@@ -2,10 +2,17 @@ import json
 import argparse
 from pathlib import Path
 
+from keys_format import is_interned, with_strings, dump_keys
+from ngram_index import NgramIndex
+from templates import group_by_template
+from translation_memory import TranslationMemory
+
 TRANSLATION_FILENAME = "_translate_keys.json"
 TODO_FILENAME = "_todo.json"
 PRE_TRANSLATION_FILENAME = "_translate_keys_pre.json"
 TRANSLATION_DATA_DIR = "_translate"
+SUGGESTIONS_FILENAME = "_todo_suggestions.json"
+SUGGESTION_LIMIT = 3
 
 def find_translation_directory(base_dir):
     """Find translation directory with fallback system."""
@@ -24,33 +31,11 @@ def find_translation_directory(base_dir):
     
     return None
 
-def load_all_translations(translation_dir):
-    """Load all translation files from the translation directory into a flat dict."""
-    translation_dir_path = Path(translation_dir)
-    if not translation_dir_path.exists():
-        print(f"Warning: Translation directory '{translation_dir_path}' not found.")
-        return {}
-    
-    all_translations = {}
-    
-    for json_file in translation_dir_path.glob("*.json"):
-        try:
-            content = json.loads(json_file.read_text(encoding="utf-8"))
-            # Flatten the nested structure: { "level_name": { "jp": "en" } } -> { "jp": "en" }
-            for level_key, translations in content.items():
-                if isinstance(translations, dict):
-                    for jp_text, en_text in translations.items():
-                        if isinstance(jp_text, str) and isinstance(en_text, str):
-                            all_translations[jp_text] = en_text
-        except (json.JSONDecodeError, IOError) as e:
-            print(f"Warning: Could not process {json_file.name}: {e}")
-            continue
-    
-    return all_translations
-
-def apply_pre_translations(translation_map, available_translations):
+def apply_pre_translations(translation_map, available_translations, template_lookup=None):
     """
     Apply available translations to a single translation map.
+    template_lookup, if given, translates a string missing from available_translations
+    through another string of the same template, or returns None.
     Returns the updated map and a set of missing keys.
     """
     updated_map = {}
@@ -60,6 +45,11 @@ def apply_pre_translations(translation_map, available_translations):
         if jp_text in available_translations:
             # Use the pre-existing translation
             updated_map[jp_text] = available_translations[jp_text]
+            continue
+        translated = template_lookup(jp_text) if template_lookup is not None and current_value == "TODO" else None
+        if translated is not None:
+            # Same message as a translated one, with other numbers or variables
+            updated_map[jp_text] = translated
         else:
             # Keep the current value (likely "TODO") and mark as missing
             updated_map[jp_text] = current_value
@@ -68,9 +58,28 @@ def apply_pre_translations(translation_map, available_translations):
     
     return updated_map, missing_keys
 
+def suggest_translations(missing_keys, available_translations, min_score):
+    """
+    Finds the existing translations whose source is closest to each missing string.
+    Returns {jp: [{"text", "translation", "score"}, ...]} for the strings with at least one near match.
+    """
+    index = NgramIndex(available_translations)
+    suggestions = {}
+    for jp_text in sorted(missing_keys):
+        matches = index.search(jp_text, SUGGESTION_LIMIT, min_score)
+        if matches:
+            suggestions[jp_text] = [
+                {"text": text, "translation": available_translations[text], "score": score}
+                for text, score in matches
+            ]
+    return suggestions
+
 def main():
     parser = argparse.ArgumentParser(description="Pre-processes translation keys by applying available translations.")
     parser.add_argument("target_directory", type=Path, help="Directory containing the JSON files and the keys file.")
+    parser.add_argument("--suggest", action="store_true", help=f"Also list the closest existing translations of each missing string in '{SUGGESTIONS_FILENAME}'.")
+    parser.add_argument("--templates", action="store_true", help="Translate strings differing from a translated one only by numbers or variables, and list such strings once per template in the TODO file.")
+    parser.add_argument("--min-score", type=float, default=0.6, help="Lowest similarity, from 0 to 1, for a suggestion (default: 0.6).")
     args = parser.parse_args()
 
     translation_file_path = args.target_directory / TRANSLATION_FILENAME
@@ -87,11 +96,13 @@ def main():
     if translation_dir is None:
         print(f"Warning: No translation directory found. Checked: '{args.target_directory / TRANSLATION_DATA_DIR}', '{args.target_directory.parent / TRANSLATION_DATA_DIR}', and '{Path(TRANSLATION_DATA_DIR)}'")
         available_translations = {}
+        template_lookup = None
     else:
         print(f"Found translation directory: '{translation_dir}'")
-        # Load all available translations
-        available_translations = load_all_translations(translation_dir)
+        # Index the available translations, only files changed since the last run are read
+        available_translations = TranslationMemory(translation_dir)
         print(f"Loaded {len(available_translations)} pre-existing translations.")
+        template_lookup = available_translations.translate_template if args.templates else None
     
     # Load the original translation keys file
     try:
@@ -104,16 +115,21 @@ def main():
     updated_translations = {}
     all_missing_keys = set()
     
-    for rel_path, translation_map in all_translations.items():
-        updated_map, missing_keys = apply_pre_translations(translation_map, available_translations)
-        updated_translations[rel_path] = updated_map
-        all_missing_keys.update(missing_keys)
+    if is_interned(all_translations):
+        # Every unique string is looked up once, whatever the number of files using it
+        updated_map, all_missing_keys = apply_pre_translations(all_translations["strings"], available_translations, template_lookup)
+        updated_translations = with_strings(all_translations, updated_map)
+    else:
+        for rel_path, translation_map in all_translations.items():
+            updated_map, missing_keys = apply_pre_translations(translation_map, available_translations, template_lookup)
+            updated_translations[rel_path] = updated_map
+            all_missing_keys.update(missing_keys)
     
     # Save the pre-processed translation keys file
     pre_translation_file_path = args.target_directory / PRE_TRANSLATION_FILENAME
     try:
         with pre_translation_file_path.open("w", encoding="utf-8") as f:
-            json.dump(updated_translations, f, indent=4, ensure_ascii=False)
+            dump_keys(updated_translations, f)
         print(f"Saved pre-processed translations to '{pre_translation_file_path}'")
     except IOError as e:
         print(f"Error: Could not write to '{pre_translation_file_path}': {e}")
@@ -121,16 +137,33 @@ def main():
     
     # Save missing keys as a flat dict for manual translation
     todo_file_path = args.target_directory / TODO_FILENAME
-    todo_dict = {key: "TODO" for key in sorted(all_missing_keys)}
+    todo_keys = set(all_missing_keys)
+    if args.templates:
+        # Strings sharing a template are translated once, as the template: translate_post fills in each one
+        for template, members in group_by_template(all_missing_keys).items():
+            todo_keys.difference_update(members)
+            todo_keys.add(template)
+    todo_dict = {key: "TODO" for key in sorted(todo_keys)}
     
     try:
         with todo_file_path.open("w", encoding="utf-8") as f:
             json.dump(todo_dict, f, indent=4, ensure_ascii=False)
-        print(f"Saved {len(all_missing_keys)} missing translations to '{todo_file_path}'")
+        print(f"Saved {len(todo_dict)} missing translations to '{todo_file_path}'")
     except IOError as e:
         print(f"Error: Could not write to '{todo_file_path}': {e}")
         return
 
+    if args.suggest and all_missing_keys and len(available_translations) > 0:
+        suggestions = suggest_translations(all_missing_keys, available_translations, args.min_score)
+        suggestions_file_path = args.target_directory / SUGGESTIONS_FILENAME
+        try:
+            with suggestions_file_path.open("w", encoding="utf-8") as f:
+                json.dump(suggestions, f, indent=4, ensure_ascii=False)
+            print(f"Saved near matches for {len(suggestions)} missing translations to '{suggestions_file_path}'")
+        except IOError as e:
+            print(f"Error: Could not write to '{suggestions_file_path}': {e}")
+            return
+
     print("Pre-processing complete.")
 
 if __name__ == "__main__":
@@ -0,0 +1,154 @@
+import json
+from collections.abc import Mapping
+from pathlib import Path
+from typing import Iterator, Optional
+
+from sqlite_index import open_index
+from templates import make_template, fill_template, translation_template
+
+MEMORY_FILENAME = "_memory.sqlite3"
+# Bump when the tables change; an older database is then rebuilt from the JSON files
+SCHEMA_VERSION = 2
+SCHEMA = """
+    DROP TABLE IF EXISTS files;
+    DROP TABLE IF EXISTS translations;
+    DROP TABLE IF EXISTS meta;
+    CREATE TABLE meta (key TEXT PRIMARY KEY, value INTEGER);
+    CREATE TABLE files (name TEXT PRIMARY KEY, size INTEGER, mtime INTEGER);
+    CREATE TABLE translations (
+        source TEXT NOT NULL,
+        file TEXT NOT NULL,
+        translation TEXT NOT NULL,
+        template TEXT,
+        PRIMARY KEY (source, file)
+    );
+    CREATE INDEX translations_by_file ON translations (file);
+    CREATE INDEX translations_by_template ON translations (template);
+"""
+
+
+class TranslationMemory(Mapping):
+    """
+    A read-only {jp: en} mapping over every JSON file of a translation directory,
+    backed by an SQLite index stored next to them.
+
+    Opening it only re-reads the JSON files added or changed since the last run,
+    so start-up no longer grows with the whole translation history. When a string
+    is translated in several files, the last file by name wins.
+    """
+
+    def __init__(self, translation_dir):
+        self.translation_dir = Path(translation_dir)
+        self._db = open_index(self.translation_dir / MEMORY_FILENAME, SCHEMA, SCHEMA_VERSION, "translation memory")
+        self._cache = {}
+        self._template_cache = {}
+        self.sync()
+
+    def sync(self):
+        """Brings the index up to date with the JSON files: new and changed files are re-read, deleted ones dropped."""
+        known = {name: (size, mtime) for name, size, mtime in self._db.execute("SELECT name, size, mtime FROM files")}
+        seen = set()
+        changed = False
+        with self._db:
+            for json_file in self.translation_dir.glob("*.json"):
+                stat = json_file.stat()
+                seen.add(json_file.name)
+                if known.get(json_file.name) == (stat.st_size, stat.st_mtime_ns):
+                    continue
+                self._index_file(json_file, stat.st_size, stat.st_mtime_ns)
+                changed = True
+
+            for name in known.keys() - seen:
+                self._db.execute("DELETE FROM translations WHERE file = ?", (name,))
+                self._db.execute("DELETE FROM files WHERE name = ?", (name,))
+                changed = True
+
+            # Counting distinct sources walks the whole index, so it is only redone when something changed
+            if changed or self._count() is None:
+                self._db.execute(
+                    "INSERT OR REPLACE INTO meta (key, value) SELECT 'sources', COUNT(DISTINCT source) FROM translations"
+                )
+        self._cache.clear()
+        self._template_cache.clear()
+
+    def _count(self) -> Optional[int]:
+        row = self._db.execute("SELECT value FROM meta WHERE key = 'sources'").fetchone()
+        return row[0] if row else None
+
+    def _index_file(self, json_file: Path, size: int, mtime: int):
+        self._db.execute("DELETE FROM translations WHERE file = ?", (json_file.name,))
+        try:
+            content = json.loads(json_file.read_text(encoding="utf-8"))
+        except (json.JSONDecodeError, IOError) as e:
+            print(f"Warning: Could not process {json_file.name}: {e}")
+            # Not recorded in files, so it is tried again next time
+            self._db.execute("DELETE FROM files WHERE name = ?", (json_file.name,))
+            return
+
+        rows = {}
+        # Flatten the nested structure: { "level_name": { "jp": "en" } } -> { "jp": "en" }
+        for level_key, translations in content.items():
+            if isinstance(translations, dict):
+                for jp_text, en_text in translations.items():
+                    if isinstance(jp_text, str) and isinstance(en_text, str):
+                        rows[jp_text] = en_text
+        self._db.executemany(
+            "INSERT INTO translations (source, file, translation, template) VALUES (?, ?, ?, ?)",
+            ((jp_text, json_file.name, en_text, self._template_of(jp_text)) for jp_text, en_text in rows.items())
+        )
+        self._db.execute("INSERT OR REPLACE INTO files (name, size, mtime) VALUES (?, ?, ?)", (json_file.name, size, mtime))
+
+    @staticmethod
+    def _template_of(jp_text: str) -> Optional[str]:
+        template, values = make_template(jp_text)
+        return template if values else None
+
+    def _template_translation(self, template: str) -> Optional[str]:
+        if template not in self._template_cache:
+            self._template_cache[template] = None
+            rows = self._db.execute(
+                "SELECT source, translation FROM translations WHERE template = ? ORDER BY file DESC", (template,)
+            )
+            for source, translation in rows:
+                translated = translation_template(source, translation)
+                if translated is not None:
+                    self._template_cache[template] = translated
+                    break
+        return self._template_cache[template]
+
+    def translate_template(self, jp_text: str) -> Optional[str]:
+        """
+        Translates a string through a translated string of the same template, i.e. the same message
+        with other numbers or variable markers. Returns None when there is none.
+        """
+        template, values = make_template(jp_text)
+        if not values:
+            return None
+        translated = self._template_translation(template)
+        return fill_template(translated, values) if translated is not None else None
+
+    def _lookup(self, jp_text: str) -> Optional[str]:
+        if jp_text not in self._cache:
+            row = self._db.execute(
+                "SELECT translation FROM translations WHERE source = ? ORDER BY file DESC LIMIT 1", (jp_text,)
+            ).fetchone()
+            self._cache[jp_text] = row[0] if row else None
+        return self._cache[jp_text]
+
+    def __getitem__(self, jp_text: str) -> str:
+        translation = self._lookup(jp_text) if isinstance(jp_text, str) else None
+        if translation is None:
+            raise KeyError(jp_text)
+        return translation
+
+    def __contains__(self, jp_text) -> bool:
+        return isinstance(jp_text, str) and self._lookup(jp_text) is not None
+
+    def __iter__(self) -> Iterator[str]:
+        return (row[0] for row in self._db.execute("SELECT DISTINCT source FROM translations"))
+
+    def __len__(self) -> int:
+        return self._count()
+
+    def close(self):
+        self._db.close()
@@ -2,6 +2,10 @@ import json
 import argparse
 from pathlib import Path
 from collections import defaultdict
+from itertools import chain
+
+from keys_format import is_interned, first_files, with_strings, dump_keys
+from templates import make_template, fill_template
 
 PRE_TRANSLATION_FILENAME = "_translate_keys_pre.json"
 TODO_FILENAME = "_translatorpp_todo.json"
@@ -10,8 +14,8 @@ TRANSLATION_DATA_DIR = "_translate"
 
 
 
-def load_structured_translations(filepath):
-    """Load structured array and return dict: {(filename, text): translation}"""
+def load_structured_entries(filepath):
+    """Load a structured array, checking that it is one; translated_entries() walks it."""
     try:
         data = json.loads(filepath.read_text(encoding="utf-8"))
     except (json.JSONDecodeError, IOError) as e:
@@ -19,9 +23,13 @@ def load_structured_translations(filepath):
 
     if not isinstance(data, list):
         raise ValueError(f"Expected JSON array in {filepath.name}")
+    return data
 
-    lookup = {}
+def translated_entries(data):
+    """Yield (filename, text, translation) for each entry of a structured array with a translation."""
     for entry in data:
+        if not isinstance(entry, dict):
+            continue  # skip invalid
         text = entry.get("text")
         translation = entry.get("translation", "")
         context = entry.get("context", "")
@@ -34,11 +42,110 @@ def load_structured_translations(filepath):
 
         filename = context.split('/', 1)[0]  # everything before first '/'
 
-        # Only store non-empty translations
-        if translation and translation.strip():
-            lookup[(filename, text)] = translation.strip()
+        # Only yield non-empty translations
+        if isinstance(translation, str) and translation.strip():
+            yield filename, text, translation.strip()
 
-    return lookup
+def pending_texts(text_map):
+    """The keys of a {jp: en} map still to translate ("TODO", case-insensitive, or not a string), in order."""
+    return dict.fromkeys(
+        jp_text for jp_text, current_val in text_map.items()
+        if not (isinstance(current_val, str) and current_val.strip().upper() != "TODO")
+    )
+
+def fill_from_template(jp_text, text_lookup):
+    """
+    Translation of a string through the entry of its template (translatorpp_pre --templates),
+    or None if there is none.
+    """
+    template, values = make_template(jp_text)
+    if values and template in text_lookup:
+        return fill_template(text_lookup[template], values)
+    return None
+
+def update_files(original, entries):
+    """
+    Writes each translated entry into the map of its file, in place, then removes the strings
+    still "TODO". Those are taken from an index built up front, so only the entries given and
+    the strings left to translate are visited, not every string of every file.
+    Returns the updated and removed counts, and the removed (filename, jp_text) pairs.
+    """
+    pending = {
+        filename: pending_texts(text_map)
+        for filename, text_map in original.items() if isinstance(text_map, dict)
+    }
+    updated = set()
+    templates = {}  # entries matching no string of their file, as the entry of a template
+    for filename, jp_text, translation in entries:
+        text_map = original.get(filename)
+        if isinstance(text_map, dict) and jp_text in text_map:
+            text_map[jp_text] = translation
+            pending[filename].pop(jp_text, None)
+            updated.add((filename, jp_text))
+        else:
+            templates[jp_text] = translation
+
+    updated_count = len(updated)
+    missing_report = []  # list of (filename, jp_text)
+    for filename, texts in pending.items():
+        text_map = original[filename]
+        for jp_text in texts:
+            translation = fill_from_template(jp_text, templates)
+            if translation:
+                text_map[jp_text] = translation
+                updated_count += 1
+            else:
+                # It's "TODO" (or empty/"todo") → remove & report
+                del text_map[jp_text]
+                missing_report.append((filename, jp_text))
+
+        # Optional: remove files that became empty
+        if not text_map:
+            del original[filename]
+            print(f"(i) File '{filename}' is now empty and was removed.")
+    return updated_count, len(missing_report), missing_report
+
+def update_interned(original, entries):
+    """
+    Interned counterpart of update_files(): each unique string is updated once,
+    and a translation made in any file applies to the string everywhere.
+    Returns the updated keys, the updated and removed counts, and the removed (filename, jp_text) pairs.
+    """
+    strings = original["strings"]
+    pending = pending_texts(strings)
+    updated = set()
+    templates = {}
+    for _, jp_text, translation in entries:
+        if jp_text in strings:
+            strings[jp_text] = translation
+            pending.pop(jp_text, None)
+            updated.add(jp_text)
+        else:
+            templates[jp_text] = translation
+
+    updated_count = len(updated)
+    missing = set()
+    for jp_text in pending:
+        translation = fill_from_template(jp_text, templates)
+        if translation:
+            strings[jp_text] = translation
+            updated_count += 1
+        else:
+            missing.add(jp_text)
+    if not missing and all(original["files"].values()):
+        return original, updated_count, 0, []
+
+    first_file = first_files(original)
+    missing_report = [
+        (first_file.get(string_id, ""), jp_text)
+        for string_id, jp_text in enumerate(strings) if jp_text in missing
+    ]
+    # Left out of strings, so with_strings() drops them from every file
+    updated = with_strings(original, {jp_text: en_text for jp_text, en_text in strings.items() if jp_text not in missing})
+    for filename in original["files"]:
+        if filename not in updated["files"]:
+            print(f"(i) File '{filename}' is now empty and was removed.")
+    return updated, updated_count, len(missing_report), missing_report
 
 def main():
     parser = argparse.ArgumentParser(
@@ -73,57 +180,30 @@ def main():
         print("[!] Error: _translate_keys.json must be a JSON object.")
         return
 
-    # Load structured translations — priority: TODO > PRE (so load PRE first, then override with TODO)
+    # Load structured translations — priority: TODO > PRE (so apply PRE first, then override with TODO)
     try:
-        pre_lookup = load_structured_translations(pre_path)
-        todo_lookup = load_structured_translations(todo_path)
+        pre_entries = load_structured_entries(pre_path)
+        todo_entries = load_structured_entries(todo_path)
     except (RuntimeError, ValueError) as e:
         print(f"[!] {e}")
         return
-
-    # Merge: TODO overrides PRE
-    merged_lookup = {**pre_lookup, **todo_lookup}
+    entries = chain(translated_entries(pre_entries), translated_entries(todo_entries))
 
     # Now update original in-place
-    updated_count = 0
-    removed_count = 0
-    missing_report = []  # list of (filename, jp_text)
-
-    # Update & clean original map
-    for filename, text_map in list(original.items()):  # list() in case we delete files
-        if not isinstance(text_map, dict):
-            continue
-
-        new_text_map = {}
-        for jp_text, current_val in text_map.items():
-            key = (filename, jp_text)
-
-            # Priority 1: use merged translation if available
-            if key in merged_lookup:
-                new_text_map[jp_text] = merged_lookup[key]
-                updated_count += 1
-            # Priority 2: keep value only if it's NOT "TODO" (case-insensitive)
-            elif isinstance(current_val, str) and current_val.strip().upper() != "TODO":
-                new_text_map[jp_text] = current_val
-            else:
-                # It's "TODO" (or empty/"todo") → remove & report
-                removed_count += 1
-                missing_report.append((filename, jp_text))
-
-        # Replace map (even if empty)
-        original[filename] = new_text_map
-
-        # Optional: remove files that became empty
-        if not new_text_map:
-            del original[filename]
-            print(f"(i) File '{filename}' is now empty and was removed.")
+    if is_interned(original):
+        original, updated_count, removed_count, missing_report = update_interned(original, entries)
+    else:
+        updated_count, removed_count, missing_report = update_files(original, entries)
 
     # Save updated translation file
     try:
         with orig_keys_path.open("w", encoding="utf-8") as f:
-            json.dump(original, f, indent=4, ensure_ascii=False)
+            dump_keys(original, f)
         print(f"Updated {updated_count} translations, removed {removed_count} 'TODO' entries.")
-        print(f"   Final: {len(original)} files, {sum(len(v) for v in original.values())} keys.")
+        if is_interned(original):
+            print(f"   Final: {len(original['files'])} files, {len(original['strings'])} unique keys.")
+        else:
+            print(f"   Final: {len(original)} files, {sum(len(v) for v in original.values())} keys.")
     except IOError as e:
         print(f"[!] Failed to write output: {e}")
         return
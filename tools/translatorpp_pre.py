@@ -3,6 +3,10 @@ import argparse
 from pathlib import Path
 from collections import defaultdict
 
+from keys_format import is_interned, first_files
+from templates import group_by_template
+from translation_memory import TranslationMemory
+
 TRANSLATION_FILENAME = "_translate_keys.json"
 TODO_FILENAME = "_translatorpp_todo.json"
 PRE_TRANSLATION_FILENAME = "_translate_keys_pre.json"
@@ -25,30 +29,6 @@ def find_translation_directory(base_dir):
     return None
 
 
-def load_all_translations(translation_dir):
-    """Load all translation files into a flat {jp: en} dict."""
-    translation_dir_path = Path(translation_dir)
-    if not translation_dir_path.exists():
-        print(f"Warning: Translation directory '{translation_dir_path}' not found.")
-        return {}
-    
-    all_translations = {}
-    
-    for json_file in translation_dir_path.glob("*.json"):
-        try:
-            content = json.loads(json_file.read_text(encoding="utf-8"))
-            for level_key, translations in content.items():
-                if isinstance(translations, dict):
-                    for jp_text, en_text in translations.items():
-                        if isinstance(jp_text, str) and isinstance(en_text, str):
-                            all_translations[jp_text] = en_text
-        except (json.JSONDecodeError, IOError) as e:
-            print(f"Warning: Could not process {json_file.name}: {e}")
-            continue
-    
-    return all_translations
-
-
 def apply_pre_translations_with_context(translation_map, available_translations, file_name):
     """
     Process a file's translation map and return list of entries with context.
@@ -76,9 +56,48 @@ def apply_pre_translations_with_context(translation_map, available_translations,
     return entries, missing_keys
 
 
+def interned_entries(data):
+    """
+    One entry per unique string of an interned keys file, in ID order.
+    The context names the first file using the string, then the string ID.
+    """
+    first_file = first_files(data)
+    entries = [
+        {
+            "text": jp_text,
+            "translation": "",
+            "context": f"{first_file.get(string_id, '')}/{string_id + 1}"
+        }
+        for string_id, jp_text in enumerate(data["strings"])
+    ]
+    return entries, {entry["text"] for entry in entries}
+
+
+def collapse_templates(entries):
+    """
+    Replaces the entries whose texts differ only by numbers or variables with a single entry
+    for their template, where the first of them was, so it is translated once.
+    translatorpp_post fills in each string from it.
+    """
+    groups = group_by_template(dict.fromkeys(entry["text"] for entry in entries))
+    template_of = {text: template for template, members in groups.items() for text in members}
+
+    collapsed = []
+    seen = set()
+    for entry in entries:
+        template = template_of.get(entry["text"])
+        if template is None:
+            collapsed.append(entry)
+        elif template not in seen:
+            seen.add(template)
+            collapsed.append({**entry, "text": template})
+    return collapsed
+
+
 def main():
     parser = argparse.ArgumentParser(description="Pre-processes translation keys into structured array format.")
     parser.add_argument("target_directory", type=Path, help="Directory containing the JSON files and the keys file.")
+    parser.add_argument("--templates", action="store_true", help="List strings differing only by numbers or variables once, as their template.")
     args = parser.parse_args()
 
     translation_file_path = args.target_directory / TRANSLATION_FILENAME
@@ -97,7 +116,7 @@ def main():
         available_translations = {}
     else:
         print(f"Found translation directory: '{translation_dir}'")
-        available_translations = load_all_translations(translation_dir)
+        available_translations = TranslationMemory(translation_dir)
         print(f"Loaded {len(available_translations)} pre-existing translations.")
     
     # Load original translation keys
@@ -111,13 +130,21 @@ def main():
     all_entries = []  # Final list of all entries (to dump as array)
     all_missing_keys = set()
 
-    for file_name, translation_map in all_translations.items():
-        if not isinstance(translation_map, dict):
-            print(f"/!\\ Warning: Skipping non-dict entry for file '{file_name}'")
-            continue
-        entries, missing_keys = apply_pre_translations_with_context(translation_map, available_translations, file_name)
-        all_entries.extend(entries)
-        all_missing_keys.update(missing_keys)
+    if is_interned(all_translations):
+        all_entries, all_missing_keys = interned_entries(all_translations)
+    else:
+        for file_name, translation_map in all_translations.items():
+            if not isinstance(translation_map, dict):
+                print(f"/!\\ Warning: Skipping non-dict entry for file '{file_name}'")
+                continue
+            entries, missing_keys = apply_pre_translations_with_context(translation_map, available_translations, file_name)
+            all_entries.extend(entries)
+            all_missing_keys.update(missing_keys)
+
+    if args.templates:
+        entry_count = len(all_entries)
+        all_entries = collapse_templates(all_entries)
+        print(f"Collapsed {entry_count - len(all_entries)} entries sharing a template.")
 
     # Save pre-processed structured list
     pre_translation_file_path = args.target_directory / PRE_TRANSLATION_FILENAME